@@ -1,12 +1,24 @@
 import logging
+import functools
+import json
+import os
+import time
 from typing import Any, Dict
 from service.base.UninformedSearch import UninformedSearch
 from service.base.InformedSearch import InformedSearch
+from service.base.CompiledGraph import CompiledGraph
+from service.base.Landmarks import LandmarkHeuristic
+from service.base.GraphRegistry import GraphRegistry, UnknownGraph
+from service.base.JobManager import JobManager, JobLimitReached
 from service.scheduling.TaskSchedulingSearch import TaskSchedulingSearch
-from service.scheduling.TaskSchedulingData import SetupMatrix
+from service.scheduling.TaskSchedulingData import DenseSetupMatrix
 from service.scheduling.TaskFamily import TaskFamily
+from service.scheduling.TaskSchedulingBatch import TaskSchedulingBatch
+from service.scheduling.TaskSchedulingLocalSearch import TaskSchedulingLocalSearch
+from service.scheduling.TaskSchedulingResultCache import TaskSchedulingResultCache
 from flask_cors import CORS # type: ignore
-from flask import Flask, request, jsonify, abort # type: ignore
+from flask import Flask, Response, request, jsonify, abort, stream_with_context # type: ignore
+from werkzeug.exceptions import HTTPException # type: ignore
 
 app = Flask(__name__)
 CORS(app)
@@ -15,10 +27,72 @@ logging.basicConfig(level=logging.DEBUG)
 
 INCORRECT_MATRIX_MSG = "Matriz de setup incompleta"
 
+# Compiled graphs uploaded through /graphs, shared by every search endpoint
+graph_registry = GraphRegistry(
+    max_graphs=int(os.environ.get('GRAPH_REGISTRY_MAX_GRAPHS', GraphRegistry.MAX_GRAPHS)),
+    max_bytes=int(os.environ.get('GRAPH_REGISTRY_MAX_BYTES', GraphRegistry.MAX_BYTES)),
+)
+
+# Pool de processos do /scheduling/batch (SCHEDULING_BATCH_WORKERS processos)
+scheduling_batch_pool = TaskSchedulingBatch()
+
+# Cache de respostas de /scheduling/task-sequence/* (SCHEDULING_CACHE_MAX_ENTRIES=0 desativa)
+scheduling_cache = TaskSchedulingResultCache(
+    max_entries=int(os.environ.get('SCHEDULING_CACHE_MAX_ENTRIES', TaskSchedulingResultCache.MAX_ENTRIES)),
+    max_bytes=int(os.environ.get('SCHEDULING_CACHE_MAX_BYTES', TaskSchedulingResultCache.MAX_BYTES)),
+    ttl=float(os.environ.get('SCHEDULING_CACHE_TTL', TaskSchedulingResultCache.TTL)),
+)
+
+def run_job_request(endpoint: str, payload: Dict[str, Any]) -> Any:
+    """Run a search endpoint for a job (in a worker thread) and return (status code, JSON body)."""
+    with app.test_request_context(endpoint, method='POST', json=payload):
+        try:
+            response = app.make_response(app.dispatch_request())
+        except HTTPException as e:
+            return e.code, {'error': e.description}
+        return response.status_code, response.get_json(silent=True)
+
+# Buscas longas executadas em segundo plano por /jobs
+job_manager = JobManager(
+    run_job_request,
+    max_workers=int(os.environ.get('JOBS_MAX_WORKERS', JobManager.MAX_WORKERS)),
+    max_jobs=int(os.environ.get('JOBS_MAX_JOBS', JobManager.MAX_JOBS)),
+    retention=float(os.environ.get('JOBS_RETENTION', JobManager.RETENTION)),
+)
+
 def safe_json_cost(cost: float) -> Any:
     """Convert infinity to a JSON-safe value."""
     return None if cost == float('inf') else cost
 
+def cached_scheduling(handler: Any) -> Any:
+    """Serve repeated scheduling requests from scheduling_cache (header X-Cache: HIT/MISS).
+
+    Streamed responses and time-limited runs (including an `improve` pass with
+    its own time_limit) are not cached."""
+    @functools.wraps(handler)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        data = request.get_json(silent=True)
+        improve = data.get('improve') if isinstance(data, dict) else None
+        if (not scheduling_cache.enabled or not isinstance(data, dict)
+                or data.get('stream') or data.get('time_limit') is not None
+                or (isinstance(improve, dict) and improve.get('time_limit') is not None)
+                or 'text/event-stream' in request.headers.get('Accept', '')):
+            return handler(*args, **kwargs)
+
+        key = TaskSchedulingResultCache.fingerprint(request.path, data)
+        cached = scheduling_cache.get(key)
+        if cached is not None:
+            response = Response(cached.body, status=cached.status, mimetype=cached.mimetype)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+
+        response = app.make_response(handler(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed:
+            scheduling_cache.put(key, response.get_data(), response.status_code, response.mimetype)
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    return wrapper
+
 @app.route('/', methods=['GET'])
 def index() -> str:
     """Health check endpoint."""
@@ -31,6 +105,61 @@ def get_json_data() -> Dict[str, Any]:
         abort(400, description="Invalid or missing JSON data.")
     return data
 
+def resolve_graph(data: Dict[str, Any]) -> Any:
+    """Return (nodes, graph) from a registered graph_id or the inline nodes/graph."""
+    if 'graph_id' in data:
+        graph = graph_registry.get(data['graph_id']).graph
+        return graph.names, graph
+    return data['nodes'], data['graph']
+
+def resolve_heuristics(data: Dict[str, Any]) -> Any:
+    """Return the request heuristics, reusing providers kept for a registered graph."""
+    if 'graph_id' in data:
+        return graph_registry.heuristic(data['graph_id'], data.get('heuristics'))
+    return data.get('heuristics')
+
+@app.route('/graphs', methods=['POST'])
+def register_graph() -> Any:
+    data = get_json_data()
+    try:
+        entry = graph_registry.register(data['nodes'], data['graph'])
+        # Optional heuristics to preprocess now (e.g. {"type": "alt"})
+        try:
+            for heuristics in data.get('preprocess', []):
+                graph_registry.heuristic(entry.graph_id, heuristics)
+        except Exception:
+            # A failed request must not leave the graph registered
+            graph_registry.remove(entry.graph_id)
+            raise
+        return jsonify(entry.info()), 201
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid heuristics: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logging.error(f"Error registering graph: {e}")
+        abort(500, description=str(e))
+
+@app.route('/graphs', methods=['GET'])
+def list_graphs() -> Any:
+    return jsonify(graph_registry.info())
+
+@app.route('/graphs/<graph_id>', methods=['GET'])
+def get_graph(graph_id: str) -> Any:
+    try:
+        entry = graph_registry.get(graph_id)
+    except KeyError:
+        abort(404, description=f"Unknown graph_id: {graph_id}")
+    return jsonify(entry.info())
+
+@app.route('/graphs/<graph_id>', methods=['DELETE'])
+def delete_graph(graph_id: str) -> Any:
+    if not graph_registry.remove(graph_id):
+        abort(404, description=f"Unknown graph_id: {graph_id}")
+    return jsonify({'deleted': graph_id})
+
 @app.route('/search/uninformed/breadth_first', methods=['POST'])
 def breadth_first() -> Any:
     data = get_json_data()
@@ -38,10 +167,12 @@ def breadth_first() -> Any:
         search = UninformedSearch()
         start = data['start']
         goal = data['goal']
-        nodes = data['nodes']
-        graph = data['graph']
+        nodes, graph = resolve_graph(data)
         result = search.breadth_first_search(start, goal, nodes, graph)
         return jsonify({'path': result})
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
@@ -56,10 +187,12 @@ def depth_first() -> Any:
         search = UninformedSearch()
         start = data['start']
         goal = data['goal']
-        nodes = data['nodes']
-        graph = data['graph']
+        nodes, graph = resolve_graph(data)
         result = search.depth_first_search(start, goal, nodes, graph)
         return jsonify({'path': result})
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
@@ -74,11 +207,13 @@ def depth_limited() -> Any:
         search = UninformedSearch()
         start = data['start']
         goal = data['goal']
-        nodes = data['nodes']
-        graph = data['graph']
+        nodes, graph = resolve_graph(data)
         limit = data['limit']
         result = search.depth_limited_search(start, goal, nodes, graph, limit)
         return jsonify({'path': result})
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
@@ -93,11 +228,13 @@ def iterative_deepening() -> Any:
         search = UninformedSearch()
         start = data['start']
         goal = data['goal']
-        nodes = data['nodes']
-        graph = data['graph']
+        nodes, graph = resolve_graph(data)
         max_limit = data['max_limit']
         result = search.iterative_deepening_search(start, goal, nodes, graph, max_limit)
         return jsonify({'path': result})
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
@@ -112,10 +249,12 @@ def bidirectional() -> Any:
         search = UninformedSearch()
         start = data['start']
         goal = data['goal']
-        nodes = data['nodes']
-        graph = data['graph']
+        nodes, graph = resolve_graph(data)
         result = search.bidirectional_search(start, goal, nodes, graph)
         return jsonify({'path': result})
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
@@ -130,10 +269,12 @@ def uniform_cost() -> Any:
         search = InformedSearch()
         start = data['start']
         goal = data['goal']
-        nodes = data['nodes']
-        graph = data['graph']
+        nodes, graph = resolve_graph(data)
         result = search.uniform_cost(start, goal, nodes, graph)
         return jsonify({'path': result})
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
@@ -148,14 +289,19 @@ def a_star() -> Any:
         search = InformedSearch()
         start = data['start']
         goal = data['goal']
-        nodes = data['nodes']
-        graph = data['graph']
-        heuristics = data['heuristics']
+        nodes, graph = resolve_graph(data)
+        heuristics = resolve_heuristics(data)
         result = search.a_star(start, goal, nodes, graph, heuristics)
         return jsonify({'path': result})
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid heuristics: {e}")
+        abort(400, description=str(e))
     except Exception as e:
         logging.error(f"Error in A* search: {e}")
         abort(500, description=str(e))
@@ -167,14 +313,19 @@ def greedy() -> Any:
         search = InformedSearch()
         start = data['start']
         goal = data['goal']
-        nodes = data['nodes']
-        graph = data['graph']
-        heuristics = data['heuristics']
+        nodes, graph = resolve_graph(data)
+        heuristics = resolve_heuristics(data)
         result = search.greedy(start, goal, nodes, graph, heuristics)
         return jsonify({'path': result})
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid heuristics: {e}")
+        abort(400, description=str(e))
     except Exception as e:
         logging.error(f"Error in greedy search: {e}")
         abort(500, description=str(e))
@@ -186,19 +337,105 @@ def ida_star() -> Any:
         search = InformedSearch()
         start = data['start']
         goal = data['goal']
-        nodes = data['nodes']
-        graph = data['graph']
-        heuristics = data['heuristics']
+        nodes, graph = resolve_graph(data)
+        heuristics = resolve_heuristics(data)
         result = search.ida_star(start, goal, nodes, graph, heuristics)
         return jsonify({'path': result})
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid heuristics: {e}")
+        abort(400, description=str(e))
     except Exception as e:
         logging.error(f"Error in IDA* search: {e}")
         abort(500, description=str(e))
         
+@app.route('/search/informed/bidirectional', methods=['POST'])
+def informed_bidirectional() -> Any:
+    data = get_json_data()
+    try:
+        search = InformedSearch()
+        start = data['start']
+        goal = data['goal']
+        nodes, graph = resolve_graph(data)
+        # Without heuristics this is plain bidirectional Dijkstra
+        heuristics = resolve_heuristics(data) if data.get('heuristics') is not None else None
+        result = search.bidirectional(start, goal, nodes, graph, heuristics)
+        if result is None:
+            path, cost = None, None
+        elif isinstance(result, tuple):
+            path, cost = result
+        else:
+            path, cost = result, 0.0
+        return jsonify({'path': path, 'cost': cost, 'stats': search.stats})
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid heuristics: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logging.error(f"Error in bidirectional A* search: {e}")
+        abort(500, description=str(e))
+
+@app.route('/search/batch', methods=['POST'])
+def batch_search() -> Any:
+    data = get_json_data()
+    try:
+        search = InformedSearch()
+        nodes, graph = resolve_graph(data)
+        if 'pairs' not in data and ('sources' not in data or 'targets' not in data):
+            raise KeyError('pairs')
+        result = search.batch_shortest_paths(nodes, graph,
+                                             pairs=data.get('pairs'),
+                                             sources=data.get('sources'),
+                                             targets=data.get('targets'),
+                                             include_paths=bool(data.get('paths', False)))
+        return jsonify(result)
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid batch query: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logging.error(f"Error in batch search: {e}")
+        abort(500, description=str(e))
+
+@app.route('/search/preprocess/landmarks', methods=['POST'])
+def preprocess_landmarks() -> Any:
+    data = get_json_data()
+    try:
+        nodes, graph = resolve_graph(data)
+        graph = CompiledGraph.ensure(nodes, graph)
+        landmarks = LandmarkHeuristic(int(data.get('landmarks', 8)), data.get('strategy', 'farthest'))
+        landmarks.build(graph)
+        return jsonify({'tables': landmarks.to_dict()})
+    except UnknownGraph as e:
+        logging.error(f"Unknown graph_id: {e.graph_id}")
+        abort(404, description=f"Unknown graph_id: {e.graph_id}")
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid landmark options: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logging.error(f"Error in landmark preprocessing: {e}")
+        abort(500, description=str(e))
+
 @app.route('/scheduling/task-sequence/breadth_first', methods=['POST'])
+@cached_scheduling
 def task_sequence_breadth_first() -> Any:
     """Busca em largura para sequenciamento de tarefas"""
     data = get_json_data()
@@ -206,7 +443,7 @@ def task_sequence_breadth_first() -> Any:
         search = TaskSchedulingSearch()
         tasks = data['tasks']
         setup_costs = data['setup_matrix']
-        setup_matrix = SetupMatrix(tasks, setup_costs)
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
         if not setup_matrix.validate_matrix():
             abort(400, description=INCORRECT_MATRIX_MSG)
         sequence, cost = search.breadth_first_scheduling(tasks, setup_matrix)
@@ -222,6 +459,7 @@ def task_sequence_breadth_first() -> Any:
         abort(500, description=str(e))
 
 @app.route('/scheduling/task-sequence/depth_first', methods=['POST'])
+@cached_scheduling
 def task_sequence_depth_first() -> Any:
     """Busca em profundidade para sequenciamento de tarefas"""
     data = get_json_data()
@@ -229,7 +467,7 @@ def task_sequence_depth_first() -> Any:
         search = TaskSchedulingSearch()
         tasks = data['tasks']
         setup_costs = data['setup_matrix']
-        setup_matrix = SetupMatrix(tasks, setup_costs)
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
         if not setup_matrix.validate_matrix():
             abort(400, description=INCORRECT_MATRIX_MSG)
         sequence, cost = search.depth_first_scheduling(tasks, setup_matrix)
@@ -246,6 +484,7 @@ def task_sequence_depth_first() -> Any:
         abort(500, description=str(e))
 
 @app.route('/scheduling/task-sequence/depth_limited', methods=['POST'])
+@cached_scheduling
 def task_sequence_depth_limited() -> Any:
     """Busca em profundidade limitada para sequenciamento de tarefas"""
     data = get_json_data()
@@ -254,7 +493,7 @@ def task_sequence_depth_limited() -> Any:
         tasks = data['tasks']
         setup_costs = data['setup_matrix']
         depth_limit = data.get('depth_limit', 5)
-        setup_matrix = SetupMatrix(tasks, setup_costs)
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
         if not setup_matrix.validate_matrix():
             abort(400, description=INCORRECT_MATRIX_MSG)
         sequence, cost = search.depth_limited_scheduling(tasks, setup_matrix, depth_limit)
@@ -271,6 +510,7 @@ def task_sequence_depth_limited() -> Any:
         abort(500, description=str(e))
 
 @app.route('/scheduling/task-sequence/iterative_deepening', methods=['POST'])
+@cached_scheduling
 def task_sequence_iterative_deepening() -> Any:
     """Busca em profundidade iterativa para sequenciamento de tarefas"""
     data = get_json_data()
@@ -278,7 +518,7 @@ def task_sequence_iterative_deepening() -> Any:
         search = TaskSchedulingSearch()
         tasks = data['tasks']
         setup_costs = data['setup_matrix']
-        setup_matrix = SetupMatrix(tasks, setup_costs)
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
         if not setup_matrix.validate_matrix():
             abort(400, description=INCORRECT_MATRIX_MSG)
         sequence, cost = search.iterative_deepening_scheduling(tasks, setup_matrix)
@@ -295,6 +535,7 @@ def task_sequence_iterative_deepening() -> Any:
         abort(500, description=str(e))
 
 @app.route('/scheduling/task-sequence/bidirectional', methods=['POST'])
+@cached_scheduling
 def task_sequence_bidirectional() -> Any:
     """Busca bidirecional para sequenciamento de tarefas"""
     data = get_json_data()
@@ -302,23 +543,30 @@ def task_sequence_bidirectional() -> Any:
         search = TaskSchedulingSearch()
         tasks = data['tasks']
         setup_costs = data['setup_matrix']
-        setup_matrix = SetupMatrix(tasks, setup_costs)
+        heuristic = data.get('heuristic')
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
         if not setup_matrix.validate_matrix():
             abort(400, description=INCORRECT_MATRIX_MSG)
-        sequence, cost = search.bidirectional_scheduling(tasks, setup_matrix)
+        sequence, cost = search.bidirectional_scheduling(tasks, setup_matrix, heuristic)
         return jsonify({
             'sequence': sequence,
             'total_cost': safe_json_cost(cost),
+            'heuristic': heuristic,
+            'stats': search.stats,
             'algorithm': 'BIDIRECTIONAL'
         })
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid bidirectional input: {e}")
+        abort(400, description=str(e))
     except Exception as e:
         logging.error(f"Error in bidirectional task scheduling: {e}")
         abort(500, description=str(e))
 
 @app.route('/scheduling/task-sequence/uniform_cost', methods=['POST'])
+@cached_scheduling
 def task_sequence_uniform_cost() -> Any:
     """Custo uniforme para sequenciamento de tarefas"""
     data = get_json_data()
@@ -328,11 +576,12 @@ def task_sequence_uniform_cost() -> Any:
         tasks = data['tasks']
         setup_costs = data['setup_matrix']
 
-        setup_matrix = SetupMatrix(tasks, setup_costs)
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
         if not setup_matrix.validate_matrix():
             abort(400, description=INCORRECT_MATRIX_MSG)
 
-        sequence, cost = search.uniform_cost_scheduling(tasks, setup_matrix)
+        node_store = data.get('node_store', 'objects')
+        sequence, cost = search.uniform_cost_scheduling(tasks, setup_matrix, node_store)
 
         setup_details = []
         if sequence:
@@ -346,6 +595,7 @@ def task_sequence_uniform_cost() -> Any:
             'sequence': sequence,
             'total_cost': safe_json_cost(cost),
             'setup_details': setup_details,
+            'stats': search.stats,
             'algorithm': 'UNIFORMED_COST'
         })
 
@@ -357,6 +607,7 @@ def task_sequence_uniform_cost() -> Any:
         abort(500, description=str(e))
 
 @app.route('/scheduling/task-sequence/a_star', methods=['POST'])
+@cached_scheduling
 def task_sequence_a_star() -> Any:
     """A* para sequenciamento de tarefas com setups"""
     data = get_json_data()
@@ -369,14 +620,18 @@ def task_sequence_a_star() -> Any:
         family_data = data.get('families')
 
         # Criar estruturas de dados
-        setup_matrix = SetupMatrix(tasks, setup_costs)
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
         if not setup_matrix.validate_matrix():
             abort(400, description=INCORRECT_MATRIX_MSG)
 
         families = TaskFamily(family_data) if family_data else None
 
-        # Executar algoritmo
-        sequence, cost = search.a_star_scheduling(tasks, setup_matrix, heuristic, families)
+        # Executar algoritmo (workers > 1: HDA* em processos)
+        node_store = data.get('node_store', 'objects')
+        workers = data.get('workers', 1)
+        if isinstance(workers, bool) or not isinstance(workers, int):
+            raise ValueError("workers deve ser um número inteiro")
+        sequence, cost = search.a_star_scheduling(tasks, setup_matrix, heuristic, families, node_store, workers)
 
         # Calcular detalhes dos setups
         setup_details = []
@@ -396,17 +651,23 @@ def task_sequence_a_star() -> Any:
             'total_cost': safe_json_cost(cost),
             'setup_details': setup_details,
             'heuristic': heuristic,
+            'heuristic_cache': search.heuristic_cache_info(setup_matrix, heuristic),
+            'stats': search.stats,
             'algorithm': 'A_STAR'
         })
 
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid A* options: {e}")
+        abort(400, description=str(e))
     except Exception as e:
         logging.error(f"Error in A* task scheduling: {e}")
         abort(500, description=str(e))
 
 @app.route('/scheduling/task-sequence/greedy', methods=['POST'])
+@cached_scheduling
 def task_sequence_greedy() -> Any:
     """Busca gulosa para sequenciamento de tarefas"""
     data = get_json_data()
@@ -418,12 +679,25 @@ def task_sequence_greedy() -> Any:
         heuristic = data.get('heuristic', 'h1')
         family_data = data.get('families')
 
-        setup_matrix = SetupMatrix(tasks, setup_costs)
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
         if not setup_matrix.validate_matrix():
             abort(400, description=INCORRECT_MATRIX_MSG)
 
         families = TaskFamily(family_data) if family_data else None
-        sequence, cost = search.greedy_scheduling(tasks, setup_matrix, heuristic, families)
+        node_store = data.get('node_store', 'objects')
+        sequence, cost = search.greedy_scheduling(tasks, setup_matrix, heuristic, families, node_store)
+        stats = search.stats
+
+        # Pós-processamento opcional: busca local sobre a sequência gulosa
+        improve = data.get('improve')
+        if improve and sequence:
+            options = improve if isinstance(improve, dict) else {}
+            sequence, cost = search.local_search_scheduling(
+                tasks, setup_matrix, sequence,
+                int(options.get('neighbours', TaskSchedulingLocalSearch.NEIGHBOURS)),
+                options.get('moves', TaskSchedulingLocalSearch.MOVES),
+                options.get('time_limit'))
+            stats = {**stats, 'local_search': search.stats}
 
         setup_details = []
         if sequence:
@@ -438,17 +712,23 @@ def task_sequence_greedy() -> Any:
             'total_cost': safe_json_cost(cost),
             'setup_details': setup_details,
             'heuristic': heuristic,
+            'heuristic_cache': search.heuristic_cache_info(setup_matrix, heuristic),
+            'stats': stats,
             'algorithm': 'GREEDY'
         })
 
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid greedy options: {e}")
+        abort(400, description=str(e))
     except Exception as e:
         logging.error(f"Error in greedy task scheduling: {e}")
         abort(500, description=str(e))
 
 @app.route('/scheduling/task-sequence/ida_star', methods=['POST'])
+@cached_scheduling
 def task_sequence_ida_star() -> Any:
     """IDA* para sequenciamento de tarefas com setups"""
     data = get_json_data()
@@ -460,7 +740,7 @@ def task_sequence_ida_star() -> Any:
         heuristic = data.get('heuristic', 'h1')
         family_data = data.get('families')
 
-        setup_matrix = SetupMatrix(tasks, setup_costs)
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
         if not setup_matrix.validate_matrix():
             abort(400, description=INCORRECT_MATRIX_MSG)
 
@@ -481,21 +761,435 @@ def task_sequence_ida_star() -> Any:
             'total_cost': safe_json_cost(cost),
             'setup_details': setup_details,
             'heuristic': heuristic,
+            'heuristic_cache': search.heuristic_cache_info(setup_matrix, heuristic),
+            'stats': search.stats,
             'algorithm': 'IDA_STAR'
         })
 
     except KeyError as e:
         logging.error(f"Missing key: {e}")
         abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid IDA* input: {e}")
+        abort(400, description=str(e))
     except Exception as e:
         logging.error(f"Error in IDA* task scheduling: {e}")
         abort(500, description=str(e))
 
+@app.route('/scheduling/task-sequence/branch_and_bound', methods=['POST'])
+@cached_scheduling
+def task_sequence_branch_and_bound() -> Any:
+    """Branch and bound em profundidade para sequenciamento de tarefas com setups"""
+    data = get_json_data()
+    try:
+        search = TaskSchedulingSearch()
+
+        tasks = data['tasks']
+        setup_costs = data['setup_matrix']
+        heuristic = data.get('heuristic', 'h1')
+        family_data = data.get('families')
+        table_size = data.get('table_size')
+
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
+        if not setup_matrix.validate_matrix():
+            abort(400, description=INCORRECT_MATRIX_MSG)
+
+        families = TaskFamily(family_data) if family_data else None
+
+        sequence, cost = search.branch_and_bound_scheduling(tasks, setup_matrix, heuristic, families,
+                                                            int(table_size) if table_size is not None else None)
+
+        setup_details = []
+        if sequence:
+            prev = 0
+            for task in sequence:
+                setup_cost = setup_matrix.get_setup_cost(prev, task)
+                setup_details.append({"from": prev, "to": task, "cost": setup_cost})
+                prev = task
+
+        return jsonify({
+            'sequence': sequence,
+            'total_cost': safe_json_cost(cost),
+            'setup_details': setup_details,
+            'heuristic': heuristic,
+            'heuristic_cache': search.heuristic_cache_info(setup_matrix, heuristic),
+            'stats': search.stats,
+            'algorithm': 'BRANCH_AND_BOUND'
+        })
+
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid branch and bound input: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logging.error(f"Error in branch and bound task scheduling: {e}")
+        abort(500, description=str(e))
+
+@app.route('/scheduling/task-sequence/sma_star', methods=['POST'])
+@cached_scheduling
+def task_sequence_sma_star() -> Any:
+    """SMA* (A* com orçamento de memória) para sequenciamento de tarefas com setups"""
+    data = get_json_data()
+    try:
+        search = TaskSchedulingSearch()
+
+        tasks = data['tasks']
+        setup_costs = data['setup_matrix']
+        heuristic = data.get('heuristic', 'h1')
+        family_data = data.get('families')
+        max_nodes = data.get('max_nodes')
+        max_bytes = data.get('max_bytes')
+
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
+        if not setup_matrix.validate_matrix():
+            abort(400, description=INCORRECT_MATRIX_MSG)
+
+        families = TaskFamily(family_data) if family_data else None
+
+        sequence, cost = search.sma_star_scheduling(tasks, setup_matrix, heuristic, families,
+                                                    int(max_nodes) if max_nodes is not None else None,
+                                                    int(max_bytes) if max_bytes is not None else None)
+
+        setup_details = []
+        if sequence:
+            prev = 0
+            for task in sequence:
+                setup_cost = setup_matrix.get_setup_cost(prev, task)
+                setup_details.append({"from": prev, "to": task, "cost": setup_cost})
+                prev = task
+
+        return jsonify({
+            'sequence': sequence,
+            'total_cost': safe_json_cost(cost),
+            'setup_details': setup_details,
+            'heuristic': heuristic,
+            'heuristic_cache': search.heuristic_cache_info(setup_matrix, heuristic),
+            'stats': search.stats,
+            'algorithm': 'SMA_STAR'
+        })
+
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid SMA* input: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logging.error(f"Error in SMA* task scheduling: {e}")
+        abort(500, description=str(e))
+
+@app.route('/scheduling/task-sequence/beam', methods=['POST'])
+@cached_scheduling
+def task_sequence_beam() -> Any:
+    """Busca em feixe (largura configurável) para sequenciamento de tarefas com setups"""
+    data = get_json_data()
+    try:
+        search = TaskSchedulingSearch()
+
+        tasks = data['tasks']
+        setup_costs = data['setup_matrix']
+        heuristic = data.get('heuristic', 'h1')
+        family_data = data.get('families')
+        beam_width = int(data.get('beam_width', TaskSchedulingSearch.BEAM_WIDTH))
+
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
+        if not setup_matrix.validate_matrix():
+            abort(400, description=INCORRECT_MATRIX_MSG)
+
+        families = TaskFamily(family_data) if family_data else None
+
+        sequence, cost = search.beam_scheduling(tasks, setup_matrix, beam_width, heuristic, families)
+
+        setup_details = []
+        if sequence:
+            prev = 0
+            for task in sequence:
+                setup_cost = setup_matrix.get_setup_cost(prev, task)
+                setup_details.append({"from": prev, "to": task, "cost": setup_cost})
+                prev = task
+
+        return jsonify({
+            'sequence': sequence,
+            'total_cost': safe_json_cost(cost),
+            'setup_details': setup_details,
+            'heuristic': heuristic,
+            'heuristic_cache': search.heuristic_cache_info(setup_matrix, heuristic),
+            'stats': search.stats,
+            'algorithm': 'BEAM'
+        })
+
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid beam search input: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logging.error(f"Error in beam task scheduling: {e}")
+        abort(500, description=str(e))
+
+@app.route('/scheduling/task-sequence/local_search', methods=['POST'])
+@cached_scheduling
+def task_sequence_local_search() -> Any:
+    """Busca local (Or-opt, swap, 3-opt sem inversão) para linhas com muitas tarefas"""
+    data = get_json_data()
+    try:
+        search = TaskSchedulingSearch()
+
+        tasks = data['tasks']
+        setup_costs = data['setup_matrix']
+        initial_sequence = data.get('sequence')
+        neighbours = int(data.get('neighbours', TaskSchedulingLocalSearch.NEIGHBOURS))
+        moves = data.get('moves', TaskSchedulingLocalSearch.MOVES)
+        time_limit = data.get('time_limit')
+        time_limit = float(time_limit) if time_limit is not None else None
+
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
+        if not setup_matrix.validate_matrix():
+            abort(400, description=INCORRECT_MATRIX_MSG)
+
+        sequence, cost = search.local_search_scheduling(tasks, setup_matrix, initial_sequence,
+                                                        neighbours, moves, time_limit)
+
+        setup_details = []
+        if sequence:
+            prev = 0
+            for task in sequence:
+                setup_cost = setup_matrix.get_setup_cost(prev, task)
+                setup_details.append({"from": prev, "to": task, "cost": setup_cost})
+                prev = task
+
+        return jsonify({
+            'sequence': sequence,
+            'total_cost': safe_json_cost(cost),
+            'setup_details': setup_details,
+            'stats': search.stats,
+            'algorithm': 'LOCAL_SEARCH'
+        })
+
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid local search input: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logging.error(f"Error in local search task scheduling: {e}")
+        abort(500, description=str(e))
+
+@app.route('/scheduling/task-sequence/held_karp', methods=['POST'])
+@cached_scheduling
+def task_sequence_held_karp() -> Any:
+    """Held-Karp (programação dinâmica exata) para sequenciamento de tarefas"""
+    data = get_json_data()
+    try:
+        search = TaskSchedulingSearch()
+
+        tasks = data['tasks']
+        setup_costs = data['setup_matrix']
+
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
+        if not setup_matrix.validate_matrix():
+            abort(400, description=INCORRECT_MATRIX_MSG)
+
+        sequence, cost = search.held_karp_scheduling(tasks, setup_matrix)
+
+        setup_details = []
+        if sequence:
+            prev = 0
+            for task in sequence:
+                setup_cost = setup_matrix.get_setup_cost(prev, task)
+                setup_details.append({"from": prev, "to": task, "cost": setup_cost})
+                prev = task
+
+        return jsonify({
+            'sequence': sequence,
+            'total_cost': safe_json_cost(cost),
+            'setup_details': setup_details,
+            'algorithm': 'HELD_KARP'
+        })
+
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid Held-Karp instance: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logging.error(f"Error in Held-Karp task scheduling: {e}")
+        abort(500, description=str(e))
+
+@app.route('/scheduling/task-sequence/anytime', methods=['POST'])
+@cached_scheduling
+def task_sequence_anytime() -> Any:
+    """ARA* para sequenciamento: soluções cada vez melhores com limite de subotimalidade"""
+    data = get_json_data()
+    try:
+        search = TaskSchedulingSearch()
+
+        tasks = data['tasks']
+        setup_costs = data['setup_matrix']
+        heuristic = data.get('heuristic', 'h1')
+        family_data = data.get('families')
+        initial_weight = float(data.get('initial_weight', TaskSchedulingSearch.ANYTIME_INITIAL_WEIGHT))
+        weight_step = float(data.get('weight_step', TaskSchedulingSearch.ANYTIME_WEIGHT_STEP))
+        time_limit = data.get('time_limit')
+        time_limit = float(time_limit) if time_limit is not None else None
+        stream = bool(data.get('stream')) or 'text/event-stream' in request.headers.get('Accept', '')
+
+        setup_matrix = DenseSetupMatrix(tasks, setup_costs)
+        if not setup_matrix.validate_matrix():
+            abort(400, description=INCORRECT_MATRIX_MSG)
+
+        families = TaskFamily(family_data) if family_data else None
+        incumbents = search.anytime_scheduling_iter(tasks, setup_matrix, heuristic, families,
+                                                    initial_weight, weight_step, time_limit)
+
+        if stream:
+            # Server-Sent Events: um evento "incumbent" por solução melhorada e "done" no fim
+            def events():
+                try:
+                    for incumbent in incumbents:
+                        yield f"event: incumbent\ndata: {json.dumps(incumbent)}\n\n"
+                    yield f"event: done\ndata: {json.dumps(search.stats)}\n\n"
+                except Exception as e:
+                    logging.error(f"Error in anytime task scheduling: {e}")
+                    yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+            return Response(stream_with_context(events()), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache'})
+
+        history = list(incumbents)
+        sequence = history[-1]['sequence'] if history else []
+        cost = history[-1]['cost'] if history else float('inf')
+
+        setup_details = []
+        prev = 0  # Nó inicial
+        for task in sequence:
+            setup_cost = setup_matrix.get_setup_cost(prev, task)
+            setup_details.append({"from": prev, "to": task, "cost": setup_cost})
+            prev = task
+
+        return jsonify({
+            'sequence': sequence,
+            'total_cost': safe_json_cost(cost),
+            'setup_details': setup_details,
+            'bound': history[-1]['bound'] if history else None,
+            'optimal': bool(history and history[-1]['optimal']),
+            'incumbents': [{key: value for key, value in incumbent.items() if key != 'sequence'}
+                           for incumbent in history],
+            'heuristic': heuristic,
+            'stats': search.stats,
+            'algorithm': 'ANYTIME'
+        })
+
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid anytime options: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logging.error(f"Error in anytime task scheduling: {e}")
+        abort(500, description=str(e))
+
+@app.route('/scheduling/batch', methods=['POST'])
+def scheduling_batch() -> Any:
+    """Resolve várias instâncias de sequenciamento em paralelo (processos)"""
+    data = get_json_data()
+    try:
+        instances = data['instances']
+        if not isinstance(instances, list):
+            raise ValueError("'instances' deve ser uma lista")
+        for instance in instances:
+            if not isinstance(instance, dict):
+                raise ValueError("Cada instância deve ser um objeto")
+            algorithm = instance.get('algorithm', 'a_star')
+            if algorithm not in TaskSchedulingSearch.ALGORITHMS:
+                raise ValueError(f"Algoritmo desconhecido: {algorithm}")
+
+        start = time.perf_counter()
+        results = scheduling_batch_pool.solve(instances)
+        return jsonify({
+            'results': results,
+            'elapsed': time.perf_counter() - start,
+            'workers': scheduling_batch_pool.max_workers,
+        })
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid scheduling batch: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logging.error(f"Error in scheduling batch: {e}")
+        abort(500, description=str(e))
+
+@app.route('/scheduling/cache', methods=['GET'])
+def scheduling_cache_info() -> Any:
+    """Contadores do cache de respostas de sequenciamento"""
+    return jsonify(scheduling_cache.info())
+
+@app.route('/scheduling/cache', methods=['DELETE'])
+def scheduling_cache_clear() -> Any:
+    """Esvazia o cache de respostas de sequenciamento"""
+    scheduling_cache.clear()
+    return jsonify({'cleared': True})
+
+@app.route('/jobs', methods=['POST'])
+def submit_job() -> Any:
+    """Queue a search request and return its job id immediately."""
+    data = get_json_data()
+    try:
+        endpoint = data['endpoint']
+        payload = data.get('payload', {})
+        if not isinstance(endpoint, str) or not endpoint.startswith(('/search/', '/scheduling/')):
+            raise ValueError("endpoint must be a /search/ or /scheduling/ path")
+        if not isinstance(payload, dict):
+            raise ValueError("payload must be a JSON object")
+        try:
+            app.url_map.bind('localhost').match(endpoint, method='POST')
+        except HTTPException:
+            raise ValueError(f"Unknown search endpoint: {endpoint}")
+        # Jobs always return the complete result (no event stream)
+        payload = {key: value for key, value in payload.items() if key != 'stream'}
+        job = job_manager.submit(endpoint, payload)
+        return jsonify(job.info()), 202, {'Location': f"/jobs/{job.job_id}"}
+    except KeyError as e:
+        logging.error(f"Missing key: {e}")
+        abort(400, description=f"Missing key: {e}")
+    except ValueError as e:
+        logging.error(f"Invalid job: {e}")
+        abort(400, description=str(e))
+    except JobLimitReached as e:
+        logging.error(f"Job rejected: {e}")
+        abort(429, description=str(e))
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs() -> Any:
+    return jsonify(job_manager.info())
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id: str) -> Any:
+    try:
+        return jsonify(job_manager.get(job_id).info())
+    except KeyError:
+        abort(404, description=f"Unknown job_id: {job_id}")
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id: str) -> Any:
+    """Cancel an active job (cooperatively) or remove a finished one."""
+    try:
+        return jsonify(job_manager.cancel(job_id).info())
+    except KeyError:
+        abort(404, description=f"Unknown job_id: {job_id}")
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
     logging.error(f"404 Error: {error}")
-    return jsonify({'error': 'Not Found'}), 404
+    return jsonify({'error': 'Not Found', 'description': error.description}), 404
 
 if __name__ == '__main__':
     app.run(debug=True)
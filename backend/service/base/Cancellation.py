@@ -0,0 +1,69 @@
+from contextvars import ContextVar
+
+
+class SearchCancelled(BaseException):
+    """
+    Raised at a search checkpoint once the running job was cancelled.
+
+    It derives from BaseException (like KeyboardInterrupt) so the
+    ``except Exception`` blocks of the endpoints do not turn a cancellation
+    into an error response.
+    """
+
+
+class CancellationToken(object):
+    """
+    Cooperative cancellation flag shared between a job and the search it runs.
+
+    A token bound to the current context (see ``bind``) is picked up by the
+    search objects created in that context; their loops call ``checkpoint``
+    once per iteration, which also counts the iterations reported as the
+    job progress.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self.iterations = 0
+
+    def cancel(self):
+        """
+        Request cancellation; the search stops at its next checkpoint.
+        """
+        self.cancelled = True
+
+    def checkpoint(self, iterations=None):
+        """
+        Count one search iteration, or set the total when the iterations run
+        elsewhere (e.g. in worker processes).
+
+        :raises SearchCancelled: If cancellation was requested.
+        """
+        if iterations is None:
+            self.iterations += 1
+        else:
+            self.iterations = iterations
+        if self.cancelled:
+            raise SearchCancelled()
+
+    #--------------------------------------------------------------------------
+    # TOKEN OF THE CURRENT CONTEXT
+    #--------------------------------------------------------------------------
+    def bind(self):
+        """
+        Make this token the current one; returns the value for ``unbind``.
+        """
+        return _CURRENT.set(self)
+
+    @staticmethod
+    def unbind(previous):
+        _CURRENT.reset(previous)
+
+    @staticmethod
+    def current():
+        """
+        Return the token bound to the current context, or None outside a job.
+        """
+        return _CURRENT.get()
+
+
+_CURRENT = ContextVar('search_cancellation', default=None)
@@ -0,0 +1,232 @@
+from array import array
+from scipy.sparse import csr_matrix
+import numpy as np
+
+
+class CompiledGraph(object):
+    """
+    Graph compiled once for repeated searches.
+
+    Node names are interned to integer ids (in the order of the ``nodes`` list,
+    so an id equals the old ``nodes.index(name)``) and the adjacency is stored
+    in CSR form: the edges of node ``u`` are ``targets[offsets[u]:offsets[u + 1]]``
+    with the matching ``weights``.
+    """
+
+    def __init__(self, names, offsets, targets, weights):
+        """
+        :param names: List of node names; position is the node id.
+        :param offsets: CSR row offsets (len(names) + 1 entries).
+        :param targets: Edge target ids.
+        :param weights: Edge weights.
+        """
+        self.names = names
+        self.ids = {name: node_id for node_id, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._reverse = None
+        self._sparse = None
+
+    @property
+    def num_nodes(self):
+        return len(self.names)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    #--------------------------------------------------------------------------
+    # BUILD FROM REQUEST DATA
+    #--------------------------------------------------------------------------
+    @classmethod
+    def ensure(cls, nodes, graph):
+        """
+        Returns graph unchanged if it is already compiled, otherwise compiles it.
+
+        :param nodes: List of all nodes in the graph.
+        :param graph: Adjacency data or a CompiledGraph.
+
+        :return: A CompiledGraph.
+        """
+        if isinstance(graph, cls):
+            return graph
+        return cls.from_adjacency(nodes, graph)
+
+    @classmethod
+    def from_adjacency(cls, nodes, graph):
+        """
+        Compiles adjacency data sent by the clients.
+
+        ``graph`` may be a list aligned with ``nodes`` or a dict keyed by node
+        name. Each edge may be a neighbor name (weight 1), a ``"name:weight"``
+        string, a ``[name, weight]`` pair or a ``{"node": name, "weight": w}`` dict.
+
+        :param nodes: List of all nodes in the graph.
+        :param graph: Adjacency data.
+
+        :return: A CompiledGraph.
+        """
+        names = list(nodes)
+        ids = {}
+        for name in names:
+            ids.setdefault(name, len(ids))
+        if len(ids) != len(names):
+            names = list(ids)
+
+        if isinstance(graph, dict):
+            rows = [graph.get(name, ()) for name in names]
+            for name in graph:
+                if name not in ids:
+                    ids[name] = len(names)
+                    names.append(name)
+                    rows.append(graph[name])
+        else:
+            rows = list(graph)
+            rows.extend(() for _ in range(len(names) - len(rows)))
+
+        edges = []
+        for source, row in enumerate(rows):
+            for entry in row or ():
+                neighbor, weight = cls._parse_edge(entry)
+                target = ids.get(neighbor)
+                if target is None:
+                    target = ids[neighbor] = len(names)
+                    names.append(neighbor)
+                edges.append((source, target, weight))
+
+        return cls.from_edges(names, edges)
+
+    @classmethod
+    def from_edges(cls, names, edges):
+        """
+        Builds the CSR arrays from (source id, target id, weight) triples,
+        keeping the original order of each node's edges.
+
+        :param names: List of node names; position is the node id.
+        :param edges: Iterable of (source, target, weight).
+
+        :return: A CompiledGraph.
+        """
+        edges = list(edges)
+        counts = [0] * (len(names) + 1)
+        for source, _, _ in edges:
+            counts[source + 1] += 1
+        for i in range(len(names)):
+            counts[i + 1] += counts[i]
+
+        offsets = array('q', counts)
+        targets = array('q', bytes(8 * len(edges)))
+        weights = array('d', bytes(8 * len(edges)))
+        cursor = counts[:-1]
+        for source, target, weight in edges:
+            position = cursor[source]
+            targets[position] = target
+            weights[position] = weight
+            cursor[source] = position + 1
+
+        return cls(names, offsets, targets, weights)
+
+    @staticmethod
+    def _parse_edge(entry):
+        """
+        Normalizes one adjacency entry to (neighbor name, weight).
+        """
+        if isinstance(entry, dict):
+            return entry['node'], float(entry.get('weight', 1))
+        if isinstance(entry, (list, tuple)):
+            if len(entry) > 1:
+                return entry[0], float(entry[1])
+            return entry[0], 1.0
+        if isinstance(entry, str) and ':' in entry:
+            name, _, weight = entry.rpartition(':')
+            try:
+                return name, float(weight)
+            except ValueError:
+                pass
+        return entry, 1.0
+
+    #--------------------------------------------------------------------------
+    # ACCESSORS
+    #--------------------------------------------------------------------------
+    def id_of(self, name):
+        """
+        Returns the integer id of a node name, or None if it is not in the graph.
+        """
+        return self.ids.get(name)
+
+    def successors(self, node_id, order=1):
+        """
+        Returns the (target id, weight) pairs of a node.
+
+        :param node_id: Id of the node.
+        :param order: 1 for the stored order, -1 for reverse order.
+        """
+        start, end = self.offsets[node_id], self.offsets[node_id + 1]
+        pairs = zip(self.targets[start:end], self.weights[start:end])
+        return list(pairs)[::order]
+
+    def path_from_parents(self, parents, node_id):
+        """
+        Rebuilds the list of node names from the root to node_id following a
+        parent array (-1 marks the root).
+        """
+        path = []
+        while node_id != -1:
+            path.append(self.names[node_id])
+            node_id = parents[node_id]
+        path.reverse()
+        return path
+
+    def degrees(self):
+        """
+        Returns the out-degree plus in-degree of every node id.
+        """
+        degrees = [self.offsets[i + 1] - self.offsets[i] for i in range(self.num_nodes)]
+        for target in self.targets:
+            degrees[target] += 1
+        return degrees
+
+    #--------------------------------------------------------------------------
+    # DERIVED GRAPHS (built once, on demand)
+    #--------------------------------------------------------------------------
+    def reverse(self):
+        """
+        Returns the graph with every edge reversed, sharing the node ids.
+        """
+        if self._reverse is None:
+            edges = []
+            for source in range(self.num_nodes):
+                for edge in range(self.offsets[source], self.offsets[source + 1]):
+                    edges.append((self.targets[edge], source, self.weights[edge]))
+            self._reverse = CompiledGraph.from_edges(self.names, edges)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def to_sparse(self):
+        """
+        Returns the graph as a SciPy CSR matrix over the same arrays (parallel
+        edges are kept; scipy.sparse.csgraph uses the cheapest one).
+        """
+        if self._sparse is None:
+            self._sparse = csr_matrix(
+                (np.frombuffer(self.weights, dtype=np.float64),
+                 np.frombuffer(self.targets, dtype=np.int64),
+                 np.frombuffer(self.offsets, dtype=np.int64)),
+                shape=(self.num_nodes, self.num_nodes))
+        return self._sparse
+
+    def nbytes(self):
+        """
+        Approximate memory used by the CSR arrays (and the reversed graph,
+        once built), in bytes.
+        """
+        total = self._arrays_nbytes()
+        if self._reverse is not None:
+            total += self._reverse._arrays_nbytes()
+        return total
+
+    def _arrays_nbytes(self):
+        return (self.offsets.itemsize * len(self.offsets)
+                + self.targets.itemsize * len(self.targets)
+                + self.weights.itemsize * len(self.weights))
@@ -0,0 +1,190 @@
+from collections import OrderedDict
+from .CompiledGraph import CompiledGraph
+from .HeuristicProvider import HeuristicProvider
+import threading
+import json
+import time
+import uuid
+
+
+class UnknownGraph(KeyError):
+    """
+    Raised for a graph_id that was never registered or was already evicted
+    (the client should upload the graph again).
+    """
+
+    def __init__(self, graph_id):
+        super().__init__(f"graph_id {graph_id}")
+        self.graph_id = graph_id
+
+
+class RegisteredGraph(object):
+    """
+    A compiled graph kept by the registry, with the heuristic providers
+    built for it (keyed by their canonical request data) so preprocessing
+    such as landmark tables is paid once per graph.
+    """
+
+    def __init__(self, graph_id, graph):
+        """
+        :param graph_id: Id returned to the client.
+        :param graph: CompiledGraph.
+        """
+        self.graph_id = graph_id
+        self.graph = graph
+        self.providers = {}
+        self.created_at = time.time()
+        self.queries = 0
+
+    def nbytes(self):
+        """
+        Approximate memory used by the graph arrays and the provider tables.
+        """
+        return self.graph.nbytes() + sum(p.nbytes() for p in self.providers.values())
+
+    def info(self):
+        return {
+            'graph_id': self.graph_id,
+            'nodes': self.graph.num_nodes,
+            'edges': self.graph.num_edges,
+            'bytes': self.nbytes(),
+            'heuristics': [json.loads(key) for key in self.providers],
+            'queries': self.queries,
+            'created_at': self.created_at,
+        }
+
+
+class GraphRegistry(object):
+    """
+    Thread-safe in-memory store of compiled graphs with LRU eviction, bounded
+    by a number of graphs and by a memory budget in bytes. The most recently
+    used graph is never evicted, even if it alone exceeds the budget.
+    """
+
+    MAX_GRAPHS = 32
+    MAX_BYTES = 512 * 1024 * 1024
+
+    # Heuristic types whose per-graph preprocessing is worth keeping
+    CACHED_HEURISTICS = ('alt', 'euclidean', 'manhattan')
+
+    def __init__(self, max_graphs=MAX_GRAPHS, max_bytes=MAX_BYTES):
+        """
+        :param max_graphs: Maximum number of graphs kept.
+        :param max_bytes: Memory budget for graphs and provider tables.
+        """
+        self.max_graphs = max_graphs
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, graph_id):
+        return graph_id in self._entries
+
+    #--------------------------------------------------------------------------
+    # REGISTER / LOOKUP / REMOVE
+    #--------------------------------------------------------------------------
+    def register(self, nodes, graph):
+        """
+        Compile a graph and keep it in the registry.
+
+        :param nodes: List of all nodes in the graph.
+        :param graph: Adjacency data or a CompiledGraph.
+
+        :return: The RegisteredGraph (its graph_id identifies it in later calls).
+        """
+        entry = RegisteredGraph(uuid.uuid4().hex, CompiledGraph.ensure(nodes, graph))
+        with self._lock:
+            self._entries[entry.graph_id] = entry
+            self._evict()
+        return entry
+
+    def get(self, graph_id):
+        """
+        Return the RegisteredGraph and mark it as recently used.
+
+        :raises UnknownGraph: If the id is unknown (or was evicted).
+        """
+        with self._lock:
+            entry = self._lookup(graph_id)
+            entry.queries += 1
+            return entry
+
+    def _lookup(self, graph_id):
+        """
+        Find an entry and mark it as recently used (lock held).
+        """
+        entry = self._entries.get(graph_id)
+        if entry is None:
+            raise UnknownGraph(graph_id)
+        self._entries.move_to_end(graph_id)
+        return entry
+
+    def remove(self, graph_id):
+        """
+        Remove a graph; returns False if the id is unknown.
+        """
+        with self._lock:
+            return self._entries.pop(graph_id, None) is not None
+
+    def heuristic(self, graph_id, heuristics):
+        """
+        Return the provider for the request heuristics on a registered graph,
+        building and keeping it on first use. Per-request tables are cheap
+        and are not kept.
+
+        :param graph_id: Id of the registered graph.
+        :param heuristics: Request data accepted by HeuristicProvider.from_request.
+
+        :return: A HeuristicProvider compiled for the graph.
+        """
+        with self._lock:
+            entry = self._lookup(graph_id)
+        if not (isinstance(heuristics, dict) and heuristics.get('type') in self.CACHED_HEURISTICS
+                and 'tables' not in heuristics):
+            return HeuristicProvider.from_request(heuristics, entry.graph.names)
+
+        key = json.dumps(heuristics, sort_keys=True)
+        with self._lock:
+            provider = entry.providers.get(key)
+        if provider is not None:
+            return provider
+
+        # Built outside the lock: landmark preprocessing can take seconds
+        provider = HeuristicProvider.from_request(heuristics, entry.graph.names)
+        provider.compile(entry.graph)
+
+        with self._lock:
+            provider = entry.providers.setdefault(key, provider)
+            self._evict()
+        return provider
+
+    #--------------------------------------------------------------------------
+    # EVICTION
+    #--------------------------------------------------------------------------
+    def nbytes(self):
+        with self._lock:
+            return sum(entry.nbytes() for entry in self._entries.values())
+
+    def _evict(self):
+        """
+        Drop least recently used graphs until both limits hold (lock held).
+        """
+        total = sum(entry.nbytes() for entry in self._entries.values())
+        while len(self._entries) > 1 and (len(self._entries) > self.max_graphs or total > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            total -= entry.nbytes()
+            self.evictions += 1
+
+    def info(self):
+        with self._lock:
+            return {
+                'graphs': [entry.info() for entry in self._entries.values()],
+                'bytes': sum(entry.nbytes() for entry in self._entries.values()),
+                'max_bytes': self.max_bytes,
+                'max_graphs': self.max_graphs,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,295 @@
+from array import array
+import numpy as np
+import math
+
+
+# Precomputed heuristic between the first 20 nodes: row = node, column = destination
+GRAPH_HEURISTIC_TABLE = [
+    [0, 97, 59, 100, 53, 71, 66, 72, 91, 70, 74, 58, 62, 88, 70, 77, 67, 50, 93, 70],
+    [70, 0, 80, 70, 62, 80, 97, 87, 100, 64, 57, 67, 72, 96, 72, 86, 84, 76, 54, 98],
+    [78, 92, 0, 66, 50, 99, 71, 99, 56, 77, 52, 55, 64, 96, 96, 97, 72, 86, 91, 95],
+    [69, 70, 99, 0, 68, 82, 85, 53, 60, 88, 64, 79, 78, 75, 96, 58, 92, 58, 73, 72],
+    [83, 64, 83, 100, 0, 84, 99, 82, 86, 98, 56, 84, 83, 70, 76, 57, 51, 62, 95, 91],
+    [88, 96, 73, 77, 83, 0, 87, 95, 50, 50, 78, 59, 52, 97, 88, 95, 84, 99, 77, 90],
+    [56, 52, 73, 64, 97, 70, 0, 58, 69, 58, 95, 94, 89, 72, 53, 70, 96, 89, 75, 83],
+    [51, 64, 93, 67, 67, 63, 88, 0, 93, 52, 97, 52, 100, 71, 87, 78, 55, 99, 69, 90],
+    [84, 75, 90, 89, 62, 95, 91, 81, 0, 88, 60, 55, 71, 70, 82, 55, 90, 85, 63, 100],
+    [82, 72, 69, 92, 52, 98, 61, 62, 100, 0, 87, 68, 63, 63, 73, 99, 75, 93, 91, 85],
+    [94, 55, 100, 57, 77, 59, 62, 92, 86, 98, 0, 85, 67, 75, 87, 75, 84, 64, 79, 74],
+    [85, 69, 84, 84, 55, 65, 56, 92, 54, 99, 98, 0, 99, 90, 68, 77, 86, 59, 75, 98],
+    [92, 76, 77, 85, 51, 76, 88, 55, 75, 73, 60, 92, 0, 85, 80, 93, 82, 96, 66, 98],
+    [92, 95, 65, 57, 90, 96, 73, 94, 96, 66, 75, 82, 50, 0, 87, 52, 70, 100, 61, 73],
+    [88, 95, 76, 56, 72, 86, 59, 100, 85, 88, 58, 100, 98, 74, 0, 77, 91, 75, 79, 89],
+    [95, 74, 96, 62, 95, 93, 66, 98, 70, 66, 61, 59, 70, 82, 92, 0, 77, 67, 90, 52],
+    [63, 68, 83, 99, 61, 96, 81, 59, 83, 76, 86, 77, 94, 51, 74, 100, 0, 100, 85, 65],
+    [54, 60, 65, 52, 68, 51, 91, 66, 89, 93, 87, 86, 75, 63, 64, 67, 82, 0, 60, 55],
+    [51, 93, 100, 96, 57, 83, 50, 55, 59, 79, 81, 71, 76, 56, 93, 70, 93, 78, 0, 76],
+    [83, 73, 53, 51, 95, 93, 93, 59, 90, 78, 70, 55, 71, 52, 84, 92, 91, 78, 88, 0],
+]
+
+
+class HeuristicValues(object):
+    """
+    Heuristic of every node id towards one goal, indexed as ``values[node_id]``.
+
+    Values are computed on demand by the provider; with memo enabled each one
+    is computed at most once per query and kept in a float array.
+    """
+
+    def __init__(self, provider, compiled, goal_id, memo=False):
+        self.provider = provider
+        self.compiled = compiled
+        self.goal_id = goal_id
+        self.memo = array('d', [math.nan]) * compiled.num_nodes if memo else None
+
+    def __getitem__(self, node_id):
+        if self.memo is None:
+            return self.provider.estimate(self.compiled, node_id, self.goal_id)
+        value = self.memo[node_id]
+        if value != value:  # NaN: not computed yet
+            value = self.memo[node_id] = self.provider.estimate(self.compiled, node_id, self.goal_id)
+        return value
+
+
+class HeuristicProvider(object):
+    """
+    Base class of the graph heuristics used by A*, greedy and IDA*.
+
+    Subclasses implement ``estimate`` (O(1) by integer id). Providers that can
+    precompute every value override ``values`` and return an array instead.
+    """
+
+    def __init__(self, memo=False):
+        """
+        :param memo: Keep each estimate computed during a query.
+        """
+        self.memo = memo
+
+    def estimate(self, compiled, node_id, goal_id):
+        """
+        Return the estimated cost from node_id to goal_id.
+        """
+        raise NotImplementedError
+
+    def compile(self, compiled):
+        """
+        Prepare per-graph data ahead of the first query (nothing by default).
+        """
+
+    def nbytes(self):
+        """
+        Approximate memory kept by the provider between queries, in bytes.
+        """
+        return 0
+
+    def values(self, compiled, goal_id):
+        """
+        Return an object indexed by node id with the estimate towards goal_id.
+        """
+        return HeuristicValues(self, compiled, goal_id, self.memo)
+
+    def source_values(self, compiled, source_id):
+        """
+        Return an object indexed by node id with the estimate from source_id,
+        used as the backward heuristic of bidirectional A*. The default is 0
+        for every node, which is always consistent.
+        """
+        return ZeroHeuristic().values(compiled, source_id)
+
+    #--------------------------------------------------------------------------
+    # BUILD FROM REQUEST DATA
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def from_request(heuristics, nodes=None):
+        """
+        Build a provider from the ``heuristics`` field of a request.
+
+        - None: the legacy 20x20 table;
+        - a list aligned with ``nodes`` or a dict node -> value: a table;
+        - a dict with a ``type`` key: ``"table"`` (``values``), ``"euclidean"``
+          or ``"manhattan"`` (``coordinates`` node -> [x, y], optional
+          ``scale``), ``"alt"`` (see LandmarkHeuristic), ``"zero"`` or
+          ``"legacy"``. ``memo`` enables the per-query memo.
+
+        :param heuristics: Request data or an existing provider.
+        :param nodes: List of all nodes in the graph (for list tables).
+
+        :return: A HeuristicProvider.
+        """
+        if heuristics is None:
+            return LegacyTableHeuristic()
+        if isinstance(heuristics, HeuristicProvider):
+            return heuristics
+        if isinstance(heuristics, (list, tuple)):
+            return TableHeuristic(dict(zip(nodes or [], heuristics)))
+        if not isinstance(heuristics, dict):
+            raise ValueError(f"Invalid heuristics: {heuristics!r}")
+        if 'type' not in heuristics:
+            return TableHeuristic(heuristics)
+
+        kind = heuristics['type']
+        memo = bool(heuristics.get('memo', False))
+        if kind == 'table':
+            values = heuristics.get('values', {})
+            if isinstance(values, (list, tuple)):
+                values = dict(zip(nodes or [], values))
+            return TableHeuristic(values)
+        if kind in ('euclidean', 'manhattan'):
+            if 'coordinates' not in heuristics:
+                raise ValueError(f"Heuristic '{kind}' requires 'coordinates'")
+            return CoordinateHeuristic(heuristics['coordinates'], kind,
+                                       float(heuristics.get('scale', 1.0)), memo)
+        if kind == 'alt':
+            from .Landmarks import LandmarkHeuristic
+            return LandmarkHeuristic.from_request(heuristics)
+        if kind == 'zero':
+            return ZeroHeuristic()
+        if kind == 'legacy':
+            return LegacyTableHeuristic()
+        raise ValueError(f"Unknown heuristic type: {kind}")
+
+
+class ZeroHeuristic(HeuristicProvider):
+    """
+    h = 0 for every node (A* behaves as uniform cost).
+    """
+
+    def estimate(self, compiled, node_id, goal_id):
+        return 0.0
+
+    def values(self, compiled, goal_id):
+        return array('d', bytes(8 * compiled.num_nodes))
+
+
+class TableHeuristic(HeuristicProvider):
+    """
+    Per-request heuristic values towards the request goal (node -> value),
+    compiled to an array indexed by node id. Nodes without a value get 0.
+    """
+
+    def __init__(self, table):
+        """
+        :param table: Dict node name -> heuristic value.
+        """
+        super().__init__()
+        self.table = table
+
+    def estimate(self, compiled, node_id, goal_id):
+        return float(self.table.get(compiled.names[node_id], 0.0))
+
+    def values(self, compiled, goal_id):
+        values = array('d', bytes(8 * compiled.num_nodes))
+        for name, value in self.table.items():
+            node_id = compiled.id_of(name)
+            if node_id is not None and value is not None:
+                values[node_id] = float(value)
+        return values
+
+
+class LegacyTableHeuristic(HeuristicProvider):
+    """
+    The precomputed 20x20 table, where the first 20 node ids index the rows
+    and the goal indexes the column. Nodes outside the table get 0.
+    """
+
+    def estimate(self, compiled, node_id, goal_id):
+        size = len(GRAPH_HEURISTIC_TABLE)
+        if node_id < size and goal_id < size:
+            return float(GRAPH_HEURISTIC_TABLE[node_id][goal_id])
+        return 0.0
+
+    def values(self, compiled, goal_id):
+        values = array('d', bytes(8 * compiled.num_nodes))
+        size = len(GRAPH_HEURISTIC_TABLE)
+        if goal_id < size:
+            for node_id in range(min(size, compiled.num_nodes)):
+                values[node_id] = GRAPH_HEURISTIC_TABLE[node_id][goal_id]
+        return values
+
+
+class CoordinateHeuristic(HeuristicProvider):
+    """
+    Straight-line (Euclidean) or Manhattan distance between node coordinates,
+    multiplied by scale. Admissible when every edge weight is at least
+    scale times the distance between its endpoints. Nodes without
+    coordinates get 0.
+    """
+
+    def __init__(self, coordinates, metric='euclidean', scale=1.0, memo=False):
+        """
+        :param coordinates: Dict node name -> [x, y].
+        :param metric: "euclidean" or "manhattan".
+        :param scale: Factor applied to the distance.
+        :param memo: Keep each estimate computed during a query.
+        """
+        super().__init__(memo)
+        if metric not in ('euclidean', 'manhattan'):
+            raise ValueError(f"Unknown metric: {metric}")
+        self.coordinates = coordinates
+        self.metric = metric
+        self.scale = scale
+        self._xs = None
+        self._ys = None
+        self._known = None
+        self._rows = None
+        self._compiled_for = None
+
+    def compile(self, compiled):
+        """
+        Align the coordinates with the node ids of a compiled graph (once per graph).
+        """
+        if self._compiled_for is not compiled:
+            size = compiled.num_nodes
+            self._xs = np.zeros(size)
+            self._ys = np.zeros(size)
+            self._known = np.zeros(size, dtype=bool)
+            for name, point in self.coordinates.items():
+                node_id = compiled.id_of(name)
+                if node_id is not None:
+                    self._xs[node_id] = float(point[0])
+                    self._ys[node_id] = float(point[1])
+                    self._known[node_id] = True
+            self._rows = (self._xs.tolist(), self._ys.tolist(), self._known.tolist())
+            self._compiled_for = compiled
+
+    def nbytes(self):
+        if self._xs is None:
+            return 0
+        return self._xs.nbytes + self._ys.nbytes + self._known.nbytes + 24 * 3 * len(self._rows[0])
+
+    def values(self, compiled, goal_id):
+        """
+        With memo, values are computed lazily per node; otherwise all of them
+        are computed at once with NumPy.
+        """
+        self.compile(compiled)
+        if self.memo:
+            return super().values(compiled, goal_id)
+        if not self._known[goal_id]:
+            return [0.0] * compiled.num_nodes
+        dx = self._xs - self._xs[goal_id]
+        dy = self._ys - self._ys[goal_id]
+        if self.metric == 'manhattan':
+            distances = np.abs(dx) + np.abs(dy)
+        else:
+            distances = np.hypot(dx, dy)
+        distances *= self.scale
+        distances[~self._known] = 0.0
+        return distances.tolist()
+
+    def source_values(self, compiled, source_id):
+        """
+        The distance between coordinates is symmetric.
+        """
+        return self.values(compiled, source_id)
+
+    def estimate(self, compiled, node_id, goal_id):
+        self.compile(compiled)
+        xs, ys, known = self._rows
+        if not (known[node_id] and known[goal_id]):
+            return 0.0
+        dx = xs[node_id] - xs[goal_id]
+        dy = ys[node_id] - ys[goal_id]
+        if self.metric == 'manhattan':
+            return self.scale * (abs(dx) + abs(dy))
+        return self.scale * math.sqrt(dx * dx + dy * dy)
@@ -1,10 +1,17 @@
-from collections import deque
-from .NodeP import NodeP
+from array import array
+from heapq import heappush, heappop
+from scipy.sparse.csgraph import dijkstra
+from .CompiledGraph import CompiledGraph
+from .Cancellation import CancellationToken
+from .HeuristicProvider import HeuristicProvider
+import numpy as np
 import logging
 
 class InformedSearch(object):
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        # Token of the job running this search (None outside /jobs)
+        self.cancellation = CancellationToken.current()
         if not self.logger.handlers:
             handler = logging.StreamHandler()
             formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -12,229 +19,394 @@ class InformedSearch(object):
             self.logger.addHandler(handler)
             self.logger.setLevel(logging.INFO)
     # -------------------------------------------------------------------------
-    # SUCCESSORS FOR GRAPH
+    # DISPLAY THE PATH FOUND IN THE SEARCH TREE
     # -------------------------------------------------------------------------
-    def graph_successors(self, index, graph, step=1):
+    def display_record_path(self, compiled, tree_nodes, tree_parents, record):
         """
-        Return successors for node at index in graph. The graph is expected to
-        be an adjacency list where graph[index] is an iterable of (neighbor, cost)
-        tuples. step controls slicing direction in case the original data was reversed.
+        Reconstruct the path from the start node to an expanded record of the
+        search tree kept in arrays (node id and parent record per expansion).
         """
-        return [s for s in graph[index][::step]]
+        path = []
+        while record != -1:
+            path.append(compiled.names[tree_nodes[record]])
+            record = tree_parents[record]
+        path.reverse()
+        return path
 
     # -------------------------------------------------------------------------
-    # INSERT IN LIST KEEPING IT ORDERED
+    # BEST-FIRST EXPANSION SHARED BY UCS, GREEDY, A* AND IDA*
     # -------------------------------------------------------------------------
-    def insert_ordered(self, list_nodes, node):
+    def _best_first(self, compiled, start_id, goal_id, priority, h_values=None,
+                    bound=None, over_bound=None):
         """
-        Insert node into list_nodes keeping it ordered by node.v1 (priority).
+        Best-first search over a CompiledGraph with a binary heap and lazy
+        deletion: an entry whose g is worse than the best known g of its node
+        is skipped when popped.
+
+        :param priority: "g" (uniform cost), "h" (greedy) or "f" (g + h).
+        :param h_values: Heuristic value per node id (needed for "h" and "f").
+        :param bound: Optional f-cost bound (IDA*); children above it are not
+                      inserted and their f-costs are appended to over_bound.
+
+        :return: Tuple (path, cost) or None if the goal is not reached.
         """
-        for i, n in enumerate(list_nodes):
-            if node.v1 < n.v1:
-                list_nodes.insert(i, node)
-                break
-        else:
-            list_nodes.append(node)
+        offsets, targets, weights = compiled.offsets, compiled.targets, compiled.weights
+        best_g = array('d', [float('inf')]) * compiled.num_nodes
+        best_g[start_id] = 0.0
+
+        # Search tree: node id and parent record of each expansion
+        tree_nodes = array('q')
+        tree_parents = array('q')
+
+        # Heap entries: (priority, insertion order, g, node id, parent record)
+        heap = [(0, 0, 0.0, start_id, -1)]
+        counter = 1
+
+        while heap:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            _, _, current_g, current, parent = heappop(heap)
+            if current_g > best_g[current]:
+                continue
+
+            record = len(tree_nodes)
+            tree_nodes.append(current)
+            tree_parents.append(parent)
+
+            if current == goal_id:
+                return self.display_record_path(compiled, tree_nodes, tree_parents, record), current_g
+
+            for edge in range(offsets[current], offsets[current + 1]):
+                new = targets[edge]
+                g_cost = current_g + weights[edge]
+
+                if bound is not None:
+                    f_cost = g_cost + h_values[new]
+                    if f_cost > bound:
+                        over_bound.append(f_cost)
+                        continue
+
+                if g_cost < best_g[new]:
+                    best_g[new] = g_cost
+                    if priority == "g":
+                        f_cost = g_cost
+                    elif priority == "h":
+                        f_cost = h_values[new]
+                    else:
+                        f_cost = g_cost + h_values[new]
+                    heappush(heap, (f_cost, counter, g_cost, new, record))
+                    counter += 1
+        return None
 
-    # -------------------------------------------------------------------------
-    # DISPLAY THE PATH FOUND IN THE SEARCH TREE
-    # -------------------------------------------------------------------------
-    def display_path(self, node):
+    def _prepare(self, start, goal, nodes, graph):
         """
-        Reconstruct the path from the start node to the given node.
+        Compile the graph (once per call) and map start and goal to ids.
         """
-        path = []
-        while node is not None:
-            path.append(node.state)
-            node = node.parent
-        path.reverse()
-        return path
+        compiled = CompiledGraph.ensure(nodes, graph)
+        return compiled, compiled.id_of(start), compiled.id_of(goal)
 
     # -------------------------------------------------------------------------
-    # GRAPH HEURISTIC (precomputed table)
-    # -------------------------------------------------------------------------
-    def graph_heuristic(self, nodes, destination, n):
-        """
-        Return the heuristic cost from node n to the destination.
-        """
-        i_destination = nodes.index(destination)
-        i_n = nodes.index(n)
-        h = [
-            [0, 97, 59, 100, 53, 71, 66, 72, 91, 70, 74, 58, 62, 88, 70, 77, 67, 50, 93, 70],
-            [70, 0, 80, 70, 62, 80, 97, 87, 100, 64, 57, 67, 72, 96, 72, 86, 84, 76, 54, 98],
-            [78, 92, 0, 66, 50, 99, 71, 99, 56, 77, 52, 55, 64, 96, 96, 97, 72, 86, 91, 95],
-            [69, 70, 99, 0, 68, 82, 85, 53, 60, 88, 64, 79, 78, 75, 96, 58, 92, 58, 73, 72],
-            [83, 64, 83, 100, 0, 84, 99, 82, 86, 98, 56, 84, 83, 70, 76, 57, 51, 62, 95, 91],
-            [88, 96, 73, 77, 83, 0, 87, 95, 50, 50, 78, 59, 52, 97, 88, 95, 84, 99, 77, 90],
-            [56, 52, 73, 64, 97, 70, 0, 58, 69, 58, 95, 94, 89, 72, 53, 70, 96, 89, 75, 83],
-            [51, 64, 93, 67, 67, 63, 88, 0, 93, 52, 97, 52, 100, 71, 87, 78, 55, 99, 69, 90],
-            [84, 75, 90, 89, 62, 95, 91, 81, 0, 88, 60, 55, 71, 70, 82, 55, 90, 85, 63, 100],
-            [82, 72, 69, 92, 52, 98, 61, 62, 100, 0, 87, 68, 63, 63, 73, 99, 75, 93, 91, 85],
-            [94, 55, 100, 57, 77, 59, 62, 92, 86, 98, 0, 85, 67, 75, 87, 75, 84, 64, 79, 74],
-            [85, 69, 84, 84, 55, 65, 56, 92, 54, 99, 98, 0, 99, 90, 68, 77, 86, 59, 75, 98],
-            [92, 76, 77, 85, 51, 76, 88, 55, 75, 73, 60, 92, 0, 85, 80, 93, 82, 96, 66, 98],
-            [92, 95, 65, 57, 90, 96, 73, 94, 96, 66, 75, 82, 50, 0, 87, 52, 70, 100, 61, 73],
-            [88, 95, 76, 56, 72, 86, 59, 100, 85, 88, 58, 100, 98, 74, 0, 77, 91, 75, 79, 89],
-            [95, 74, 96, 62, 95, 93, 66, 98, 70, 66, 61, 59, 70, 82, 92, 0, 77, 67, 90, 52],
-            [63, 68, 83, 99, 61, 96, 81, 59, 83, 76, 86, 77, 94, 51, 74, 100, 0, 100, 85, 65],
-            [54, 60, 65, 52, 68, 51, 91, 66, 89, 93, 87, 86, 75, 63, 64, 67, 82, 0, 60, 55],
-            [51, 93, 100, 96, 57, 83, 50, 55, 59, 79, 81, 71, 76, 56, 93, 70, 93, 78, 0, 76],
-            [83, 73, 53, 51, 95, 93, 93, 59, 90, 78, 70, 55, 71, 52, 84, 92, 91, 78, 88, 0],
-        ]
-        return h[i_destination][i_n]
-    # -------------------------------------------------------------------------
     # UNIFORM COST
     # -------------------------------------------------------------------------
     def uniform_cost(self, start, goal, nodes, graph):
         """
-        Uniform-cost search (Dijkstra-like) where NodeP.v2 stores the g-cost.
+        Uniform-cost search (Dijkstra-like) where the priority is the g-cost.
         """
         if start == goal:
             return [start]
 
-        queue = deque()
-        root = NodeP(None, start, 0, None, None, 0)
-        queue.append(root)
-
-        visited = {start: root}
-
-        while queue:
-            current = queue.popleft()
-            current_g = current.v2
-
-            if current.state == goal:
-                return self.display_path(current), current.v2
-
-            idx = nodes.index(current.state)
-            children = self.graph_successors(idx, graph, 1)
-
-            for child in children:
-                g_cost = current_g + child[1]
-                f_cost = g_cost
-
-                if (child[0] not in visited) or (g_cost < visited[child[0]].v2):
-                    new_node = NodeP(current, child[0], f_cost, None, None, g_cost)
-                    visited[child[0]] = new_node
-                    self.insert_ordered(queue, new_node)
-        return None
+        compiled, start_id, goal_id = self._prepare(start, goal, nodes, graph)
+        if start_id is None or goal_id is None:
+            return None
+        return self._best_first(compiled, start_id, goal_id, "g")
 
     # -------------------------------------------------------------------------
     # GREEDY BEST-FIRST SEARCH
     # -------------------------------------------------------------------------
-    def greedy(self, start, goal, nodes, graph):
+    def greedy(self, start, goal, nodes, graph, heuristics=None):
         """
         Greedy best-first search (GBFS) where the priority is given by the heuristic.
+
+        heuristics is a HeuristicProvider or request data accepted by
+        HeuristicProvider.from_request (None uses the legacy table).
         """
         if start == goal:
             return [start]
 
-        queue = deque()
-        root = NodeP(None, start, 0, None, None, 0)
-        queue.append(root)
-
-        visited = {start: root}
-
-        while queue:
-            current = queue.popleft()
-            current_g = current.v2
-
-            if current.state == goal:
-                return self.display_path(current), current.v2
-
-            idx = nodes.index(current.state)
-            children = self.graph_successors(idx, graph, 1)
-
-            for child in children:
-                g_cost = current_g + child[1]
-                f_cost = self.graph_heuristic(nodes, child[0], goal)
-
-                if (child[0] not in visited) or (g_cost < visited[child[0]].v2):
-                    new_node = NodeP(current, child[0], f_cost, None, None, g_cost)
-                    visited[child[0]] = new_node
-                    self.insert_ordered(queue, new_node)
-        return None
+        compiled, start_id, goal_id = self._prepare(start, goal, nodes, graph)
+        if start_id is None or goal_id is None:
+            return None
+        provider = HeuristicProvider.from_request(heuristics, nodes)
+        h_values = provider.values(compiled, goal_id)
+        return self._best_first(compiled, start_id, goal_id, "h", h_values)
 
     # -------------------------------------------------------------------------
     # A* SEARCH
     # -------------------------------------------------------------------------
-    def a_star(self, start, goal, nodes, graph):
+    def a_star(self, start, goal, nodes, graph, heuristics=None):
         """
-        A* search where NodeP.v1 = g + h and NodeP.v2 = g.
+        A* search where the priority is g + h.
+
+        heuristics is a HeuristicProvider or request data accepted by
+        HeuristicProvider.from_request (None uses the legacy table).
         """
         if start == goal:
             return [start]
 
-        queue = deque()
-        root = NodeP(None, start, 0, None, None, 0)
-        queue.append(root)
-
-        visited = {start: root}
-
-        while queue:
-            current = queue.popleft()
-            current_g = current.v2
-
-            if current.state == goal:
-                return self.display_path(current), current.v2
-
-            idx = nodes.index(current.state)
-            children = self.graph_successors(idx, graph, 1)
-
-            for child in children:
-                g_cost = current_g + child[1]
-                f_cost = g_cost + self.graph_heuristic(nodes, child[0], goal)
-
-                if (child[0] not in visited) or (g_cost < visited[child[0]].v2):
-                    new_node = NodeP(current, child[0], f_cost, None, None, g_cost)
-                    visited[child[0]] = new_node
-                    self.insert_ordered(queue, new_node)
-        return None
+        compiled, start_id, goal_id = self._prepare(start, goal, nodes, graph)
+        if start_id is None or goal_id is None:
+            return None
+        provider = HeuristicProvider.from_request(heuristics, nodes)
+        h_values = provider.values(compiled, goal_id)
+        return self._best_first(compiled, start_id, goal_id, "f", h_values)
 
     # -------------------------------------------------------------------------
     # IDA* (iterative deepening A*)
     # -------------------------------------------------------------------------
-    def ida_star(self, start, goal, nodes, graph):
+    def ida_star(self, start, goal, nodes, graph, heuristics=None):
         """
         Iterative Deepening A* (IDA*) search where the depth limit is increased
         until a solution is found.
+
+        heuristics is a HeuristicProvider or request data accepted by
+        HeuristicProvider.from_request (None uses the legacy table).
         """
         if start == goal:
             return [start]
 
-        bound = self.graph_heuristic(nodes, start, goal)
+        compiled, start_id, goal_id = self._prepare(start, goal, nodes, graph)
+        if start_id is None or goal_id is None:
+            return None
+        provider = HeuristicProvider.from_request(heuristics, nodes)
+        h_values = provider.values(compiled, goal_id)
+
+        bound = h_values[start_id]
 
         while True:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
             over_bound = []
 
-            queue = deque()
-            root = NodeP(None, start, 0, None, None, 0)
-            queue.append(root)
+            result = self._best_first(compiled, start_id, goal_id, "f", h_values,
+                                      bound, over_bound)
+            if result is not None:
+                return result
 
-            visited = {start: root}
+            if not over_bound:
+                return None
 
-            while queue:
-                current = queue.popleft()
-                current_g = current.v2
+            bound = sum(over_bound) / len(over_bound)
 
-                if current.state == goal:
-                    return self.display_path(current), current.v2
+    # -------------------------------------------------------------------------
+    # BIDIRECTIONAL DIJKSTRA / BIDIRECTIONAL A*
+    # -------------------------------------------------------------------------
+    def bidirectional(self, start, goal, nodes, graph, heuristics=None):
+        """
+        Weighted bidirectional search: one Dijkstra from the start over the
+        edges and one from the goal over the reverse edges (the cached reverse
+        CSR of the compiled graph), alternating on the smaller heap top.
+
+        Without heuristics it is bidirectional Dijkstra. With heuristics
+        (a HeuristicProvider or request data accepted by
+        HeuristicProvider.from_request) it is bidirectional A* with average
+        potentials p(v) = (h_goal(v) - h_start(v)) / 2, where h_start comes
+        from the provider's source_values. Forward keys are d_f + p and
+        backward keys are d_b - p, so the reduced edge costs are the same in
+        both directions and non-negative when the heuristic is consistent.
+
+        mu is the best start-goal path seen when an edge reaches a node
+        labelled by the other side; the search stops once
+        top_f + top_b >= mu, which holds for both variants because the
+        potentials cancel out on a complete path.
+
+        Settled-node counts are kept in self.stats.
+
+        :return: Tuple (path, cost) or None if the goal is not reached.
+        """
+        self.stats = {'settled_forward': 0, 'settled_backward': 0, 'settled': 0}
+        if start == goal:
+            return [start]
 
-                idx = nodes.index(current.state)
-                children = self.graph_successors(idx, graph, 1)
+        compiled, start_id, goal_id = self._prepare(start, goal, nodes, graph)
+        if start_id is None or goal_id is None:
+            return None
 
-                for child in children:
-                    g_cost = current_g + child[1]
-                    f_cost = g_cost + self.graph_heuristic(nodes, child[0], goal)
+        size = compiled.num_nodes
+        inf = float('inf')
+        if heuristics is None:
+            potential = None
+        else:
+            provider = HeuristicProvider.from_request(heuristics, nodes)
+            to_goal = provider.values(compiled, goal_id)
+            from_start = provider.source_values(compiled, start_id)
+            # NaN = not computed yet; inf = cannot lie on a start-goal path
+            potential = array('d', [float('nan')]) * size
+
+        reverse = compiled.reverse()
+        sides = (
+            (compiled.offsets, compiled.targets, compiled.weights, 1.0),
+            (reverse.offsets, reverse.targets, reverse.weights, -1.0),
+        )
+        dist = (array('d', [inf]) * size, array('d', [inf]) * size)
+        parents = (array('q', [-1]) * size, array('q', [-1]) * size)
+        settled = (bytearray(size), bytearray(size))
+        dist[0][start_id] = 0.0
+        dist[1][goal_id] = 0.0
+
+        # Heap entries: (key, distance, node id)
+        if potential is None:
+            heaps = ([(0.0, 0.0, start_id)], [(0.0, 0.0, goal_id)])
+        else:
+            for node_id in (start_id, goal_id):
+                potential[node_id] = (to_goal[node_id] - from_start[node_id]) / 2
+                if not abs(potential[node_id]) < inf:
+                    # An infinite bound means the goal cannot be reached
+                    return None
+            heaps = ([(potential[start_id], 0.0, start_id)],
+                     [(-potential[goal_id], 0.0, goal_id)])
 
-                    if f_cost <= bound:
-                        if (child[0] not in visited) or (g_cost < visited[child[0]].v2):
-                            new_node = NodeP(current, child[0], f_cost, None, None, g_cost)
-                            visited[child[0]] = new_node
-                            self.insert_ordered(queue, new_node)
-                    else:
-                        over_bound.append(f_cost)
+        best, meeting = inf, -1
+        counts = [0, 0]
 
-            if not over_bound:
-                return None
+        while True:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            # Drop stale tops so both keys are the real minimum of each side
+            for side in (0, 1):
+                heap = heaps[side]
+                while heap and (settled[side][heap[0][2]] or heap[0][1] > dist[side][heap[0][2]]):
+                    heappop(heap)
+            if not heaps[0] or not heaps[1]:
+                break
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            offsets, targets, weights, sign = sides[side]
+            own_dist, other_dist = dist[side], dist[1 - side]
+            own_parents, own_settled = parents[side], settled[side]
+
+            _, current_g, current = heappop(heaps[side])
+            own_settled[current] = 1
+            counts[side] += 1
+
+            for edge in range(offsets[current], offsets[current + 1]):
+                new = targets[edge]
+                g_cost = current_g + weights[edge]
+                if g_cost >= own_dist[new]:
+                    continue
+
+                key = g_cost
+                if potential is not None:
+                    value = potential[new]
+                    if value != value:
+                        value = (to_goal[new] - from_start[new]) / 2
+                        if value != value:
+                            # inf - inf: the node neither reaches the goal nor is reached from the start
+                            value = inf
+                        potential[new] = value
+                    if value == inf or value == -inf:
+                        continue
+                    key += sign * value
+
+                own_dist[new] = g_cost
+                own_parents[new] = current
+                heappush(heaps[side], (key, g_cost, new))
+
+                total = g_cost + other_dist[new]
+                if total < best:
+                    best, meeting = total, new
+
+        self.stats = {'settled_forward': counts[0], 'settled_backward': counts[1],
+                      'settled': counts[0] + counts[1]}
+        self.logger.info(f"Bidirectional search settled {counts[0]} + {counts[1]} nodes")
+        if meeting == -1:
+            return None
+
+        # Start -> meeting node by forward parents, then meeting node -> goal by backward parents
+        path = compiled.path_from_parents(parents[0], meeting)
+        node_id = parents[1][meeting]
+        while node_id != -1:
+            path.append(compiled.names[node_id])
+            node_id = parents[1][node_id]
+        return path, best
 
-            bound = sum(over_bound) / len(over_bound)
\ No newline at end of file
+    # -------------------------------------------------------------------------
+    # MANY-TO-MANY SHORTEST PATHS
+    # -------------------------------------------------------------------------
+    def batch_shortest_paths(self, nodes, graph, pairs=None, sources=None, targets=None,
+                             include_paths=False, chunk_size=64):
+        """
+        Shortest distances between many starts and goals, running one
+        single-source Dijkstra tree per distinct source (in chunks of
+        chunk_size sources) and answering every goal from that tree.
+
+        Either pairs (a list of (start, goal)) or sources and targets (every
+        source to every target) must be given.
+
+        :return: Dict with "sources", "targets", the "distances" matrix
+                 (None when unreachable), "paths" (same shape, when
+                 include_paths) and, for pairs, "pairs" with one result each.
+        """
+        compiled = CompiledGraph.ensure(nodes, graph)
+        if pairs is not None:
+            pairs = [tuple(pair) for pair in pairs]
+            sources = list(dict.fromkeys(start for start, _ in pairs))
+            targets = list(dict.fromkeys(goal for _, goal in pairs))
+        elif sources is None or targets is None:
+            raise ValueError("Either pairs or sources and targets are required")
+
+        source_ids = [self._batch_id(compiled, name) for name in sources]
+        target_ids = [self._batch_id(compiled, name) for name in targets]
+        self.logger.info(f"Batch shortest paths: {len(sources)} sources x {len(targets)} targets")
+
+        matrix = compiled.to_sparse()
+        distances, paths = [], []
+        for first in range(0, len(source_ids), chunk_size):
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            chunk = source_ids[first:first + chunk_size]
+            if include_paths:
+                dist, predecessors = dijkstra(matrix, indices=chunk, return_predecessors=True)
+            else:
+                dist = dijkstra(matrix, indices=chunk)
+            dist = np.atleast_2d(dist)
+            for row, source_id in enumerate(chunk):
+                distances.append([None if np.isinf(dist[row, t]) else float(dist[row, t])
+                                  for t in target_ids])
+                if include_paths:
+                    paths.append([self._predecessor_path(compiled, predecessors[row], source_id, t)
+                                  if np.isfinite(dist[row, t]) else None for t in target_ids])
+
+        result = {'sources': sources, 'targets': targets, 'distances': distances}
+        if include_paths:
+            result['paths'] = paths
+        if pairs is not None:
+            row_of = {name: i for i, name in enumerate(sources)}
+            column_of = {name: j for j, name in enumerate(targets)}
+            result['pairs'] = []
+            for start, goal in pairs:
+                i, j = row_of[start], column_of[goal]
+                entry = {'start': start, 'goal': goal, 'cost': distances[i][j]}
+                if include_paths:
+                    entry['path'] = paths[i][j]
+                result['pairs'].append(entry)
+        return result
+
+    def _batch_id(self, compiled, name):
+        node_id = compiled.id_of(name)
+        if node_id is None:
+            raise ValueError(f"Unknown node: {name}")
+        return node_id
+
+    def _predecessor_path(self, compiled, predecessors, source_id, target_id):
+        """
+        Rebuild a path from a Dijkstra predecessor row (negative = no predecessor).
+        """
+        path = [compiled.names[target_id]]
+        node_id = target_id
+        while node_id != source_id:
+            node_id = int(predecessors[node_id])
+            path.append(compiled.names[node_id])
+        path.reverse()
+        return path
@@ -0,0 +1,228 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .Cancellation import CancellationToken, SearchCancelled
+import threading
+import atexit
+import time
+import uuid
+
+
+class JobLimitReached(Exception):
+    """
+    Raised when every job slot is taken by a queued or running job.
+    """
+
+
+class Job(object):
+    """
+    A search request running in the background, with its cancellation token.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, job_id, endpoint, payload):
+        """
+        :param job_id: Id returned to the client.
+        :param endpoint: Path of the search endpoint to run.
+        :param payload: JSON body for the endpoint.
+        """
+        self.job_id = job_id
+        self.endpoint = endpoint
+        self.payload = payload
+        self.token = CancellationToken()
+        self.status = self.QUEUED
+        self.status_code = None
+        self.result = None
+        self.error = None
+        self.future = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def info(self):
+        started = self.started_at
+        elapsed = None
+        if started is not None:
+            elapsed = (self.finished_at or time.time()) - started
+        info = {
+            'job_id': self.job_id,
+            'endpoint': self.endpoint,
+            'status': self.status,
+            'cancel_requested': self.token.cancelled,
+            'progress': {'iterations': self.token.iterations, 'elapsed': elapsed},
+            'created_at': self.created_at,
+            'started_at': started,
+            'finished_at': self.finished_at,
+        }
+        if self.status == self.DONE:
+            info['result'] = self.result
+        elif self.status == self.FAILED:
+            info['status_code'] = self.status_code
+            info['error'] = self.error
+        return info
+
+
+class JobManager(object):
+    """
+    Thread-safe store of background search jobs run by a bounded thread pool.
+
+    At most max_jobs jobs are kept: finished jobs are evicted retention
+    seconds after they end, or earlier (oldest first) when a new job needs
+    the slot; a submission is refused when every slot holds an active job.
+    """
+
+    MAX_WORKERS = 2
+    MAX_JOBS = 64
+    RETENTION = 600.0
+
+    def __init__(self, runner, max_workers=MAX_WORKERS, max_jobs=MAX_JOBS, retention=RETENTION):
+        """
+        :param runner: Callable (endpoint, payload) -> (status code, JSON body),
+                       called in a worker thread with the job token bound.
+        :param max_workers: Number of worker threads.
+        :param max_jobs: Maximum number of jobs kept (active and finished).
+        :param retention: Seconds a finished job is kept.
+        """
+        self.runner = runner
+        self.max_workers = max(1, max_workers)
+        self.max_jobs = max_jobs
+        self.retention = retention
+        self._jobs = OrderedDict()
+        self._executor = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def __len__(self):
+        return len(self._jobs)
+
+    #--------------------------------------------------------------------------
+    # SUBMIT / LOOKUP / CANCEL
+    #--------------------------------------------------------------------------
+    def submit(self, endpoint, payload):
+        """
+        Queue a job and return it immediately.
+
+        :raises JobLimitReached: If max_jobs jobs are queued or running.
+        """
+        job = Job(uuid.uuid4().hex, endpoint, payload)
+        with self._lock:
+            self._evict(reserve=1)
+            if len(self._jobs) >= self.max_jobs:
+                raise JobLimitReached(f"Job limit reached ({self.max_jobs} active jobs)")
+            self._jobs[job.job_id] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='search-job')
+            job.future = self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        """
+        :raises KeyError: If the id is unknown (or was evicted).
+        """
+        with self._lock:
+            self._evict()
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"job_id {job_id}")
+        return job
+
+    def cancel(self, job_id):
+        """
+        Cancel an active job (a queued job never starts; a running one stops
+        at its next checkpoint) or remove a finished one.
+
+        :raises KeyError: If the id is unknown (or was evicted).
+        """
+        job = self.get(job_id)
+        with self._lock:
+            if job.finished:
+                self._jobs.pop(job_id, None)
+                return job
+            job.token.cancel()
+            if job.future.cancel():
+                job.status = Job.CANCELLED
+                job.finished_at = time.time()
+        return job
+
+    def info(self):
+        with self._lock:
+            self._evict()
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {'jobs': len(self._jobs), 'by_status': counts, 'max_jobs': self.max_jobs,
+                    'workers': self.max_workers, 'retention': self.retention}
+
+    def _evict(self, reserve=0):
+        """
+        Drop expired finished jobs, then the oldest finished ones until
+        reserve slots are free (lock held).
+        """
+        now = time.time()
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and now - job.finished_at >= self.retention]:
+            del self._jobs[job_id]
+        if reserve and len(self._jobs) + reserve > self.max_jobs:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job.finished]:
+                del self._jobs[job_id]
+                if len(self._jobs) + reserve <= self.max_jobs:
+                    break
+
+    #--------------------------------------------------------------------------
+    # WORKER
+    #--------------------------------------------------------------------------
+    def _run(self, job):
+        """
+        Run one job in a worker thread with its token bound to the context.
+        """
+        with self._lock:
+            if job.token.cancelled:
+                job.status = Job.CANCELLED
+                job.finished_at = time.time()
+                return
+            job.status = Job.RUNNING
+            job.started_at = time.time()
+
+        previous = job.token.bind()
+        try:
+            status_code, body = self.runner(job.endpoint, job.payload)
+            if status_code == 200:
+                status = Job.DONE
+            else:
+                status = Job.FAILED
+        except SearchCancelled:
+            status_code, body, status = None, None, Job.CANCELLED
+        except Exception as e:
+            status_code, body, status = 500, {'error': str(e)}, Job.FAILED
+        finally:
+            CancellationToken.unbind(previous)
+
+        with self._lock:
+            job.status_code = status_code
+            if status == Job.DONE:
+                job.result = body
+            elif status == Job.FAILED:
+                job.error = body.get('error') if isinstance(body, dict) else body
+            job.status = status
+            job.finished_at = time.time()
+
+    def shutdown(self):
+        """
+        Cancel every active job and stop the pool (also called at interpreter exit).
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if not job.finished:
+                    job.token.cancel()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
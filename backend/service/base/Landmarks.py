@@ -0,0 +1,229 @@
+from scipy.sparse.csgraph import dijkstra
+from .HeuristicProvider import HeuristicProvider, HeuristicValues
+import numpy as np
+
+
+class LandmarkHeuristic(HeuristicProvider):
+    """
+    ALT heuristic (A*, Landmarks, Triangle inequality).
+
+    For each landmark L the tables keep d(L, v) and d(v, L) for every node v,
+    and h(v) = max over L of max(d(L, goal) - d(L, v), d(v, L) - d(goal, L)),
+    a lower bound on d(v, goal). The tables are built once per graph (or
+    loaded from a previous build) and reused by every query.
+    """
+
+    STRATEGIES = ('farthest', 'degree')
+
+    def __init__(self, count=8, strategy='farthest', memo=False):
+        """
+        :param count: Number of landmarks to select.
+        :param strategy: "farthest" (farthest-first) or "degree" (highest degree).
+        :param memo: Keep each estimate computed during a query instead of
+                     computing every node at once.
+        """
+        super().__init__(memo)
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown landmark strategy: {strategy}")
+        if count < 1:
+            raise ValueError("At least one landmark is required")
+        self.count = count
+        self.strategy = strategy
+        self.names = None
+        self.landmarks = None
+        self.from_landmarks = None
+        self.to_landmarks = None
+        self._compiled_for = None
+
+    #--------------------------------------------------------------------------
+    # PREPROCESSING
+    #--------------------------------------------------------------------------
+    def compile(self, compiled):
+        """
+        Build the distance tables for a compiled graph, or bind tables loaded
+        for a graph with the same node names (once per graph).
+        """
+        if self._compiled_for is compiled:
+            return
+        if self.from_landmarks is None or self.names != compiled.names:
+            self.build(compiled)
+        self._compiled_for = compiled
+
+    def build(self, compiled):
+        """
+        Select the landmarks and run Dijkstra from and to each of them.
+
+        :param compiled: CompiledGraph to preprocess.
+
+        :return: self
+        """
+        forward = compiled.to_sparse()
+        if self.strategy == 'degree':
+            degrees = np.asarray(compiled.degrees())
+            landmarks = [int(i) for i in np.argsort(-degrees, kind='stable')[:self.count]]
+            from_landmarks = dijkstra(forward, indices=landmarks)
+        else:
+            landmarks, from_landmarks = self._select_farthest(compiled, forward)
+
+        backward = compiled.reverse().to_sparse()
+        self.names = list(compiled.names)
+        self.landmarks = landmarks
+        self.from_landmarks = np.atleast_2d(from_landmarks)
+        self.to_landmarks = np.atleast_2d(dijkstra(backward, indices=landmarks))
+        self._compiled_for = compiled
+        return self
+
+    def _select_farthest(self, compiled, forward):
+        """
+        Farthest-first selection: the first landmark is the node farthest from
+        the highest-degree node; each next one maximizes the distance to the
+        closest landmark already chosen. The Dijkstra rows computed while
+        selecting are the d(L, v) table.
+
+        :return: Tuple (landmark ids, array of distances from each landmark).
+        """
+        if compiled.num_nodes == 0:
+            raise ValueError("Cannot select landmarks on an empty graph")
+        seed = int(np.argmax(compiled.degrees()))
+        distances = dijkstra(forward, indices=seed)
+        candidate = self._farthest(distances, seed)
+
+        landmarks, rows = [], []
+        closest = np.full(compiled.num_nodes, np.inf)
+        while len(landmarks) < min(self.count, compiled.num_nodes):
+            landmarks.append(candidate)
+            row = dijkstra(forward, indices=candidate)
+            rows.append(row)
+            closest = np.minimum(closest, row)
+            closest[landmarks] = 0.0
+            candidate = self._farthest(closest, None)
+            if candidate is None:
+                break
+        return landmarks, np.vstack(rows)
+
+    @staticmethod
+    def _farthest(distances, default):
+        """
+        Id of the reachable node with the largest positive distance, or default.
+        """
+        reachable = np.where(np.isfinite(distances), distances, -1.0)
+        node_id = int(np.argmax(reachable))
+        return node_id if reachable[node_id] > 0 else default
+
+    def nbytes(self):
+        if self.from_landmarks is None:
+            return 0
+        return self.from_landmarks.nbytes + self.to_landmarks.nbytes
+
+    #--------------------------------------------------------------------------
+    # HEURISTIC
+    #--------------------------------------------------------------------------
+    def values(self, compiled, goal_id):
+        """
+        Lower bound of every node towards goal_id, computed with NumPy over
+        all landmarks at once (or lazily per node when memo is enabled).
+        """
+        self.compile(compiled)
+        if self.memo:
+            return HeuristicValues(self, compiled, goal_id, True)
+        with np.errstate(invalid='ignore'):
+            forward = self.from_landmarks[:, goal_id][:, None] - self.from_landmarks
+            backward = self.to_landmarks - self.to_landmarks[:, goal_id][:, None]
+            bound = np.fmax(np.fmax.reduce(forward, axis=0), np.fmax.reduce(backward, axis=0))
+        # inf - inf gives NaN (no information); fmax with 0 drops it
+        return np.fmax(bound, 0.0).tolist()
+
+    def source_values(self, compiled, source_id):
+        """
+        Lower bound from source_id to every node (the same triangle
+        inequalities with the roles of the two endpoints swapped).
+        """
+        self.compile(compiled)
+        with np.errstate(invalid='ignore'):
+            forward = self.from_landmarks - self.from_landmarks[:, source_id][:, None]
+            backward = self.to_landmarks[:, source_id][:, None] - self.to_landmarks
+            bound = np.fmax(np.fmax.reduce(forward, axis=0), np.fmax.reduce(backward, axis=0))
+        return np.fmax(bound, 0.0).tolist()
+
+    def estimate(self, compiled, node_id, goal_id):
+        self.compile(compiled)
+        with np.errstate(invalid='ignore'):
+            forward = self.from_landmarks[:, goal_id] - self.from_landmarks[:, node_id]
+            backward = self.to_landmarks[:, node_id] - self.to_landmarks[:, goal_id]
+            bound = np.fmax(np.fmax.reduce(forward), np.fmax.reduce(backward))
+        return float(bound) if bound > 0 else 0.0
+
+    #--------------------------------------------------------------------------
+    # SERIALIZATION
+    #--------------------------------------------------------------------------
+    def to_dict(self):
+        """
+        JSON-safe representation of the tables (unreachable distances are None).
+        """
+        if self.from_landmarks is None:
+            raise ValueError("Landmark tables have not been built")
+        encode = lambda table: [[None if d == float('inf') else d for d in row] for row in table.tolist()]
+        return {
+            'strategy': self.strategy,
+            'names': self.names,
+            'landmarks': [self.names[i] for i in self.landmarks],
+            'from_landmarks': encode(self.from_landmarks),
+            'to_landmarks': encode(self.to_landmarks),
+        }
+
+    @classmethod
+    def from_dict(cls, data, memo=False):
+        """
+        Rebuild a provider from to_dict output.
+        """
+        decode = lambda table: np.array([[np.inf if d is None else d for d in row] for row in table],
+                                        dtype=np.float64)
+        names = list(data['names'])
+        ids = {name: i for i, name in enumerate(names)}
+        provider = cls(max(1, len(data['landmarks'])), data.get('strategy', 'farthest'), memo)
+        provider.names = names
+        provider.landmarks = [ids[name] for name in data['landmarks']]
+        provider.from_landmarks = np.atleast_2d(decode(data['from_landmarks']))
+        provider.to_landmarks = np.atleast_2d(decode(data['to_landmarks']))
+        return provider
+
+    def save(self, path):
+        """
+        Save the tables to a NumPy .npz file.
+        """
+        if self.from_landmarks is None:
+            raise ValueError("Landmark tables have not been built")
+        np.savez_compressed(path, names=np.array(self.names, dtype=object),
+                            landmarks=np.array(self.landmarks, dtype=np.int64),
+                            from_landmarks=self.from_landmarks,
+                            to_landmarks=self.to_landmarks,
+                            strategy=np.array(self.strategy))
+
+    @classmethod
+    def load(cls, path, memo=False):
+        """
+        Load tables saved with save().
+        """
+        with np.load(path, allow_pickle=True) as data:
+            landmarks = [int(i) for i in data['landmarks']]
+            provider = cls(max(1, len(landmarks)), str(data['strategy']), memo)
+            provider.names = list(data['names'])
+            provider.landmarks = landmarks
+            provider.from_landmarks = data['from_landmarks']
+            provider.to_landmarks = data['to_landmarks']
+        return provider
+
+    #--------------------------------------------------------------------------
+    # BUILD FROM REQUEST DATA
+    #--------------------------------------------------------------------------
+    @classmethod
+    def from_request(cls, heuristics):
+        """
+        Build from ``{"type": "alt", "landmarks": 8, "strategy": "farthest"}``,
+        or from previously serialized ``"tables"``.
+        """
+        memo = bool(heuristics.get('memo', False))
+        if heuristics.get('tables') is not None:
+            return cls.from_dict(heuristics['tables'], memo)
+        return cls(int(heuristics.get('landmarks', 8)),
+                   heuristics.get('strategy', 'farthest'), memo)
@@ -1,10 +1,17 @@
 from collections import deque
-from .Node import Node
+from array import array
+from .CompiledGraph import CompiledGraph
+from .Cancellation import CancellationToken
 import logging
 
+# Marker for nodes not reached yet in the parent arrays (-1 marks the root)
+UNVISITED = -2
+
 class UninformedSearch(object):
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        # Token of the job running this search (None outside /jobs)
+        self.cancellation = CancellationToken.current()
         if not self.logger.handlers:
             handler = logging.StreamHandler()
             formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -12,64 +19,38 @@ class UninformedSearch(object):
             self.logger.addHandler(handler)
             self.logger.setLevel(logging.INFO)
     #--------------------------------------------------------------------------
-    # SUCCESSORS FOR GRAPH
+    # COMPILE THE GRAPH AND RESOLVE START/GOAL
     #--------------------------------------------------------------------------
-    def successors_graph(self,idx,graph,order):
+    def _prepare(self,start,goal,nodes,graph):
         """
-        Returns the successors of a given node in the graph.
+        Compiles the graph (once per call) and maps start and goal to ids.
 
-        :param idx: Index of the node in the nodes list.
-        :param graph: Adjacency list representing the graph.
-        :param order: Order of traversal (1 for normal, -1 for reverse).
-        
-        :return: List of successor nodes.
-        """
-        successors = []
-        for suc in graph[idx][::order]:
-            successors.append(suc)
-        return successors
-    #--------------------------------------------------------------------------    
-    # SHOW PATH FOUND IN SEARCH TREE
-    #--------------------------------------------------------------------------    
-    def show_path(self,node):
-        """
-        Reconstructs the path from the start node to the given node.
-        
-        :param node: The end node of the path.
-        
-        :return: A list representing the path from start to the given node.
+        :return: Tuple (compiled graph, start id, goal id); ids are None if the
+                 node is not in the graph.
         """
-        path = []
-        while node is not None:
-            path.append(node.state)
-            node = node.parent
-        path.reverse()
-        return path
-    #--------------------------------------------------------------------------    
+        compiled = CompiledGraph.ensure(nodes, graph)
+        return compiled, compiled.id_of(start), compiled.id_of(goal)
+    #--------------------------------------------------------------------------
     # REPEATED NODE CONTROL
     #--------------------------------------------------------------------------
-    def show_path_bidirectional(self,meeting_point,visited1, visited2):
+    def show_path_bidirectional(self,meeting_point,visited1, visited2, graph):
         """
         Reconstructs the path from start to goal given a meeting point and visited nodes from both searches.
-        
-        
-        :param meeting_point: The node where both searches met.
-        :param visited1: Visited nodes from the start side.
-        :param visited2: Visited nodes from the goal side.
-        
+
+
+        :param meeting_point: Id of the node where both searches met.
+        :param visited1: Parent array of the search from the start.
+        :param visited2: Parent array of the search from the goal.
+        :param graph: CompiledGraph used to read the parent arrays.
+
         :return: A list representing the path from start to goal.
         """
-        # node from the start side
-        meeting1 = visited1[meeting_point]  
-        # node from the goal side
-        meeting2 = visited2[meeting_point]
-    
-        path1 = self.show_path(meeting1)
-        path2 = self.show_path(meeting2)
-    
+        path1 = graph.path_from_parents(visited1, meeting_point)
+        path2 = graph.path_from_parents(visited2, meeting_point)
+
         # Reverse the path
         path2 = list(reversed(path2[:-1]))
-    
+
         return path1 + path2
     #--------------------------------------------------------------------------
     # BREADTH-FIRST SEARCH
@@ -77,12 +58,12 @@ class UninformedSearch(object):
     def breadth_first_search(self,start,goal,nodes,graph):   # graph
         """
         Performs a breadth-first search on a graph.
-        
+
         :param start: The starting node.
         :param goal: The goal node.
         :param nodes: List of all nodes in the graph.
-        :param graph: Adjacency list representing the graph.
-        
+        :param graph: Adjacency list or CompiledGraph representing the graph.
+
         :return: A list representing the path from start to goal, or None if no path is found.
         """
         self.logger.info(f"Starting breadth-first search from {start} to {goal}")
@@ -90,41 +71,40 @@ class UninformedSearch(object):
         if start == goal:
             self.logger.info(f"Start equals goal: {start}")
             return [start]
-        
+
+        compiled, start_id, goal_id = self._prepare(start, goal, nodes, graph)
+        if start_id is None or goal_id is None:
+            self.logger.warning("Start or goal is not in the graph")
+            return None
+        offsets, targets = compiled.offsets, compiled.targets
+
         # List for search tree - QUEUE
-        queue = deque()
-    
-        # Include start as root node of search tree
-        root = Node(None,start,0,None,None)    # graph
-        queue.append(root)
-    
-        # Mark start as visited
-        visited = {start: root}           # graph
-        self.logger.debug(f"Initial queue size: 1, visited nodes: {len(visited)}")
-        
+        queue = deque([start_id])
+
+        # Mark start as visited (parent array doubles as the search tree)
+        parents = array('q', [UNVISITED]) * compiled.num_nodes
+        parents[start_id] = -1
+
         while queue:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
             # Remove first from QUEUE
             current = queue.popleft()
-            self.logger.debug(f"Exploring node: {current.state}, depth: {current.depth}")
-    
+
             # Generate successors from graph
-            idx = nodes.index(current.state)    # graph
-            children = self.successors_graph(idx, graph, 1) # graph
-            self.logger.debug(f"Generated {len(children)} children for node {current.state}")
-    
-            for new in children:
-                if new not in visited:   # graph
-                    child = Node(current,new,current.depth + 1,None,None)  # graph
-                    queue.append(child)
-                    visited[new] = child   # graph
-                    self.logger.debug(f"Added new node {new} to queue, depth: {child.depth}")
-                    
+            for edge in range(offsets[current], offsets[current + 1]):
+                new = targets[edge]
+                if parents[new] == UNVISITED:
+                    parents[new] = current
+
                     # Check if found the goal
-                    if new == goal:        # graph
-                        path = self.show_path(child)
+                    if new == goal_id:
+                        path = compiled.path_from_parents(parents, new)
                         self.logger.info(f"Goal found! Path: {path}, steps: {len(path)-1}")
                         return path
-        
+
+                    queue.append(new)
+
         self.logger.warning("No path found from start to goal")
         return None
     #--------------------------------------------------------------------------
@@ -133,12 +113,12 @@ class UninformedSearch(object):
     def depth_first_search(self, start, goal, nodes, graph):
         """
         Performs a depth-first search on a graph.
-        
+
         :param start: The starting node.
         :param goal: The goal node.
         :param nodes: List of all nodes in the graph.
-        :param graph: Adjacency list representing the graph.
-        
+        :param graph: Adjacency list or CompiledGraph representing the graph.
+
         :return: A list representing the path from start to goal, or None if no path is found.
         """
         self.logger.info(f"Starting depth-first search from {start} to {goal}")
@@ -146,41 +126,17 @@ class UninformedSearch(object):
         if start == goal:
             self.logger.info(f"Start equals goal: {start}")
             return [start]
-        
-        # List for search tree - STACK
-        stack = deque()
-    
-        # Include start as root node of search tree
-        root = Node(None,start,0,None,None)    # graph
-        stack.append(root)
-    
-        # Mark start as visited
-        visited = {start: root}           # graph
-        self.logger.debug(f"Initial stack size: 1, visited nodes: {len(visited)}")
-        
-        while stack:
-            # Remove last from STACK
-            current = stack.pop()
-            self.logger.debug(f"Exploring node: {current.state}, depth: {current.depth}")
-    
-            # Generate successors from graph
-            idx = nodes.index(current.state)    # graph
-            children = self.successors_graph(idx,graph,-1) # graph
-            self.logger.debug(f"Generated {len(children)} children for node {current.state}")
-    
-            for new in children:
-                if new not in visited:   # graph
-                    child = Node(current,new,current.depth + 1,None,None)  # graph
-                    stack.append(child)
-                    visited[new] = child   # graph
-                    self.logger.debug(f"Added new node {new} to stack, depth: {child.depth}")
-                    
-                    # Check if found the goal
-                    if new == goal:        # graph
-                        path = self.show_path(child)
-                        self.logger.info(f"Goal found! Path: {path}, steps: {len(path)-1}")
-                        return path
-        
+
+        compiled, start_id, goal_id = self._prepare(start, goal, nodes, graph)
+        if start_id is None or goal_id is None:
+            self.logger.warning("Start or goal is not in the graph")
+            return None
+
+        path = self._depth_limited(compiled, start_id, goal_id, None)
+        if path is not None:
+            self.logger.info(f"Goal found! Path: {path}, steps: {len(path)-1}")
+            return path
+
         self.logger.warning("No path found from start to goal")
         return None
     #--------------------------------------------------------------------------
@@ -193,7 +149,7 @@ class UninformedSearch(object):
         :param start: The starting node.
         :param goal: The goal node.
         :param nodes: List of all nodes in the graph.
-        :param graph: Adjacency list representing the graph.
+        :param graph: Adjacency list or CompiledGraph representing the graph.
         :param limit: The depth limit for the search.
 
         :return: A list representing the path from start to goal, or None if no path is found.
@@ -203,45 +159,63 @@ class UninformedSearch(object):
         if start == goal:
             self.logger.info(f"Start equals goal: {start}")
             return [start]
-        
-        # List for search tree - STACK
-        stack = deque()
-    
-        # Include start as root node of search tree
-        root = Node(None,start,0,None,None)    # graph
-        stack.append(root)
-    
-        # Mark start as visited
-        visited = {start: root}           # graph
-        self.logger.debug(f"Initial stack size: 1, visited nodes: {len(visited)}, depth limit: {limit}")
-        
+
+        compiled, start_id, goal_id = self._prepare(start, goal, nodes, graph)
+        if start_id is None or goal_id is None:
+            self.logger.warning("Start or goal is not in the graph")
+            return None
+
+        path = self._depth_limited(compiled, start_id, goal_id, limit)
+        if path is not None:
+            self.logger.info(f"Goal found! Path: {path}, steps: {len(path)-1}")
+            return path
+
+        self.logger.warning(f"No path found within depth limit {limit}")
+        return None
+    #--------------------------------------------------------------------------
+    # DEPTH-FIRST EXPANSION SHARED BY DFS, DLS AND IDS
+    #--------------------------------------------------------------------------
+    def _depth_limited(self,compiled,start_id,goal_id,limit):
+        """
+        Depth-first expansion over the compiled graph, with successors pushed in
+        reverse order so the first neighbor is explored first.
+
+        :param compiled: CompiledGraph to search.
+        :param start_id: Id of the starting node.
+        :param goal_id: Id of the goal node.
+        :param limit: Depth limit, or None for no limit.
+
+        :return: A list representing the path from start to goal, or None if no path is found.
+        """
+        offsets, targets = compiled.offsets, compiled.targets
+
+        # List for search tree - STACK of (node id, depth)
+        stack = [(start_id, 0)]
+
+        # Mark start as visited (parent array doubles as the search tree)
+        parents = array('q', [UNVISITED]) * compiled.num_nodes
+        parents[start_id] = -1
+
         while stack:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
             # Remove last from STACK
-            current = stack.pop()
-            
-            if current.depth<limit:
-                self.logger.debug(f"Exploring node: {current.state}, depth: {current.depth} (within limit {limit})")
-                # Generate successors from graph
-                idx = nodes.index(current.state)    # graph
-                children = self.successors_graph(idx,graph,-1) # graph
-                self.logger.debug(f"Generated {len(children)} children for node {current.state}")
-        
-                for new in children:
-                    if new not in visited:   # graph
-                        child = Node(current,new,current.depth + 1,None,None)  # graph
-                        stack.append(child)
-                        visited[new] = child   # graph
-                        self.logger.debug(f"Added new node {new} to stack, depth: {child.depth}")
-                        
-                        # Check if found the goal
-                        if new == goal:        # graph
-                            path = self.show_path(child)
-                            self.logger.info(f"Goal found! Path: {path}, steps: {len(path)-1}")
-                            return path
-            else:
-                self.logger.debug(f"Node {current.state} at depth {current.depth} exceeds limit {limit}")
-        
-        self.logger.warning(f"No path found within depth limit {limit}")
+            current, depth = stack.pop()
+            if limit is not None and depth >= limit:
+                continue
+
+            # Generate successors from graph (reverse order)
+            for edge in range(offsets[current + 1] - 1, offsets[current] - 1, -1):
+                new = targets[edge]
+                if parents[new] == UNVISITED:
+                    parents[new] = current
+
+                    # Check if found the goal
+                    if new == goal_id:
+                        return compiled.path_from_parents(parents, new)
+
+                    stack.append((new, depth + 1))
+
         return None
     #--------------------------------------------------------------------------
     # ITERATIVE DEEPENING SEARCH
@@ -249,54 +223,34 @@ class UninformedSearch(object):
     def iterative_deepening_search(self,start,goal,nodes,graph,max_limit):
         """
         Performs an iterative deepening search on a graph.
-        
+
         :param start: The starting node.
         :param goal: The goal node.
         :param nodes: List of all nodes in the graph.
-        :param graph: Adjacency list representing the graph.
+        :param graph: Adjacency list or CompiledGraph representing the graph.
         :param max_limit: The maximum depth limit for the search.
 
         :return: A list representing the path from start to goal, or None if no path is found.
         """
         self.logger.info(f"Starting iterative deepening search from {start} to {goal}, max limit: {max_limit}")
+        # Finish if start equals goal
+        if start == goal:
+            self.logger.info(f"Start equals goal: {start}")
+            return [start]
+
+        # Compile once for every depth limit
+        compiled, start_id, goal_id = self._prepare(start, goal, nodes, graph)
+        if start_id is None or goal_id is None:
+            self.logger.warning("Start or goal is not in the graph")
+            return None
+
         for limit in range(1,max_limit):
             self.logger.info(f"Trying depth limit: {limit}")
-            # Finish if start equals goal
-            if start == goal:
-                self.logger.info(f"Start equals goal: {start}")
-                return [start]
-            
-            # List for search tree - STACK
-            stack = deque()
-        
-            # Include start as root node of search tree
-            root = Node(None,start,0,None,None)    # graph
-            stack.append(root)
-        
-            # Mark start as visited
-            visited = {start: root}           # graph
-            
-            while stack:
-                # Remove last from STACK
-                current = stack.pop()
-                
-                if current.depth<limit:
-                    # Generate successors from graph
-                    idx = nodes.index(current.state)    # graph
-                    children = self.successors_graph(idx,graph,-1) # graph
-            
-                    for new in children:
-                        if new not in visited:   # graph
-                            child = Node(current,new,current.depth + 1,None,None)  # graph
-                            stack.append(child)
-                            visited[new] = child   # graph
-                            
-                            # Check if found the goal
-                            if new == goal:        # graph
-                                path = self.show_path(child)
-                                self.logger.info(f"Goal found at depth limit {limit}! Path: {path}, steps: {len(path)-1}")
-                                return path
-        
+            path = self._depth_limited(compiled, start_id, goal_id, limit)
+            if path is not None:
+                self.logger.info(f"Goal found at depth limit {limit}! Path: {path}, steps: {len(path)-1}")
+                return path
+
         self.logger.warning(f"No path found within max depth limit {max_limit}")
         return None
     #--------------------------------------------------------------------------
@@ -305,11 +259,11 @@ class UninformedSearch(object):
     def bidirectional_search(self, start, goal, nodes, graph):
         """
         Performs a bidirectional search on a graph.
-        
+
         :param start: The starting node.
         :param goal: The goal node.
         :param nodes: List of all nodes in the graph.
-        :param graph: Adjacency list representing the graph.
+        :param graph: Adjacency list or CompiledGraph representing the graph.
 
         :return: A list representing the path from start to goal, or None if no path is found.
         """
@@ -318,76 +272,72 @@ class UninformedSearch(object):
             self.logger.info(f"Start equals goal: {start}")
             return [start]
 
-        # List for search tree from origin - QUEUE
-        queue1 = deque()
-        
-        # List for search tree from destination - QUEUE
-        queue2 = deque()  
-        
-        # Include start and goal as root nodes of search tree
-        root = Node(None,start,0,None,None)    # graph
-        queue1.append(root)
-        root = Node(None,goal,0,None,None)    # graph
-        queue2.append(root)
-    
-        # Visited mapping state -> Node (to reconstruct path)
-        visited1 = {start: queue1[0]}
-        visited2 = {goal:    queue2[0]}
-        
-        level = 0
-        self.logger.debug("Initial setup: forward queue size: 1, backward queue size: 1")
-    
+        compiled, start_id, goal_id = self._prepare(start, goal, nodes, graph)
+        if start_id is None or goal_id is None:
+            self.logger.warning("Start or goal is not in the graph")
+            return None
+        offsets, targets = compiled.offsets, compiled.targets
+        # The search from the goal follows the edges backwards (reverse CSR, built once per graph)
+        reverse = compiled.reverse()
+        reverse_offsets, reverse_targets = reverse.offsets, reverse.targets
+
+        # List for search tree from origin and from destination - QUEUES
+        queue1 = deque([start_id])
+        queue2 = deque([goal_id])
+
+        # Parent arrays of both search trees (to reconstruct path)
+        visited1 = array('q', [UNVISITED]) * compiled.num_nodes
+        visited2 = array('q', [UNVISITED]) * compiled.num_nodes
+        visited1[start_id] = -1
+        visited2[goal_id] = -1
+
         while queue1 and queue2:
-            
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+
             # ****** Execute BREADTH-FIRST from START *******
             # Number of nodes in current level
-            level = len(queue1)  
+            level = len(queue1)
             for _ in range(level):
                 # Remove first from QUEUE
                 current = queue1.popleft()
 
                 # Generate successors
-                idx = nodes.index(current.state)
-                children = self.successors_graph(idx, graph, 1)
-
-                for new in children:
-                    if new not in visited1:
-                        child = Node(current,new,current.depth + 1,None, None)
-                        visited1[new] = child
+                for edge in range(offsets[current], offsets[current + 1]):
+                    new = targets[edge]
+                    if visited1[new] == UNVISITED:
+                        visited1[new] = current
 
                         # Found meeting point with other BREADTH-FIRST
-                        if new in visited2:
-                            path = self.show_path_bidirectional(new, visited1, visited2)
-                            self.logger.info(f"Meeting point found at {new}! Path: {path}, steps: {len(path)-1}")
+                        if visited2[new] != UNVISITED:
+                            path = self.show_path_bidirectional(new, visited1, visited2, compiled)
+                            self.logger.info(f"Meeting point found at {compiled.names[new]}! Path: {path}, steps: {len(path)-1}")
                             return path
 
                         # Insert in QUEUE
-                        queue1.append(child)
-            
+                        queue1.append(new)
+
             # ****** Execute BREADTH-FIRST from GOAL *******
             # Number of nodes in current level
-            level = len(queue2)  
+            level = len(queue2)
             for _ in range(level):
                 # Remove first from QUEUE
                 current = queue2.popleft()
 
-                # Generate successors
-                idx = nodes.index(current.state)
-                children = self.successors_graph(idx, graph, 1)
-
-                for new in children:
-                    if new not in visited2:
-                        child = Node(current,new,current.depth + 1,None, None)
-                        visited2[new] = child
+                # Generate predecessors
+                for edge in range(reverse_offsets[current], reverse_offsets[current + 1]):
+                    new = reverse_targets[edge]
+                    if visited2[new] == UNVISITED:
+                        visited2[new] = current
 
                         # Found meeting point with other BREADTH-FIRST
-                        if new in visited1:
-                            path = self.show_path_bidirectional(new, visited1, visited2)
-                            self.logger.info(f"Meeting point found at {new}! Path: {path}, steps: {len(path)-1}")
+                        if visited1[new] != UNVISITED:
+                            path = self.show_path_bidirectional(new, visited1, visited2, compiled)
+                            self.logger.info(f"Meeting point found at {compiled.names[new]}! Path: {path}, steps: {len(path)-1}")
                             return path
 
                         # Insert in QUEUE
-                        queue2.append(child)
-        
+                        queue2.append(new)
+
         self.logger.warning("No path found in bidirectional search")
         return None
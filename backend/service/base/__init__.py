@@ -1,4 +1,9 @@
 from .UninformedSearch import UninformedSearch
 from .Node import Node
 from .NodeP import NodeP
-from .InformedSearch import InformedSearch
\ No newline at end of file
+from .InformedSearch import InformedSearch
+from .CompiledGraph import CompiledGraph
+from .HeuristicProvider import HeuristicProvider
+from .GraphRegistry import GraphRegistry
+from .Cancellation import CancellationToken, SearchCancelled
+from .JobManager import JobManager
\ No newline at end of file
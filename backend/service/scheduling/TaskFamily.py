@@ -1,17 +1,88 @@
-from typing import Dict
+from typing import Dict, List, Optional
 from .TaskSchedulingData import SetupMatrix
+import numpy as np
+
+class CompiledFamilies:
+    """
+    Índice de famílias pré-calculado para uma matriz de setup.
+
+    Guarda o id da família de cada tarefa (por posição de bit), o bitmask das
+    tarefas de cada família e a matriz de menor custo entre pares de famílias,
+    para que a H3 use apenas operações de bits por nó.
+    """
+
+    def __init__(self, families: Dict[int, str], setup_matrix: SetupMatrix):
+        """
+        :param families: Dicionário tarefa -> nome da família (chaves inteiras)
+        :param setup_matrix: Matriz de custos de setup
+        """
+        dense = setup_matrix.to_dense()
+        self.names: List[str] = sorted({families[task] for task in dense.tasks if task in families})
+        family_ids = {name: fid for fid, name in enumerate(self.names)}
+
+        # Id da família por posição de bit (-1 = tarefa sem família)
+        self.family_of = [family_ids.get(families.get(task), -1) for task in dense.tasks]
+        self.family_of_task = {task: fid for task, fid in zip(dense.tasks, self.family_of)}
+        self.all_assigned = bool(dense.tasks) and min(self.family_of) >= 0
+
+        # Bitmask das tarefas de cada família
+        self.family_masks = [0] * len(self.names)
+        for position, fid in enumerate(self.family_of):
+            if fid >= 0:
+                self.family_masks[fid] |= 1 << position
+
+        n_families = len(self.names)
+        task_costs = dense.costs[1:, 1:]
+        labels = np.array(self.family_of, dtype=np.int64)
+
+        # Menor custo de setup entre tarefas de famílias diferentes (ou sem família)
+        different = (labels[:, None] != labels[None, :]) | (labels[:, None] < 0) | (labels[None, :] < 0)
+        np.fill_diagonal(different, False)
+        candidates = task_costs[different]
+        min_cost = float(candidates.min()) if candidates.size else float('inf')
+        self.min_interfamily_cost = min_cost if min_cost != float('inf') else 0.0
+
+        # Menor custo de qualquer tarefa da família a para qualquer tarefa da família b
+        self.pair_min = np.full((n_families, n_families), np.inf)
+        for a in range(n_families):
+            rows = task_costs[labels == a]
+            for b in range(n_families):
+                if a != b:
+                    self.pair_min[a, b] = rows[:, labels == b].min()
+        self.symmetric_pair_rows = np.minimum(self.pair_min, self.pair_min.T).tolist()
+
+    def remaining_families(self, remaining_bitmask: int) -> List[int]:
+        """
+        Ids das famílias com pelo menos uma tarefa restante
+
+        :param remaining_bitmask: Bitmask de tarefas restantes
+        :return: Lista de ids de família
+        """
+        return [fid for fid, mask in enumerate(self.family_masks) if mask & remaining_bitmask]
+
 
 class TaskFamily:
     def __init__(self, family_assignments: Dict[int, str] = None):
         """
         :param family_assignments: Dicionário com chaves como IDs de tarefas e valores como nomes de famílias
+        :raises ValueError: Se não for um dicionário ou alguma chave não for um ID de tarefa inteiro
         """
-        self.families = family_assignments or {}
+        if family_assignments is not None and not isinstance(family_assignments, dict):
+            raise ValueError("families deve ser um objeto tarefa -> família")
+        # Chaves chegam como string no JSON ("1": "A"); normaliza para inteiro
+        self.families = {}
+        for task, family in (family_assignments or {}).items():
+            try:
+                self.families[int(task)] = family
+            except (TypeError, ValueError):
+                raise ValueError(f"families: chave {task!r} não é um ID de tarefa inteiro") from None
+        self._compiled: Optional[CompiledFamilies] = None
+        self._compiled_for = None
 
     def same_family(self, task1: int, task2: int) -> bool:
         """
         Verifica se duas tarefas pertencem à mesma família
-        
+
         :param task1: ID da primeira tarefa
         :param task2: ID da segunda tarefa
         :return: Verdadeiro se ambas as tarefas pertencem à mesma família, falso caso contrário.
@@ -21,21 +92,26 @@ class TaskFamily:
         return (task1 in self.families and task2 in self.families and
                 self.families[task1] == self.families[task2])
 
+    def compile(self, setup_matrix: SetupMatrix) -> CompiledFamilies:
+        """
+        Retorna o índice de famílias para a matriz, calculado uma única vez
+
+        :param setup_matrix: Instância de SetupMatrix com os custos de setup
+        :return: Instância de CompiledFamilies
+        """
+        dense = setup_matrix.to_dense()
+        if self._compiled is None or self._compiled_for is not dense:
+            self._compiled = CompiledFamilies(self.families, dense)
+            self._compiled_for = dense
+        return self._compiled
+
     def get_min_interfamily_cost(self, setup_matrix: SetupMatrix) -> float:
         """
         Retorna o menor custo entre tarefas de famílias diferentes
-        
+
         :param setup_matrix: Instância de SetupMatrix com os custos de setup
         :return: Menor custo entre tarefas de famílias diferentes
         """
         if not self.families:
             return 0.0
-
-        min_cost = float('inf')
-        for i in setup_matrix.tasks:
-            for j in setup_matrix.tasks:
-                if i != j and not self.same_family(i, j):
-                    cost = setup_matrix.get_setup_cost(i, j)
-                    if cost < min_cost:
-                        min_cost = cost
-        return min_cost if min_cost != float('inf') else 0.0
\ No newline at end of file
+        return self.compile(setup_matrix).min_interfamily_cost
@@ -0,0 +1,166 @@
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+from .TaskSchedulingSearch import TaskSchedulingSearch
+from .TaskSchedulingData import DenseSetupMatrix
+from .TaskFamily import TaskFamily
+from ..base.Cancellation import CancellationToken, SearchCancelled
+import multiprocessing
+import threading
+import atexit
+import time
+import os
+
+
+def solve_instance(instance: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve uma instância de sequenciamento (executado nos processos do pool)
+
+    Função de nível de módulo para poder ser serializada (pickle) pelo
+    ProcessPoolExecutor. Erros da instância viram um campo "error" no
+    resultado, sem interromper as demais instâncias do lote.
+
+    :param instance: Dicionário com tasks, setup_matrix e, opcionalmente,
+                     algorithm, heuristic, families e opções do algoritmo
+    :return: Dicionário com sequence, total_cost, setup_details, elapsed e stats
+    """
+    start = time.perf_counter()
+    algorithm = instance.get('algorithm', 'a_star')
+    heuristic = instance.get('heuristic', 'h1')
+    result = {'algorithm': algorithm, 'heuristic': heuristic}
+    try:
+        tasks = instance['tasks']
+        setup_matrix = DenseSetupMatrix(tasks, instance['setup_matrix'])
+        if not setup_matrix.validate_matrix():
+            raise ValueError("Matriz de setup incompleta")
+        family_data = instance.get('families')
+        families = TaskFamily(family_data) if family_data else None
+
+        search = TaskSchedulingSearch()
+        options = {key: instance[key] for key in ('depth_limit', 'node_store', 'table_size',
+                                                  'heuristic_cache_size', 'initial_weight',
+                                                  'weight_step', 'time_limit', 'beam_width',
+                                                  'max_nodes', 'max_bytes', 'sequence',
+                                                  'neighbours', 'moves') if key in instance}
+        sequence, cost = search.run(algorithm, tasks, setup_matrix, heuristic, families, **options)
+
+        setup_details = []
+        prev = 0  # Nó inicial
+        for task in sequence or []:
+            setup_details.append({"from": prev, "to": task, "cost": setup_matrix.get_setup_cost(prev, task)})
+            prev = task
+
+        result.update({
+            'sequence': sequence,
+            'total_cost': None if cost == float('inf') else cost,
+            'setup_details': setup_details,
+            'stats': search.stats,
+        })
+    except KeyError as e:
+        result['error'] = f"Missing key: {e}"
+    except Exception as e:
+        result['error'] = str(e)
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def solve_chunk(instances: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Resolve um grupo de instâncias em um processo do pool
+
+    :param instances: Instâncias (ver solve_instance)
+    :return: Resultados na mesma ordem
+    """
+    return [solve_instance(instance) for instance in instances]
+
+
+class TaskSchedulingBatch:
+    """
+    Resolve lotes de instâncias independentes em um ProcessPoolExecutor
+    compartilhado entre requisições.
+
+    O número de processos vem de SCHEDULING_BATCH_WORKERS (ou os.cpu_count()).
+    Os processos são criados com "spawn", seguro mesmo com o Flask em threads.
+    """
+
+    WORKERS_ENV = 'SCHEDULING_BATCH_WORKERS'
+    # Intervalo entre verificações de cancelamento enquanto os grupos executam (segundos)
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        :param max_workers: Número de processos (padrão: variável de ambiente ou núcleos)
+        """
+        if max_workers is None:
+            max_workers = int(os.environ.get(self.WORKERS_ENV, 0)) or os.cpu_count() or 1
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Cria o pool na primeira utilização e o reaproveita nas seguintes
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def solve(self, instances: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Resolve as instâncias em paralelo, retornando os resultados na mesma ordem
+
+        Dentro de um job (/jobs), o token de cancelamento é verificado entre as
+        instâncias: ao cancelar, os grupos ainda não iniciados são descartados
+        (os que já estão em um processo terminam em segundo plano).
+
+        :param instances: Lista de instâncias (ver solve_instance)
+        :return: Lista de resultados, um por instância
+        :raises SearchCancelled: Se o job foi cancelado
+        """
+        cancellation = CancellationToken.current()
+        if len(instances) <= 1 or self.max_workers == 1:
+            results = []
+            for instance in instances:
+                if cancellation is not None:
+                    cancellation.checkpoint()
+                results.append(solve_instance(instance))
+            return results
+
+        # Agrupa instâncias por processo para reduzir o custo de comunicação
+        chunksize = max(1, len(instances) // (4 * self.max_workers))
+        chunks = [instances[i:i + chunksize] for i in range(0, len(instances), chunksize)]
+        try:
+            executor = self._get_executor()
+            futures = [executor.submit(solve_chunk, chunk) for chunk in chunks]
+            pending = set(futures)
+            completed = 0
+            try:
+                while pending:
+                    done, pending = wait(pending, timeout=self.POLL_INTERVAL,
+                                         return_when=FIRST_COMPLETED)
+                    if cancellation is not None:
+                        # Progresso do job: instâncias concluídas
+                        completed += sum(len(future.result()) for future in done)
+                        cancellation.checkpoint(completed)
+            except SearchCancelled:
+                for future in pending:
+                    future.cancel()
+                raise
+            return [result for future in futures for result in future.result()]
+        except BrokenProcessPool:
+            # Um processo morreu (ex.: falta de memória): descarta o pool para a próxima requisição
+            with self._lock:
+                self._executor = None
+            raise
+
+    def shutdown(self) -> None:
+        """
+        Encerra os processos do pool (chamado também na saída do interpretador)
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,96 @@
+from typing import List, Set
+import mmap
+import sys
+
+
+class TaskSchedulingClosedSet:
+    """
+    Conjunto fechado compacto para os estados (remaining_bitmask, last_task).
+
+    Cada estado é codificado como o inteiro remaining_bitmask * (n + 1) +
+    índice da última tarefa (0 = nó inicial), sem criar tuplas. Até
+    BITMAP_MAX_TASKS tarefas, se couber em max_bytes, o conjunto é um array de
+    bits pré-alocado em um mmap anônimo: 1 bit por estado possível, com as
+    páginas ocupando memória só quando tocadas. Acima disso é um set de
+    inteiros (até 64 bits para n <= 58).
+    """
+
+    BITMAP_MAX_TASKS = 26
+    # Maior array de bits aceito (n = 26 ocupa cerca de 216 MB)
+    MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, tasks: List[int], max_bytes: int = MAX_BYTES):
+        """
+        :param tasks: Lista de tarefas (bit i do bitmask corresponde a tasks[i])
+        :param max_bytes: Tamanho máximo do array de bits
+        """
+        n_tasks = len(tasks)
+        self._stride = n_tasks + 1
+        self._index_of = {0: 0}
+        for i, task in enumerate(tasks):
+            self._index_of[task] = i + 1
+        self._count = 0
+        self._keys: Set[int] = set()
+
+        bitmap_bytes = ((self._stride << n_tasks) + 7) >> 3
+        if n_tasks <= self.BITMAP_MAX_TASKS and bitmap_bytes <= max_bytes:
+            self.kind = "bitmap"
+            self._bits = mmap.mmap(-1, bitmap_bytes)
+        else:
+            self.kind = "hash"
+            self._bits = None
+
+    def __len__(self) -> int:
+        return self._count if self._bits is not None else len(self._keys)
+
+    def add(self, remaining_bitmask: int, last_task: int) -> None:
+        """
+        Marca o estado como fechado
+
+        :param remaining_bitmask: Bitmask de tarefas restantes
+        :param last_task: Última tarefa agendada (0 = nó inicial)
+        """
+        key = remaining_bitmask * self._stride + self._index_of[last_task]
+        bits = self._bits
+        if bits is None:
+            self._keys.add(key)
+            return
+        position = key >> 3
+        value = bits[position]
+        mask = 1 << (key & 7)
+        if not value & mask:
+            bits[position] = value | mask
+            self._count += 1
+
+    def contains(self, remaining_bitmask: int, last_task: int) -> bool:
+        """
+        Verifica se o estado já foi fechado
+
+        :param remaining_bitmask: Bitmask de tarefas restantes
+        :param last_task: Última tarefa agendada (0 = nó inicial)
+        :return: True se o estado está no conjunto
+        """
+        key = remaining_bitmask * self._stride + self._index_of[last_task]
+        bits = self._bits
+        if bits is None:
+            return key in self._keys
+        return bool(bits[key >> 3] & (1 << (key & 7)))
+
+    def nbytes(self) -> int:
+        """
+        Memória ocupada: o tamanho do array de bits ou a estimativa do set de inteiros
+
+        :return: Bytes
+        """
+        if self._bits is not None:
+            return len(self._bits)
+        key_bytes = sys.getsizeof(self._stride << (self._stride - 1))
+        return sys.getsizeof(self._keys) + len(self._keys) * key_bytes
+
+    def info(self) -> dict:
+        """
+        Resumo para as estatísticas da busca
+
+        :return: Dicionário com kind, states e bytes
+        """
+        return {'kind': self.kind, 'states': len(self), 'bytes': self.nbytes()}
@@ -1,4 +1,5 @@
 from typing import List, Dict
+import numpy as np
 
 class SetupMatrix:
     def __init__(self, tasks: List[int], setup_costs: Dict[str, float]):
@@ -9,6 +10,7 @@ class SetupMatrix:
         self.tasks = tasks
         self.setup_costs = {}
         self.n_tasks = len(tasks)
+        self._dense = None
 
         # Converte chaves string para tuplas inteiras
         for key, cost in setup_costs.items():
@@ -19,7 +21,7 @@ class SetupMatrix:
       """
       Retorna o custo de setup entre duas tarefas.
       Se não houver custo definido, retorna infinito.
-      
+
       :param from_task: ID da tarefa de origem.
       :param to_task: ID da tarefa de destino.
       :return: Custo de setup entre as tarefas.
@@ -29,11 +31,152 @@ class SetupMatrix:
     def validate_matrix(self) -> bool:
         """
         Verifica se a matriz está completa para todas as tarefas
-        
+
         :return: Verdadeiro se a matriz estiver completa, falso caso contrário.
         """
         for i in [0] + self.tasks:  # Inclui nó inicial 0
             for j in self.tasks:
                 if i != j and (i, j) not in self.setup_costs:
                     return False
-        return True
\ No newline at end of file
+        return True
+
+    def to_dense(self) -> "DenseSetupMatrix":
+        """
+        Retorna a representação densa (NumPy) desta matriz, criada uma única vez
+
+        :return: Instância de DenseSetupMatrix com os mesmos custos
+        """
+        if self._dense is None:
+            self._dense = DenseSetupMatrix.from_setup_matrix(self)
+        return self._dense
+
+
+class DenseSetupMatrix(SetupMatrix):
+    """
+    Matriz de setup densa, indexada pela posição das tarefas.
+
+    O índice 0 é o nó inicial fictício (tarefa 0) e a tarefa tasks[p] ocupa o
+    índice p + 1, de modo que o bit p do remaining_bitmask corresponde à
+    linha/coluna p + 1. Custos ausentes e a diagonal valem infinito.
+    """
+
+    def __init__(self, tasks: List[int], setup_costs: Dict[str, float]):
+        """
+        :param tasks: Lista de IDs das tarefas [1, 2, 3, ...]
+        :param setup_costs: Dicionário com chaves "(i,j)" e valores de custo
+        """
+        super().__init__(tasks, setup_costs)
+        self._compile()
+
+    @classmethod
+    def from_setup_matrix(cls, setup_matrix: SetupMatrix) -> "DenseSetupMatrix":
+        """
+        Cria a matriz densa a partir de uma SetupMatrix já convertida
+
+        :param setup_matrix: Matriz de setup baseada em dicionário
+        :return: Nova instância de DenseSetupMatrix
+        """
+        dense = cls.__new__(cls)
+        dense.tasks = setup_matrix.tasks
+        dense.setup_costs = setup_matrix.setup_costs
+        dense.n_tasks = setup_matrix.n_tasks
+        dense._compile()
+        return dense
+
+    def _compile(self) -> None:
+        """
+        Monta o array contíguo de custos e o mapeamento tarefa <-> índice
+        """
+        self._dense = self
+        self.task_ids = [0] + list(self.tasks)
+        self.index_of = {task: index for index, task in enumerate(self.task_ids)}
+
+        size = len(self.task_ids)
+        self.costs = np.full((size, size), np.inf, dtype=np.float64)
+        for (i, j), cost in self.setup_costs.items():
+            if i != j and i in self.index_of and j in self.index_of and cost is not None:
+                self.costs[self.index_of[i], self.index_of[j]] = cost
+
+        # Listas aninhadas para acessos escalares dentro de laços Python
+        # (indexar listas é mais rápido que indexar escalares de um ndarray)
+        self.rows = self.costs.tolist()
+
+        # Tabelas derivadas (ex.: heurísticas) criadas sob demanda, uma vez por matriz
+        self.tables = {}
+
+    def __getstate__(self) -> dict:
+        """
+        Estado para pickle (ex.: envio a outros processos) sem as tabelas
+        derivadas, que podem conter locks e são recriadas sob demanda
+        """
+        state = self.__dict__.copy()
+        state['tables'] = {}
+        return state
+
+    def get_setup_cost(self, from_task: int, to_task: int) -> float:
+        """
+        Retorna o custo de setup entre duas tarefas (infinito se indefinido)
+
+        :param from_task: ID da tarefa de origem
+        :param to_task: ID da tarefa de destino
+        :return: Custo de setup entre as tarefas
+        """
+        i = self.index_of.get(from_task)
+        j = self.index_of.get(to_task)
+        if i is None or j is None:
+            return float('inf')
+        return self.rows[i][j]
+
+    def row(self, task: int) -> np.ndarray:
+        """
+        Custos de saída de uma tarefa (view sobre o array)
+
+        :param task: ID da tarefa de origem
+        :return: Array com o custo para cada índice de destino
+        """
+        return self.costs[self.index_of[task]]
+
+    def column(self, task: int) -> np.ndarray:
+        """
+        Custos de entrada de uma tarefa (view sobre o array)
+
+        :param task: ID da tarefa de destino
+        :return: Array com o custo vindo de cada índice de origem
+        """
+        return self.costs[:, self.index_of[task]]
+
+    def submatrix(self, indices) -> np.ndarray:
+        """
+        Submatriz de custos entre os índices informados
+
+        :param indices: Índices densos (não IDs) das tarefas
+        :return: Array len(indices) x len(indices)
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        return self.costs[np.ix_(indices, indices)]
+
+    def bitmask_indices(self, bitmask: int) -> List[int]:
+        """
+        Converte um remaining_bitmask nos índices densos das tarefas restantes
+
+        :param bitmask: Bitmask de tarefas restantes
+        :return: Lista de índices densos (posição + 1)
+        """
+        indices = []
+        position = 1
+        while bitmask:
+            if bitmask & 1:
+                indices.append(position)
+            bitmask >>= 1
+            position += 1
+        return indices
+
+    def validate_matrix(self) -> bool:
+        """
+        Verifica (de forma vetorizada) se a matriz está completa
+
+        :return: Verdadeiro se todos os custos i -> j (i != j, j != 0) estiverem definidos
+        """
+        required = self.costs[:, 1:]
+        off_diagonal = ~np.eye(len(self.task_ids), dtype=bool)[:, 1:]
+        return bool(np.isfinite(required[off_diagonal]).all())
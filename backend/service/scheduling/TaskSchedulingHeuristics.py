@@ -1,9 +1,227 @@
-from typing import List
+from typing import Dict, List, Optional
+from array import array
+from collections import OrderedDict
+import threading
 from .TaskSchedulingNode import TaskSchedulingNode
-from .TaskSchedulingData import SetupMatrix
+from .TaskSchedulingData import SetupMatrix, DenseSetupMatrix
 from .TaskFamily import TaskFamily
-import heapq
-  
+import numpy as np
+
+
+class MinimumOutgoingTable:
+    """
+    Motor incremental da heurística H1, construído uma vez por matriz.
+
+    Para cada tarefa os destinos são ordenados por custo de saída. O menor
+    custo de saída dentro de um conjunto restante é o primeiro destino da lista
+    que ainda pertence ao conjunto, então basta guardar um ponteiro por tarefa.
+    Ao remover uma tarefa do conjunto do pai, só os ponteiros que apontavam
+    para ela avançam. O resultado é memorizado por remaining_bitmask.
+    """
+
+    MAX_ENTRIES = 200_000
+
+    def __init__(self, dense: DenseSetupMatrix, max_entries: int = MAX_ENTRIES):
+        """
+        :param dense: Matriz de setup densa
+        :param max_entries: Número máximo de bitmasks memorizados
+        """
+        task_costs = dense.costs[:, 1:]
+        order = np.argsort(task_costs, axis=1, kind='stable')
+        # Linha = índice denso de origem; valores = posições de bit dos destinos
+        self.sorted_targets = order.tolist()
+        self.sorted_costs = np.take_along_axis(task_costs, order, axis=1).tolist()
+        self.index_of = dense.index_of
+        self.costs = dense.costs
+        self.max_entries = max_entries
+        self._memo = {}
+
+    def evaluate(self, remaining_bitmask: int, last_task: int,
+                 parent_bitmask: Optional[int] = None) -> float:
+        """
+        Calcula H1 para o estado (remaining_bitmask, last_task)
+
+        :param remaining_bitmask: Bitmask de tarefas restantes
+        :param last_task: Última tarefa agendada
+        :param parent_bitmask: Bitmask do pai (permite cálculo incremental)
+        :return: Valor da heurística H1
+        """
+        if remaining_bitmask == 0:
+            return 0.0
+
+        # Custo mínimo para sair da última tarefa processada
+        row = self.index_of[last_task]
+        targets = self.sorted_targets[row]
+        k = 0
+        while not remaining_bitmask >> targets[k] & 1:
+            k += 1
+        min_cost_from_last = self.sorted_costs[row][k]
+
+        return min_cost_from_last + self.outgoing_bound(remaining_bitmask, parent_bitmask)
+
+    def successor_values(self, remaining_indices: List[int]) -> np.ndarray:
+        """
+        H1 de todos os filhos de um estado de uma só vez (vetorizado)
+
+        O filho que agenda a tarefa i tem i como última tarefa e R - {i} como
+        conjunto restante. Com o menor (a) e o segundo menor (b) custo de saída
+        de cada tarefa dentro de R, o menor custo de r dentro de R - {i} é b[r]
+        se o mínimo de r apontava para i e a[r] caso contrário; somas e máximos
+        de todos os filhos saem de um bincount, em O(|R|²) por estado em vez de
+        O(|R|) avaliações independentes.
+
+        :param remaining_indices: Índices densos das tarefas restantes no pai
+        :return: Array com a H1 de cada filho, na ordem de remaining_indices
+        """
+        m = len(remaining_indices)
+        if m == 1:
+            return np.zeros(1)
+        sub = self.costs[np.ix_(remaining_indices, remaining_indices)]
+        first_cost = sub.min(axis=1)
+        if m == 2:
+            # Cada filho tem uma única tarefa restante: H1 = custo até ela
+            return first_cost.copy()
+
+        first_target = sub.argmin(axis=1)
+        second_cost = np.partition(sub, 1, axis=1)[:, 1]
+
+        # Soma das menores saídas em R - {i}, corrigindo quem apontava para i
+        corrections = np.bincount(first_target, weights=second_cost - first_cost, minlength=m)
+        totals = first_cost.sum() - first_cost + corrections
+
+        # Maior saída em R - {i}: maior a[r] com r != i, ou maior b[r] corrigido
+        largest_corrected = np.full(m, -np.inf)
+        np.maximum.at(largest_corrected, first_target, second_cost)
+        top = np.argsort(first_cost)[-2:]
+        largest_other = np.full(m, first_cost[top[1]])
+        largest_other[top[1]] = first_cost[top[0]]
+        largest = np.maximum(largest_other, largest_corrected)
+
+        # first_cost[i] é também o menor custo saindo de i (nova última tarefa)
+        return first_cost + totals - largest
+
+    def outgoing_bound(self, remaining_bitmask: int, parent_bitmask: Optional[int] = None) -> float:
+        """
+        Soma dos menores custos de saída das tarefas restantes, menos o maior
+
+        :param remaining_bitmask: Bitmask de tarefas restantes
+        :param parent_bitmask: Bitmask do pai (permite cálculo incremental)
+        :return: Parte da H1 que depende apenas do conjunto restante
+        """
+        entry = self._memo.get(remaining_bitmask)
+        if entry is not None:
+            return entry[0]
+
+        if remaining_bitmask & (remaining_bitmask - 1) == 0:  # Uma única tarefa
+            bound, pointers = 0.0, None
+        else:
+            parent = self._memo.get(parent_bitmask) if parent_bitmask is not None else None
+            # Os ponteiros de um superconjunto nunca passam do destino correto
+            if (parent is not None and parent[1] is not None
+                    and parent_bitmask & remaining_bitmask == remaining_bitmask):
+                pointers = array('H', parent[1])
+            else:
+                pointers = array('H', bytes(2 * len(self.sorted_targets)))
+            bound = self._advance_pointers(remaining_bitmask, pointers)
+
+        if len(self._memo) >= self.max_entries:
+            self._memo.clear()
+        self._memo[remaining_bitmask] = (bound, pointers)
+        return bound
+
+    def _advance_pointers(self, remaining_bitmask: int, pointers: array) -> float:
+        """
+        Avança os ponteiros até o primeiro destino restante e soma os custos
+
+        :param remaining_bitmask: Bitmask de tarefas restantes (2 ou mais)
+        :param pointers: Ponteiros por índice denso (atualizados no lugar)
+        :return: Soma dos menores custos de saída menos o maior
+        """
+        sorted_targets = self.sorted_targets
+        sorted_costs = self.sorted_costs
+        total = 0.0
+        largest = float('-inf')
+        bits = remaining_bitmask
+        position = 0
+        while bits:
+            if bits & 1:
+                row = position + 1
+                targets = sorted_targets[row]
+                k = pointers[row]
+                while targets[k] == position or not remaining_bitmask >> targets[k] & 1:
+                    k += 1
+                pointers[row] = k
+                cost = sorted_costs[row][k]
+                total += cost
+                if cost > largest:
+                    largest = cost
+            bits >>= 1
+            position += 1
+        return total - largest
+
+
+class MSTCache:
+    """
+    Cache LRU limitado e thread-safe do custo da MST por remaining_bitmask.
+
+    A parte MST da H2 depende apenas do conjunto de tarefas restantes, não da
+    última tarefa, então estados irmãos com o mesmo bitmask reaproveitam o valor.
+    """
+
+    MAX_ENTRIES = 100_000
+
+    def __init__(self, dense: DenseSetupMatrix, max_entries: int = MAX_ENTRIES):
+        """
+        :param dense: Matriz de setup densa
+        :param max_entries: Número máximo de bitmasks mantidos no cache
+        """
+        # Custos simétricos min(s_ij, s_ji), calculados uma vez por matriz
+        self.symmetric_rows = np.minimum(dense.costs, dense.costs.T).tolist()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_mst_cost(self, remaining_bitmask: int, indices: List[int]) -> float:
+        """
+        Retorna o custo da MST do conjunto restante (consultando o cache)
+
+        :param remaining_bitmask: Bitmask de tarefas restantes
+        :param indices: Índices densos das tarefas restantes
+        :return: Custo total da MST
+        """
+        with self._lock:
+            cost = self._entries.get(remaining_bitmask)
+            if cost is not None:
+                self._entries.move_to_end(remaining_bitmask)
+                self.hits += 1
+                return cost
+            self.misses += 1
+
+        cost = TaskSchedulingHeuristics._prim_dense(indices, self.symmetric_rows)
+
+        with self._lock:
+            self._entries[remaining_bitmask] = cost
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cost
+
+    def info(self) -> Dict[str, int]:
+        """
+        Contadores do cache para dimensionamento
+
+        :return: Dicionário com hits, misses, size e max_entries
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+
 class TaskSchedulingHeuristics:
     @staticmethod
     def h1_minimum_outgoing_edges(node: TaskSchedulingNode, setup_matrix: SetupMatrix) -> float:
@@ -15,34 +233,69 @@ class TaskSchedulingHeuristics:
       :param setup_matrix: Matriz de custos de setup
       :return: Custo estimado baseado em menores custos de saída
       """
-      if node.remaining_bitmask == 0:
-          return 0.0
+      table = TaskSchedulingHeuristics.h1_table(setup_matrix)
+      parent_bitmask = node.parent.remaining_bitmask if node.parent is not None else None
+      return table.evaluate(node.remaining_bitmask, node.last_task, parent_bitmask)
 
-      remaining_tasks = node.get_remaining_tasks(setup_matrix.tasks)
-
-      # Custo mínimo para sair da última tarefa processada
-      min_cost_from_last = min(
-          setup_matrix.get_setup_cost(node.last_task, task)
-          for task in remaining_tasks
-      )
-
-      # Custo mínimo de saída para cada tarefa restante
-      outgoing_costs = []
-      for from_task in remaining_tasks:
-          if len(remaining_tasks) > 1:  # Se não é a última tarefa
-              min_out = min(
-                  setup_matrix.get_setup_cost(from_task, to_task)
-                  for to_task in remaining_tasks if to_task != from_task
-              )
-              outgoing_costs.append(min_out)
-
-      # Soma todos menos o maior (uma tarefa será a última)
-      total_outgoing = sum(outgoing_costs)
-      if outgoing_costs:
-          total_outgoing -= max(outgoing_costs)
-
-      return min_cost_from_last + total_outgoing
+    @staticmethod
+    def h1_table(setup_matrix: SetupMatrix) -> MinimumOutgoingTable:
+      """
+      Retorna o motor incremental da H1 associado à matriz (criado uma vez)
+
+      :param setup_matrix: Matriz de custos de setup
+      :return: Instância de MinimumOutgoingTable
+      """
+      dense = setup_matrix.to_dense()
+      table = dense.tables.get('h1')
+      if table is None:
+          table = MinimumOutgoingTable(dense)
+          dense.tables['h1'] = table
+      return table
     
+    @staticmethod
+    def h1_successor_values(node: TaskSchedulingNode, setup_matrix: SetupMatrix) -> List[float]:
+      """
+      H1 de todos os filhos do nó, calculada em lote
+
+      :param node: Nó a ser expandido (com tarefas restantes)
+      :param setup_matrix: Matriz de custos de setup
+      :return: H1 de cada filho, em ordem crescente de posição de bit
+      """
+      dense = setup_matrix.to_dense()
+      table = TaskSchedulingHeuristics.h1_table(setup_matrix)
+      return table.successor_values(dense.bitmask_indices(node.remaining_bitmask)).tolist()
+
+    @staticmethod
+    def h1_reverse(node: TaskSchedulingNode, setup_matrix: SetupMatrix) -> float:
+      """
+      H1 no sentido reverso (busca a partir do objetivo): limite inferior do
+      custo do nó inicial até o estado, somando o menor custo de entrada de
+      cada tarefa já agendada, vindo do nó inicial ou de outra tarefa agendada.
+      Depende só do conjunto agendado e é memorizada por remaining_bitmask.
+
+      :param node: Nó da busca reversa
+      :param setup_matrix: Matriz de custos de setup
+      :return: Custo estimado do início até o nó
+      """
+      dense = setup_matrix.to_dense()
+      memo = dense.tables.setdefault('h1_reverse', {})
+      value = memo.get(node.remaining_bitmask)
+      if value is not None:
+          return value
+
+      all_tasks = (1 << len(dense.tasks)) - 1
+      scheduled = dense.bitmask_indices(all_tasks & ~node.remaining_bitmask)
+      value = 0.0
+      if scheduled:
+          # A diagonal é infinita: nenhuma tarefa conta como sua própria antecessora
+          incoming = dense.costs[np.ix_([0] + scheduled, scheduled)]
+          value = float(incoming.min(axis=0).sum())
+
+      if len(memo) >= MinimumOutgoingTable.MAX_ENTRIES:
+          memo.clear()
+      memo[node.remaining_bitmask] = value
+      return value
+
     @staticmethod
     def h2_mst_symmetric(node: TaskSchedulingNode, setup_matrix: SetupMatrix) -> float:
       """
@@ -55,18 +308,32 @@ class TaskSchedulingHeuristics:
       if node.remaining_bitmask == 0:
           return 0.0
 
-      remaining_tasks = node.get_remaining_tasks(setup_matrix.tasks)
+      dense = setup_matrix.to_dense()
+      remaining = dense.bitmask_indices(node.remaining_bitmask)
 
       # Custo para conectar última tarefa ao componente
-      min_connection = min(
-          setup_matrix.get_setup_cost(node.last_task, task)
-          for task in remaining_tasks
-      )
+      from_costs = dense.rows[dense.index_of[node.last_task]]
+      min_connection = min(from_costs[index] for index in remaining)
 
-      # MST sobre tarefas restantes
-      mst_cost = TaskSchedulingHeuristics._compute_mst(remaining_tasks, setup_matrix)
+      # MST sobre tarefas restantes (compartilhada por estados com o mesmo bitmask)
+      cache = TaskSchedulingHeuristics.mst_cache(setup_matrix)
+      mst_cost = cache.get_mst_cost(node.remaining_bitmask, remaining)
 
       return min_connection + mst_cost
+
+    @staticmethod
+    def mst_cache(setup_matrix: SetupMatrix) -> MSTCache:
+      """
+      Retorna o cache de MST associado à matriz (criado uma vez)
+
+      :param setup_matrix: Matriz de custos de setup
+      :return: Instância de MSTCache
+      """
+      dense = setup_matrix.to_dense()
+      cache = dense.tables.get('h2')
+      if cache is None:
+          cache = dense.tables.setdefault('h2', MSTCache(dense))
+      return cache
     
     @staticmethod
     def h3_product_families(node: TaskSchedulingNode, setup_matrix: SetupMatrix, families: TaskFamily) -> float:
@@ -76,27 +343,60 @@ class TaskSchedulingHeuristics:
       if node.remaining_bitmask == 0:
           return 0.0
 
-      remaining_tasks = node.get_remaining_tasks(setup_matrix.tasks)
+      compiled = families.compile(setup_matrix)
 
-      # Conta famílias diferentes restantes
-      remaining_families = {
-          families.families[task] for task in remaining_tasks
-          if task in families.families
-      }
+      # Conta famílias diferentes restantes (AND do bitmask de cada família)
+      family_switches = 0
+      for mask in compiled.family_masks:
+          if mask & node.remaining_bitmask:
+              family_switches += 1
 
-      # Se última tarefa tem família conhecida
-      last_family = families.families.get(node.last_task)
-      if last_family and last_family in remaining_families:
-          remaining_families.remove(last_family)
+      # Se última tarefa tem família conhecida e ainda há tarefas dela
+      last_family = compiled.family_of_task.get(node.last_task, -1)
+      if last_family >= 0 and compiled.family_masks[last_family] & node.remaining_bitmask:
+          family_switches -= 1
 
       # Número mínimo de trocas de família × menor custo inter-família
-      family_switches = len(remaining_families)
-      if family_switches > 0:
-          min_interfamily_cost = families.get_min_interfamily_cost(setup_matrix)
-          return family_switches * min_interfamily_cost
+      return family_switches * compiled.min_interfamily_cost
+
+    @staticmethod
+    def h3_family_mst(node: TaskSchedulingNode, setup_matrix: SetupMatrix, families: TaskFamily) -> float:
+      """
+      Variante mais forte da H3: MST sobre as famílias restantes, usando o menor
+      custo entre cada par de famílias (só vale se todas as tarefas têm família)
+
+      :param node: Nó atual com tarefas restantes
+      :param setup_matrix: Matriz de custos de setup
+      :param families: Instância de TaskFamily
+      :return: Custo estimado baseado em MST de famílias
+      """
+      if node.remaining_bitmask == 0:
+          return 0.0
+
+      compiled = families.compile(setup_matrix)
+      h3 = TaskSchedulingHeuristics.h3_product_families(node, setup_matrix, families)
+      if not compiled.all_assigned:
+          return h3
+
+      family_nodes = compiled.remaining_families(node.remaining_bitmask)
+      last_family = compiled.family_of_task.get(node.last_task, -1)
+      bound = 0.0
+      if last_family >= 0:
+          if last_family not in family_nodes:
+              family_nodes.append(last_family)
+      else:
+          # Estado inicial: o primeiro setup sai do nó 0
+          dense = setup_matrix.to_dense()
+          from_costs = dense.rows[dense.index_of[node.last_task]]
+          bound = min(from_costs[index] for index in dense.bitmask_indices(node.remaining_bitmask))
 
-      return 0.0
-  
+      bound += TaskSchedulingHeuristics._prim_dense(family_nodes, compiled.symmetric_pair_rows)
+
+      # No estado inicial a H3 conta a saída do nó 0 como troca de família,
+      # o que pode superestimar; ali usa-se apenas o limite da MST
+      if last_family < 0:
+          return bound
+      return max(h3, bound)
 
     @staticmethod
     def _compute_mst(tasks: List[int], setup_matrix: SetupMatrix) -> float:
@@ -110,30 +410,47 @@ class TaskSchedulingHeuristics:
         if len(tasks) <= 1:
             return 0.0
 
-        visited = set()
-        min_heap = [(0, tasks[0])]
-        mst_cost = 0.0
+        dense = setup_matrix.to_dense()
+        symmetric_rows = TaskSchedulingHeuristics.mst_cache(setup_matrix).symmetric_rows
+        return TaskSchedulingHeuristics._prim_dense([dense.index_of[task] for task in tasks],
+                                                    symmetric_rows)
+
+    @staticmethod
+    def _prim_dense(indices: List[int], symmetric_rows: List[List[float]]) -> float:
+        """
+        Prim em O(k²) sobre matriz densa, sem heap
+
+        :param indices: Índices densos dos vértices da árvore
+        :param symmetric_rows: Linhas da matriz simétrica min(s_ij, s_ji)
+        :return: Custo total da MST
+        """
+        if len(indices) <= 1:
+            return 0.0
 
-        while min_heap and len(visited) < len(tasks):
-            cost, current = heapq.heappop(min_heap)
+        # Menor aresta ligando cada vértice fora da árvore à árvore atual
+        first_row = symmetric_rows[indices[0]]
+        outside = indices[1:]
+        distances = [first_row[index] for index in outside]
+        mst_cost = 0.0
 
-            if current in visited:
-                continue
+        while outside:
+            best = min(range(len(outside)), key=distances.__getitem__)
+            mst_cost += distances[best]
+            added_row = symmetric_rows[outside[best]]
 
-            visited.add(current)
-            mst_cost += cost
+            # Remove o vértice escolhido trocando-o com o último
+            outside[best] = outside[-1]
+            distances[best] = distances[-1]
+            outside.pop()
+            distances.pop()
 
-            # Adiciona arestas para nós não visitados
-            for next_task in tasks:
-                if next_task not in visited:
-                    edge_cost = min(
-                        setup_matrix.get_setup_cost(current, next_task),
-                        setup_matrix.get_setup_cost(next_task, current)
-                    )
-                    heapq.heappush(min_heap, (edge_cost, next_task))
+            for k, index in enumerate(outside):
+                cost = added_row[index]
+                if cost < distances[k]:
+                    distances[k] = cost
 
         return mst_cost
-      
+
     @staticmethod
     def _bitmask_to_tasks(bitmask: int, task_list: List[int]) -> List[int]:
         """
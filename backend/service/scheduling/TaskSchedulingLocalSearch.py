@@ -0,0 +1,303 @@
+from .TaskSchedulingData import SetupMatrix
+from typing import List, Optional, Sequence, Tuple
+from collections import deque
+import numpy as np
+import time
+
+
+class TaskSchedulingLocalSearch:
+    """
+    Busca local para melhorar sequências grandes (centenas a milhares de tarefas).
+
+    Parte de qualquer sequência inicial e aplica movimentos que preservam o
+    sentido dos segmentos (seguros para setups assimétricos):
+
+    - or_opt: realoca um segmento de 1 a OR_OPT_MAX_SEGMENT tarefas
+    - swap: troca duas tarefas de posição
+    - segment_exchange: 3-opt sem inversão, troca dois segmentos consecutivos
+
+    O caminho é representado por índices densos com o nó inicial (0) fixo no
+    começo e um nó final fictício (custo 0 a partir de qualquer tarefa) no fim,
+    de modo que todo movimento troca no máximo 4 arestas e seu delta é O(1).
+    Os candidatos vêm de listas dos vizinhos mais baratos de cada tarefa, e os
+    bits "don't look" mantêm na fila só as tarefas cujas arestas mudaram.
+    """
+
+    NEIGHBOURS = 10
+    OR_OPT_MAX_SEGMENT = 3
+    MOVES = ("or_opt", "swap", "segment_exchange")
+
+    def __init__(self, tasks: List[int], setup_matrix: SetupMatrix,
+                 neighbours: int = NEIGHBOURS,
+                 moves: Sequence[str] = MOVES,
+                 time_limit: Optional[float] = None):
+        """
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :param neighbours: Tamanho das listas de vizinhos de cada tarefa
+        :param moves: Movimentos habilitados (subconjunto de MOVES)
+        :param time_limit: Prazo em segundos (None = até o ótimo local)
+        """
+        unknown = set(moves) - set(self.MOVES)
+        if unknown:
+            raise ValueError(f"Movimentos desconhecidos: {sorted(unknown)}")
+        self.tasks = list(tasks)
+        self.dense = setup_matrix.to_dense()
+        self.moves = tuple(moves)
+        self.time_limit = time_limit
+        self.stats = {}
+
+        n_tasks = len(self.tasks)
+        self.end = n_tasks + 1  # Nó final fictício
+
+        # Matriz estendida: coluna do nó final com custo 0
+        costs = np.zeros((n_tasks + 2, n_tasks + 2), dtype=np.float64)
+        costs[:n_tasks + 1, :n_tasks + 1] = self.dense.costs
+        costs[self.end, :] = np.inf
+        self.costs = costs
+        self.rows = costs.tolist()
+
+        self.successors, self.predecessors = self._neighbour_lists(min(neighbours, n_tasks))
+
+    #--------------------------------------------------------------------------
+    # SEQUÊNCIA INICIAL
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def nearest_neighbour(tasks: List[int], setup_matrix: SetupMatrix) -> Tuple[List[int], float]:
+        """
+        Sequência gulosa: sempre a tarefa de menor setup a partir da última
+
+        :param tasks: Lista de tarefas
+        :param setup_matrix: Matriz de custos de setup
+        :return: (sequencia, custo_total)
+        """
+        dense = setup_matrix.to_dense()
+        remaining = np.ones(len(tasks) + 1, dtype=bool)
+        remaining[0] = False
+        sequence = []
+        total_cost = 0.0
+        current = 0
+        for _ in range(len(tasks)):
+            candidates = np.where(remaining, dense.costs[current], np.inf)
+            current = int(np.argmin(candidates))
+            remaining[current] = False
+            total_cost += float(candidates[current])
+            sequence.append(tasks[current - 1])
+        return sequence, total_cost
+
+    def _neighbour_lists(self, k: int) -> Tuple[List[List[int]], List[List[int]]]:
+        """
+        Para cada nó, os k sucessores e os k predecessores de menor setup
+
+        :param k: Tamanho das listas
+        :return: (sucessores, predecessores), listas de índices densos
+        """
+        n_nodes = len(self.rows)
+        if k <= 0:
+            return [[] for _ in range(n_nodes)], [[] for _ in range(n_nodes)]
+
+        outgoing = self.costs.copy()
+        outgoing[:, 0] = np.inf  # Ninguém volta ao nó inicial
+        np.fill_diagonal(outgoing, np.inf)
+        incoming = outgoing.T.copy()
+        incoming[:, self.end] = np.inf  # O nó final não precede ninguém
+
+        def nearest(matrix: np.ndarray) -> List[List[int]]:
+            candidates = np.argpartition(matrix, k - 1, axis=1)[:, :k]
+            order = np.take_along_axis(matrix, candidates, axis=1).argsort(axis=1, kind='stable')
+            nearest_ids = np.take_along_axis(candidates, order, axis=1)
+            return [[int(j) for j in row if np.isfinite(matrix[i, j])]
+                    for i, row in enumerate(nearest_ids)]
+
+        return nearest(outgoing), nearest(incoming)
+
+    #--------------------------------------------------------------------------
+    # MELHORIA
+    #--------------------------------------------------------------------------
+    def improve(self, sequence: List[int]) -> Tuple[List[int], float]:
+        """
+        Aplica movimentos de melhoria (primeira melhoria) até o ótimo local ou o prazo
+
+        :param sequence: Sequência inicial (permutação de tasks)
+        :return: (sequencia_melhorada, custo_total)
+        :raises ValueError: Se a sequência não for uma permutação das tarefas
+        """
+        start_time = time.perf_counter()
+        deadline = None if self.time_limit is None else start_time + self.time_limit
+
+        index_of = self.dense.index_of
+        if not isinstance(sequence, (list, tuple)):
+            raise ValueError("A sequência inicial deve ser uma lista de tarefas")
+        task_set = set(self.tasks)
+        invalid = [task for task in sequence
+                   if isinstance(task, bool) or not isinstance(task, int) or task not in task_set]
+        if invalid:
+            raise ValueError(f"A sequência inicial contém tarefas desconhecidas: {invalid}")
+        if len(sequence) != len(self.tasks) or len(set(sequence)) != len(sequence):
+            raise ValueError("A sequência inicial deve conter cada tarefa exatamente uma vez")
+
+        path = [0] + [index_of[task] for task in sequence] + [self.end]
+        position = [0] * len(path)
+        for i, node in enumerate(path):
+            position[node] = i
+        self._path, self._position = path, position
+
+        initial_cost = self._path_cost()
+        applied = {move: 0 for move in self.moves}
+        evaluations = 0
+        timed_out = False
+
+        # Bits "don't look": só as tarefas na fila são examinadas
+        queue = deque(path[1:-1])
+        queued = [True] * len(path)
+        queued[0] = queued[self.end] = False
+
+        try_moves = [(move, getattr(self, f"_try_{move}")) for move in self.moves]
+
+        while queue:
+            if deadline is not None and time.perf_counter() > deadline:
+                timed_out = True
+                break
+            node = queue.popleft()
+            queued[node] = False
+
+            for move, try_move in try_moves:
+                found = try_move(node)
+                evaluations += found[0]
+                if found[1] is None:
+                    continue
+                applied[move] += 1
+                for touched_node in found[2]:
+                    if 0 < touched_node < self.end and not queued[touched_node]:
+                        queued[touched_node] = True
+                        queue.append(touched_node)
+                break
+
+        final = [self.tasks[node - 1] for node in path[1:-1]]
+        cost = self._path_cost()
+        self.stats = {
+            'initial_cost': initial_cost,
+            'final_cost': cost,
+            'moves': applied,
+            'evaluations': evaluations,
+            'timed_out': timed_out,
+            'elapsed': time.perf_counter() - start_time,
+        }
+        return final, cost
+
+    def _path_cost(self) -> float:
+        rows, path = self.rows, self._path
+        return float(sum(rows[path[i]][path[i + 1]] for i in range(len(path) - 2)))
+
+    #--------------------------------------------------------------------------
+    # MOVIMENTOS (retornam (avaliações, delta ou None, nós afetados))
+    #--------------------------------------------------------------------------
+    def _try_or_opt(self, node: int):
+        """
+        Realoca o segmento que começa em node (até OR_OPT_MAX_SEGMENT tarefas)
+        para depois de um predecessor barato do seu início ou antes de um
+        sucessor barato do seu fim.
+        """
+        rows, path, position = self.rows, self._path, self._position
+        i = position[node]
+        evaluations = 0
+        for length in range(1, self.OR_OPT_MAX_SEGMENT + 1):
+            j = i + length - 1
+            if j >= self.end:
+                break
+            before, first, last, after = path[i - 1], path[i], path[j], path[j + 1]
+            removed = rows[before][first] + rows[last][after]
+            joined = rows[before][after]
+
+            insert_after = [position[w] for w in self.predecessors[first]]
+            insert_after += [position[w] - 1 for w in self.successors[last]]
+            for k in insert_after:
+                if i - 1 <= k <= j:
+                    continue
+                evaluations += 1
+                left, right = path[k], path[k + 1]
+                delta = (joined + rows[left][first] + rows[last][right]
+                         - removed - rows[left][right])
+                if delta < -1e-9:
+                    touched = (before, first, last, after, left, right)
+                    if k < i:
+                        self._exchange(k, i - 1, j)
+                    else:
+                        self._exchange(i - 1, j, k)
+                    return evaluations, delta, touched
+        return evaluations, None, ()
+
+    def _try_swap(self, node: int):
+        """
+        Troca node com uma tarefa que seria barata logo após o predecessor de
+        node, ou logo antes do seu sucessor.
+        """
+        rows, path, position = self.rows, self._path, self._position
+        i = position[node]
+        candidates = [w for w in self.successors[path[i - 1]]]
+        candidates += [w for w in self.predecessors[path[i + 1]]]
+        evaluations = 0
+        for other in candidates:
+            j = position[other]
+            if j == i or j == 0 or j == self.end:
+                continue
+            a, b = (i, j) if i < j else (j, i)
+            evaluations += 1
+            x, y = path[a], path[b]
+            before_x, after_y = path[a - 1], path[b + 1]
+            if b == a + 1:
+                delta = (rows[before_x][y] + rows[y][x] + rows[x][after_y]
+                         - rows[before_x][x] - rows[x][y] - rows[y][after_y])
+                touched = (before_x, x, y, after_y)
+            else:
+                after_x, before_y = path[a + 1], path[b - 1]
+                delta = (rows[before_x][y] + rows[y][after_x] + rows[before_y][x] + rows[x][after_y]
+                         - rows[before_x][x] - rows[x][after_x] - rows[before_y][y] - rows[y][after_y])
+                touched = (before_x, x, after_x, before_y, y, after_y)
+            if delta < -1e-9:
+                path[a], path[b] = y, x
+                position[x], position[y] = b, a
+                return evaluations, delta, touched
+        return evaluations, None, ()
+
+    def _try_segment_exchange(self, node: int):
+        """
+        3-opt sem inversão a partir de node (posição a): troca os segmentos
+        path[a+1..b] e path[b+1..c]. A nova aresta node -> path[b+1] vem dos
+        sucessores baratos de node e path[c] -> path[a+1] dos predecessores
+        baratos de path[a+1].
+        """
+        rows, path, position = self.rows, self._path, self._position
+        a = position[node]
+        if a + 2 >= self.end:
+            return 0, None, ()
+        first = path[a + 1]
+        removed_a = rows[node][first]
+        evaluations = 0
+        for y in self.successors[node]:
+            b = position[y] - 1
+            if b <= a or b + 1 >= self.end:
+                continue
+            last_b, head = path[b], y
+            partial = rows[node][head] - removed_a - rows[last_b][head]
+            for z in self.predecessors[first]:
+                c = position[z]
+                if c <= b or c >= self.end:
+                    continue
+                evaluations += 1
+                after = path[c + 1]
+                delta = partial + rows[z][first] + rows[last_b][after] - rows[z][after]
+                if delta < -1e-9:
+                    touched = (node, first, last_b, head, z, after)
+                    self._exchange(a, b, c)
+                    return evaluations, delta, touched
+        return evaluations, None, ()
+
+    def _exchange(self, a: int, b: int, c: int) -> None:
+        """
+        Troca os segmentos consecutivos path[a+1..b] e path[b+1..c]
+        """
+        path, position = self._path, self._position
+        path[a + 1:c + 1] = path[b + 1:c + 1] + path[a + 1:b + 1]
+        for i in range(a + 1, c + 1):
+            position[path[i]] = i
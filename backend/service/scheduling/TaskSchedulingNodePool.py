@@ -0,0 +1,108 @@
+from typing import List, Optional
+from array import array
+from .TaskSchedulingNode import TaskSchedulingNode
+import sys
+
+
+class HeuristicProbe:
+    """
+    Visão mínima de um estado para as funções heurísticas (que esperam um nó).
+
+    Uma única instância é reutilizada a cada avaliação, evitando criar um
+    TaskSchedulingNode por sucessor quando a busca usa o pool de nós.
+    """
+
+    __slots__ = ('remaining_bitmask', 'last_task', 'parent')
+
+    def __init__(self, remaining_bitmask: int = 0, last_task: int = 0,
+                 parent: Optional["HeuristicProbe"] = None):
+        self.remaining_bitmask = remaining_bitmask
+        self.last_task = last_task
+        self.parent = parent
+
+
+class TaskSchedulingNodePool:
+    """
+    Armazena os estados gerados em arrays tipados paralelos (struct-of-arrays).
+
+    Cada estado ocupa uma posição: bitmask, última tarefa, g, h e índice do pai.
+    O caminho é reconstruído seguindo os índices de pai, sem objetos por nó.
+    """
+
+    def __init__(self, n_tasks: int):
+        """
+        :param n_tasks: Número de tarefas (define o tipo do array de bitmasks)
+        """
+        # 'Q' comporta bitmasks de até 64 tarefas; acima disso usa lista de int
+        self.bitmasks = array('Q') if n_tasks <= 64 else []
+        self.last_tasks = array('l')
+        self.g_costs = array('d')
+        self.h_costs = array('d')
+        self.parents = array('l')
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def add(self, remaining_bitmask: int, last_task: int, g_cost: float,
+            h_cost: float, parent: int = -1) -> int:
+        """
+        Adiciona um estado ao pool
+
+        :param remaining_bitmask: Bitmask de tarefas restantes
+        :param last_task: Última tarefa agendada
+        :param g_cost: Custo acumulado
+        :param h_cost: Valor heurístico
+        :param parent: Índice do pai no pool (-1 para a raiz)
+        :return: Índice do novo estado
+        """
+        self.bitmasks.append(remaining_bitmask)
+        self.last_tasks.append(last_task)
+        self.g_costs.append(g_cost)
+        self.h_costs.append(h_cost)
+        self.parents.append(parent)
+        return len(self.parents) - 1
+
+    def reconstruct_sequence(self, index: int) -> List[int]:
+        """
+        Reconstrói a sequência de tarefas seguindo os índices de pai
+
+        :param index: Índice do estado objetivo
+        :return: Sequência de tarefas agendadas
+        """
+        sequence = []
+        while index >= 0 and self.parents[index] >= 0:
+            if self.last_tasks[index] != 0:  # Ignora nó inicial fictício
+                sequence.append(self.last_tasks[index])
+            index = self.parents[index]
+        sequence.reverse()
+        return sequence
+
+    def bytes_per_state(self) -> int:
+        """
+        Bytes ocupados por estado nos arrays (sem contar a folga de realocação)
+
+        :return: Tamanho em bytes por estado
+        """
+        if isinstance(self.bitmasks, array):
+            bitmask_size = self.bitmasks.itemsize
+        else:
+            bitmask_size = 8 + sys.getsizeof(self.bitmasks[0] if self.bitmasks else 1 << 64)
+        return (bitmask_size + self.last_tasks.itemsize + self.g_costs.itemsize
+                + self.h_costs.itemsize + self.parents.itemsize)
+
+    @staticmethod
+    def object_bytes_per_state(n_tasks: int) -> int:
+        """
+        Estimativa de bytes por estado quando cada estado é um TaskSchedulingNode
+
+        :param n_tasks: Número de tarefas (define o tamanho do bitmask)
+        :return: Tamanho aproximado em bytes de um nó e seus atributos próprios
+        """
+        parent = TaskSchedulingNode((1 << n_tasks) - 1, 0, 0.0, 0.0)
+        node = TaskSchedulingNode((1 << n_tasks) - 2, 1, 1.5, 2.5, parent)
+        node.h_cost = 2.5
+        node.v1 = 4.0  # f-cost atribuído pelas buscas
+        return (sys.getsizeof(node) + sys.getsizeof(node.__dict__)
+                + sys.getsizeof(node.state) + sys.getsizeof(node.sequence)
+                + sys.getsizeof(node.remaining_bitmask)
+                + sys.getsizeof(node.v1) + sys.getsizeof(node.v2) + sys.getsizeof(node.h_cost))
@@ -0,0 +1,172 @@
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class TaskSchedulingOpenList:
+    """
+    Lista aberta indexada (heap binário) para as buscas de sequenciamento.
+
+    Cada estado (remaining_bitmask, last_task) aparece no máximo uma vez no heap.
+    Um índice estado -> posição no heap permite decrease-key em O(log n) quando
+    um caminho com g menor é encontrado para um estado que já está na fila.
+
+    Empates na prioridade são resolvidos por h (menor primeiro) e depois pela
+    ordem de inserção, o que torna a expansão determinística.
+    """
+
+    def __init__(self):
+        # Cada entrada: [prioridade, h, ordem, chave, g, item]
+        self._heap: List[list] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def get_g(self, key: Hashable) -> Optional[float]:
+        """
+        Retorna o g-cost do estado enfileirado (ou None se não estiver na fila)
+
+        :param key: Chave do estado (remaining_bitmask, last_task)
+        :return: g-cost atual do estado na fila
+        """
+        position = self._positions.get(key)
+        if position is None:
+            return None
+        return self._heap[position][4]
+
+    def push(self, key: Hashable, priority: float, h_cost: float,
+             g_cost: float, item: Any) -> bool:
+        """
+        Insere um estado ou aplica decrease-key se o novo g for melhor
+
+        :param key: Chave do estado (remaining_bitmask, last_task)
+        :param priority: Valor usado na ordenação (f, g ou h conforme a busca)
+        :param h_cost: Valor heurístico (desempate)
+        :param g_cost: Custo acumulado do caminho
+        :param item: Objeto armazenado (nó ou índice)
+        :return: Verdadeiro se o heap foi alterado
+        """
+        position = self._positions.get(key)
+        if position is None:
+            entry = [priority, h_cost, self._counter, key, g_cost, item]
+            self._counter += 1
+            self._heap.append(entry)
+            self._positions[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return True
+
+        entry = self._heap[position]
+        if g_cost >= entry[4]:
+            return False
+
+        # Caminho melhor para um estado já enfileirado: decrease-key
+        old_priority = (entry[0], entry[1])
+        entry[0] = priority
+        entry[1] = h_cost
+        entry[4] = g_cost
+        entry[5] = item
+        if (priority, h_cost) <= old_priority:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+        return True
+
+    def pop(self) -> Any:
+        """
+        Remove e retorna o item de menor prioridade
+
+        :return: Item armazenado
+        """
+        return self.pop_entry()[1]
+
+    def pop_entry(self) -> Tuple[Hashable, Any]:
+        """
+        Remove o item de menor prioridade retornando também sua chave
+
+        :return: (chave, item)
+        """
+        heap = self._heap
+        top = heap[0]
+        last = heap.pop()
+        del self._positions[top[3]]
+        if heap:
+            heap[0] = last
+            self._positions[last[3]] = 0
+            self._sift_down(0)
+        return top[3], top[5]
+
+    def peek_priority(self) -> float:
+        """
+        Retorna a menor prioridade da fila sem removê-la
+
+        :return: Prioridade do topo (inf se vazia)
+        """
+        return self._heap[0][0] if self._heap else float('inf')
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """
+        Retorna os pares (chave, item) enfileirados, sem ordem definida
+
+        :return: Lista de (chave, item)
+        """
+        return [(entry[3], entry[5]) for entry in self._heap]
+
+    def reprioritize(self, priority_of: Callable[[Any], float]) -> None:
+        """
+        Recalcula a prioridade de todas as entradas e refaz o heap em O(n)
+        (usado quando o peso da heurística muda, como no ARA*)
+
+        :param priority_of: Função item -> nova prioridade
+        """
+        for entry in self._heap:
+            entry[0] = priority_of(entry[5])
+        for position in reversed(range(len(self._heap) // 2)):
+            self._sift_down(position)
+
+    def _less(self, a: list, b: list) -> bool:
+        if a[0] != b[0]:
+            return a[0] < b[0]
+        if a[1] != b[1]:
+            return a[1] < b[1]
+        return a[2] < b[2]
+
+    def _sift_up(self, position: int) -> None:
+        heap = self._heap
+        positions = self._positions
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            parent_entry = heap[parent]
+            if not self._less(entry, parent_entry):
+                break
+            heap[position] = parent_entry
+            positions[parent_entry[3]] = position
+            position = parent
+        heap[position] = entry
+        positions[entry[3]] = position
+
+    def _sift_down(self, position: int) -> None:
+        heap = self._heap
+        positions = self._positions
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and self._less(heap[right], heap[child]):
+                child = right
+            if not self._less(heap[child], entry):
+                break
+            heap[position] = heap[child]
+            positions[heap[position][3]] = position
+            position = child
+        heap[position] = entry
+        positions[entry[3]] = position
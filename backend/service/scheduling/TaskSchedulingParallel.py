@@ -0,0 +1,334 @@
+from .TaskSchedulingSearch import TaskSchedulingSearch
+from .TaskSchedulingData import SetupMatrix
+from .TaskSchedulingOpenList import TaskSchedulingOpenList
+from .TaskFamily import TaskFamily
+from ..base.Cancellation import CancellationToken, SearchCancelled
+from typing import Dict, List, Optional, Tuple
+from queue import Empty
+import multiprocessing
+import time
+import os
+
+
+def owner_of(remaining_bitmask: int, last_task: int, n_workers: int) -> int:
+    """
+    Processo dono de um estado (o hash de tuplas de inteiros é o mesmo em todos os processos)
+    """
+    return hash((remaining_bitmask, last_task)) % n_workers
+
+
+def hda_worker(worker_id: int, n_workers: int, tasks: List[int], setup_matrix: SetupMatrix,
+               heuristic_type: str, families: Optional[TaskFamily], heuristic_cache_size: int,
+               inboxes: list, results, incumbent, idle, sent, received, expanded_counts,
+               batch_size: int) -> None:
+    """
+    Laço de um processo do HDA* (executado com "spawn")
+
+    Mantém OPEN e o melhor g dos estados que possui. Sucessores de outros donos
+    são acumulados por destino e enviados em lotes. Mensagens de controle do
+    coordenador: ("batch", itens), ("report",), ("trace", estado) e ("stop",).
+
+    :param worker_id: Índice deste processo
+    :param n_workers: Número de processos
+    :param tasks: Lista de tarefas
+    :param setup_matrix: Matriz de custos de setup
+    :param heuristic_type: "h1", "h2", "h3" ou "h3_mst"
+    :param families: Para heurística h3
+    :param heuristic_cache_size: Máximo de valores h mantidos
+    :param inboxes: Filas de entrada de todos os processos
+    :param results: Fila de respostas para o coordenador
+    :param incumbent: Valor compartilhado com o custo da melhor solução
+    :param idle: Flags de ociosidade (uma por processo)
+    :param sent: Lotes enviados por processo
+    :param received: Lotes recebidos por processo
+    :param expanded_counts: Nós expandidos por processo (progresso lido pelo coordenador)
+    :param batch_size: Sucessores por lote
+    """
+    search = TaskSchedulingSearch()
+    heuristic, _ = search._state_heuristic(setup_matrix, heuristic_type, families, heuristic_cache_size)
+    dense = setup_matrix.to_dense()
+    rows, index_of = dense.rows, dense.index_of
+    n_tasks = len(tasks)
+    inbox = inboxes[worker_id]
+
+    open_list = TaskSchedulingOpenList()
+    best_g: Dict[Tuple[int, int], float] = {}
+    parent: Dict[Tuple[int, int], int] = {}
+    outgoing: List[list] = [[] for _ in range(n_workers)]
+    best_goal = None  # (custo, última tarefa, estado do pai)
+    expanded = 0
+    pruned = 0
+
+    def flush(destination: int) -> None:
+        sent[worker_id] += 1
+        inboxes[destination].put(("batch", outgoing[destination]))
+        outgoing[destination] = []
+
+    def consider(remaining_bitmask: int, last_task: int, g_cost: float,
+                 previous: int, parent_bitmask: Optional[int]) -> None:
+        nonlocal pruned
+        state_key = (remaining_bitmask, last_task)
+        if g_cost >= best_g.get(state_key, float('inf')):
+            return
+        h_cost = heuristic(remaining_bitmask, last_task, parent_bitmask)
+        if g_cost + h_cost >= incumbent.value:
+            pruned += 1
+            return
+        best_g[state_key] = g_cost
+        parent[state_key] = previous
+        open_list.push(state_key, g_cost + h_cost, h_cost, g_cost, g_cost)
+
+    def handle(message: tuple) -> bool:
+        """Processa uma mensagem; retorna False ao receber "stop" """
+        kind = message[0]
+        if kind == "batch":
+            idle[worker_id] = 0
+            received[worker_id] += 1
+            for remaining_bitmask, last_task, g_cost, previous in message[1]:
+                consider(remaining_bitmask, last_task, g_cost, previous,
+                         None if previous < 0 else remaining_bitmask | bit_of[last_task])
+        elif kind == "report":
+            results.put(("report", worker_id, best_goal, {'expanded': expanded, 'pruned': pruned,
+                                                          'states': len(best_g)}))
+        elif kind == "trace":
+            results.put(("trace", parent[message[1]]))
+        elif kind == "stop":
+            return False
+        return True
+
+    bit_of = {task: 1 << i for i, task in enumerate(tasks)}
+    running = True
+    while running:
+        # Mensagens pendentes primeiro
+        while running:
+            try:
+                message = inbox.get_nowait()
+            except Empty:
+                break
+            running = handle(message)
+        if not running:
+            break
+
+        if open_list and open_list.peek_priority() < incumbent.value:
+            idle[worker_id] = 0
+            for _ in range(64):
+                if not open_list or open_list.peek_priority() >= incumbent.value:
+                    break
+                state_key, g_cost = open_list.pop_entry()
+                if g_cost > best_g[state_key]:
+                    continue
+                expanded += 1
+                remaining_bitmask, last_task = state_key
+                from_costs = rows[index_of[last_task]]
+                for i in range(n_tasks):
+                    if not remaining_bitmask & (1 << i):
+                        continue
+                    task_id = tasks[i]
+                    new_remaining = remaining_bitmask & ~(1 << i)
+                    new_g_cost = g_cost + from_costs[i + 1]
+                    if new_remaining == 0:
+                        # Solução completa: atualiza o incumbente compartilhado
+                        with incumbent.get_lock():
+                            if new_g_cost < incumbent.value:
+                                incumbent.value = new_g_cost
+                                best_goal = (new_g_cost, task_id, state_key)
+                        continue
+                    destination = owner_of(new_remaining, task_id, n_workers)
+                    if destination == worker_id:
+                        consider(new_remaining, task_id, new_g_cost, last_task, remaining_bitmask)
+                    else:
+                        outgoing[destination].append((new_remaining, task_id, new_g_cost, last_task))
+                        if len(outgoing[destination]) >= batch_size:
+                            flush(destination)
+            expanded_counts[worker_id] = expanded
+            # Lotes parciais também seguem a cada rodada, para não deixar processos sem trabalho
+            for destination in range(n_workers):
+                if outgoing[destination]:
+                    flush(destination)
+            continue
+
+        # Sem trabalho local útil: envia o que falta e espera mensagens
+        for destination in range(n_workers):
+            if outgoing[destination]:
+                flush(destination)
+        idle[worker_id] = 1
+        try:
+            message = inbox.get(timeout=0.05)
+        except Empty:
+            continue
+        running = handle(message)
+
+
+class TaskSchedulingParallel:
+    """
+    A* distribuído por hash (HDA*) entre processos.
+
+    Cada estado (remaining_bitmask, última tarefa) pertence ao processo
+    owner_of(estado); cada processo mantém OPEN e o melhor g dos seus estados
+    e envia os sucessores aos donos em lotes. O custo da melhor solução é
+    compartilhado e poda nós com f >= incumbente. A busca termina quando todos
+    os processos estão ociosos e nenhum lote está em trânsito, verificado por
+    duas leituras consecutivas idênticas dos contadores de envio e recebimento.
+    Com heurística admissível o custo é o mesmo do A* em um processo.
+    """
+
+    # Limite de processos por busca (padrão: número de núcleos)
+    MAX_WORKERS_ENV = 'SCHEDULING_PARALLEL_MAX_WORKERS'
+    BATCH_SIZE = 64
+    HEURISTIC_CACHE_SIZE = 200_000
+    # Intervalo entre verificações de término no coordenador (segundos)
+    POLL_INTERVAL = 0.005
+
+    def __init__(self, workers: Optional[int] = None, batch_size: int = BATCH_SIZE,
+                 heuristic_cache_size: int = HEURISTIC_CACHE_SIZE):
+        """
+        :param workers: Número de processos (padrão: número de núcleos), limitado por max_workers()
+        :param batch_size: Sucessores por mensagem entre processos
+        :param heuristic_cache_size: Máximo de valores h mantidos por processo
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.workers = max(1, min(workers, self.max_workers()))
+        self.batch_size = max(1, batch_size)
+        self.heuristic_cache_size = heuristic_cache_size
+        self.stats = {}
+
+    @classmethod
+    def max_workers(cls) -> int:
+        """
+        Maior número de processos aceito por busca: SCHEDULING_PARALLEL_MAX_WORKERS
+        ou o número de núcleos
+
+        :return: Limite de processos (pelo menos 1)
+        """
+        return max(1, int(os.environ.get(cls.MAX_WORKERS_ENV, 0)) or os.cpu_count() or 1)
+
+    def a_star(self, tasks: List[int], setup_matrix: SetupMatrix, heuristic_type: str = "h1",
+               families: Optional[TaskFamily] = None) -> Tuple[List[int], float]:
+        """
+        Executa o HDA* e reconstrói a sequência ótima consultando os donos dos estados
+
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :param heuristic_type: "h1" ou "h2" (admissíveis, para o custo ser ótimo)
+        :param families: Para heurística h3
+        :return: (sequencia_otima, custo_total) ou ([], inf) se não houver solução
+        """
+        start_time = time.perf_counter()
+        if not tasks:
+            self.stats = {'workers': self.workers, 'expanded': 0, 'elapsed': 0.0}
+            return [], 0.0
+
+        context = multiprocessing.get_context('spawn')
+        n_workers = self.workers
+        inboxes = [context.Queue() for _ in range(n_workers)]
+        results = context.Queue()
+        incumbent = context.Value('d', float('inf'))
+        idle = context.Array('b', n_workers, lock=False)
+        sent = context.Array('q', n_workers, lock=False)
+        received = context.Array('q', n_workers, lock=False)
+        expanded_counts = context.Array('q', n_workers, lock=False)
+        # Token do job que executa a busca (None fora de /jobs): verificado pelo coordenador
+        cancellation = CancellationToken.current()
+
+        # O lote inicial conta como enviado pelo dono do estado inicial
+        initial_state = ((1 << len(tasks)) - 1, 0)
+        start_owner = owner_of(*initial_state, n_workers)
+        sent[start_owner] = 1
+        inboxes[start_owner].put(("batch", [(*initial_state, 0.0, -1)]))
+
+        processes = [context.Process(target=hda_worker, daemon=True,
+                                     args=(worker_id, n_workers, tasks, setup_matrix, heuristic_type,
+                                           families, self.heuristic_cache_size, inboxes, results,
+                                           incumbent, idle, sent, received, expanded_counts,
+                                           self.batch_size))
+                     for worker_id in range(n_workers)]
+        for process in processes:
+            process.start()
+
+        cancelled = False
+        try:
+            self._wait_for_termination(processes, idle, sent, received, expanded_counts, cancellation)
+            search_time = time.perf_counter() - start_time
+
+            for inbox in inboxes:
+                inbox.put(("report",))
+            reports = [results.get(timeout=30) for _ in range(n_workers)]
+            goals = [report[2] for report in reports if report[2] is not None]
+            worker_stats = sorted(((report[1], report[3]) for report in reports))
+
+            sequence, cost = [], float('inf')
+            if goals:
+                cost, last_task, state_key = min(goals)
+                sequence = self._trace(tasks, inboxes, results, last_task, state_key, n_workers)
+
+            self.stats = {
+                'workers': n_workers,
+                'expanded': sum(stats['expanded'] for _, stats in worker_stats),
+                'pruned': sum(stats['pruned'] for _, stats in worker_stats),
+                'expanded_per_worker': [stats['expanded'] for _, stats in worker_stats],
+                'states_per_worker': [stats['states'] for _, stats in worker_stats],
+                'batches': sum(sent),
+                'search_time': search_time,
+                'elapsed': time.perf_counter() - start_time,
+            }
+            return sequence, cost
+        except SearchCancelled:
+            cancelled = True
+            raise
+        finally:
+            if cancelled:
+                # Cancelado pelo job: os processos são encerrados sem esperar a rodada atual
+                for process in processes:
+                    process.terminate()
+            else:
+                for inbox in inboxes:
+                    inbox.put(("stop",))
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+    def _wait_for_termination(self, processes: list, idle, sent, received, expanded_counts,
+                              cancellation: Optional[CancellationToken] = None) -> None:
+        """
+        Espera até todos ociosos sem lotes em trânsito em duas leituras seguidas
+
+        A cada verificação o total de nós expandidos é repassado ao token de
+        cancelamento do job (progresso), que interrompe a espera se cancelado.
+
+        :raises RuntimeError: Se algum processo terminar durante a busca
+        :raises SearchCancelled: Se o job foi cancelado
+        """
+        previous = None
+        base_iterations = cancellation.iterations if cancellation is not None else 0
+        while True:
+            time.sleep(self.POLL_INTERVAL)
+            if cancellation is not None:
+                cancellation.checkpoint(base_iterations + sum(expanded_counts))
+            if not all(process.is_alive() for process in processes):
+                raise RuntimeError("Um processo do HDA* terminou inesperadamente")
+            snapshot = (tuple(idle), tuple(sent), tuple(received))
+            terminated = all(snapshot[0]) and sum(snapshot[1]) == sum(snapshot[2])
+            if terminated and snapshot == previous:
+                return
+            previous = snapshot if terminated else None
+
+    @staticmethod
+    def _trace(tasks: List[int], inboxes: list, results, last_task: int,
+               state_key: Tuple[int, int], n_workers: int) -> List[int]:
+        """
+        Reconstrói a sequência pedindo a cada dono o predecessor do estado
+
+        :return: Sequência de tarefas do início ao objetivo
+        """
+        bit_of = {task: 1 << i for i, task in enumerate(tasks)}
+        sequence = [last_task]
+        while state_key[1] != 0:
+            remaining_bitmask, task_id = state_key
+            inboxes[owner_of(remaining_bitmask, task_id, n_workers)].put(("trace", state_key))
+            _, previous = results.get(timeout=30)
+            sequence.append(task_id)
+            state_key = (remaining_bitmask | bit_of[task_id], previous)
+        sequence.reverse()
+        return sequence
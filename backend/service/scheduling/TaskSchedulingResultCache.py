@@ -0,0 +1,167 @@
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+import threading
+import hashlib
+import json
+import time
+
+
+class CachedResult:
+    """
+    Resposta guardada pelo cache: corpo serializado, status e mimetype.
+    """
+
+    __slots__ = ('body', 'status', 'mimetype', 'expires_at')
+
+    def __init__(self, body: bytes, status: int, mimetype: str, expires_at: float):
+        self.body = body
+        self.status = status
+        self.mimetype = mimetype
+        self.expires_at = expires_at
+
+
+class TaskSchedulingResultCache:
+    """
+    Cache LRU thread-safe de respostas dos endpoints de sequenciamento.
+
+    A chave é o SHA-256 da instância normalizada (endpoint + corpo da
+    requisição com chaves ordenadas e números como float), então requisições
+    equivalentes compartilham a mesma entrada. O cache é limitado pelo número
+    de entradas e pela soma dos tamanhos dos corpos; cada entrada expira após
+    ttl segundos.
+    """
+
+    MAX_ENTRIES = 1024
+    MAX_BYTES = 64 * 1024 * 1024
+    TTL = 600.0
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES,
+                 ttl: float = TTL):
+        """
+        :param max_entries: Número máximo de respostas mantidas (0 desativa o cache)
+        :param max_bytes: Soma máxima dos corpos das respostas
+        :param ttl: Tempo de vida de cada entrada, em segundos
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._bytes = 0
+        self._entries: 'OrderedDict[str, CachedResult]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    # -------------------------------------------------------------------------
+    # CHAVE CANÔNICA
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def fingerprint(endpoint: str, data: Dict[str, Any]) -> str:
+        """
+        Hash canônico de uma requisição
+
+        :param endpoint: Caminho do endpoint (o algoritmo)
+        :param data: Corpo JSON da requisição
+        :return: SHA-256 em hexadecimal
+        """
+        canonical = json.dumps([endpoint, TaskSchedulingResultCache._normalize(data)],
+                               sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _normalize(value: Any) -> Any:
+        """
+        Chaves de dicionário como texto e números como float (1 e 1.0 são iguais)
+        """
+        if isinstance(value, dict):
+            return {str(key): TaskSchedulingResultCache._normalize(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [TaskSchedulingResultCache._normalize(item) for item in value]
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        return value
+
+    # -------------------------------------------------------------------------
+    # CONSULTA / INSERÇÃO
+    # -------------------------------------------------------------------------
+    def get(self, key: str) -> Optional[CachedResult]:
+        """
+        Retorna a resposta guardada e a marca como usada recentemente
+
+        :param key: Chave gerada por fingerprint
+        :return: CachedResult ou None (ausente ou expirada)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, body: bytes, status: int = 200,
+            mimetype: str = 'application/json') -> bool:
+        """
+        Guarda uma resposta, removendo as menos usadas recentemente se preciso
+
+        :param key: Chave gerada por fingerprint
+        :param body: Corpo serializado da resposta
+        :param status: Código HTTP
+        :param mimetype: Tipo do corpo
+        :return: False se a resposta sozinha excede max_bytes (não é guardada)
+        """
+        if not self.enabled or len(body) > self.max_bytes:
+            return False
+        entry = CachedResult(body, status, mimetype, time.monotonic() + self.ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def _remove(self, key: str) -> None:
+        """
+        Remove uma entrada (com o lock adquirido)
+        """
+        self._bytes -= len(self._entries.pop(key).body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self) -> Dict[str, Any]:
+        """
+        Contadores do cache para dimensionamento
+
+        :return: Dicionário com hits, misses, size, bytes, limites e remoções
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
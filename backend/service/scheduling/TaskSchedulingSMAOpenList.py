@@ -0,0 +1,140 @@
+from typing import Dict, List, Optional
+import heapq
+import sys
+
+
+class SMANode:
+    """
+    Nó da árvore mantida pelo SMA*.
+
+    children guarda apenas os filhos ainda em memória; forgotten guarda, por
+    tarefa, o f dos filhos descartados (valor "backed up"), usado quando o nó
+    volta para OPEN e regenera o melhor deles.
+    """
+
+    __slots__ = ('remaining_bitmask', 'last_task', 'g_cost', 'f_cost', 'depth', 'parent',
+                 'children', 'forgotten', 'expanded', 'open_id', 'open_key')
+
+    def __init__(self, remaining_bitmask: int, last_task: int, g_cost: float, f_cost: float,
+                 depth: int = 0, parent: Optional["SMANode"] = None):
+        self.remaining_bitmask = remaining_bitmask
+        self.last_task = last_task
+        self.g_cost = g_cost
+        self.f_cost = f_cost
+        self.depth = depth
+        self.parent = parent
+        self.children: Dict[int, "SMANode"] = {}
+        self.forgotten: Dict[int, float] = {}
+        self.expanded = False
+        self.open_id = -1
+        self.open_key = f_cost
+
+    @staticmethod
+    def bytes_per_node(n_tasks: int) -> int:
+        """
+        Estimativa de bytes por nó: o objeto, seu dicionário de filhos, o
+        bitmask, as entradas nos dois heaps e no índice de estados
+
+        :param n_tasks: Número de tarefas (define o tamanho do bitmask)
+        :return: Tamanho aproximado em bytes
+        """
+        bitmask = (1 << n_tasks) - 1
+        node = SMANode(bitmask, 1, 1.5, 2.5)
+        heap_entry = (2.5, -1, 1, node)
+        return (sys.getsizeof(node) + sys.getsizeof(node.children) + sys.getsizeof(node.forgotten)
+                + sys.getsizeof(bitmask)
+                + 2 * sys.getsizeof(node.g_cost) + 2 * sys.getsizeof(heap_entry)
+                + sys.getsizeof((bitmask, 1)) + 3 * 8)
+
+
+class TaskSchedulingSMAOpenList:
+    """
+    Lista aberta do SMA*: dois heaps com remoção preguiçosa.
+
+    O heap de melhores ordena por (menor f, maior profundidade) e escolhe o
+    próximo nó a expandir; o de piores ordena folhas por (maior f, menor
+    profundidade) e escolhe a folha descartada quando a memória acaba. Cada
+    inserção gera um novo open_id; entradas com id antigo são ignoradas.
+    """
+
+    def __init__(self):
+        self._best: List[tuple] = []
+        self._worst: List[tuple] = []
+        self._counter = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def push(self, node: SMANode, key: float) -> None:
+        """
+        Insere o nó ou atualiza sua chave se já estiver na lista
+
+        :param node: Nó a inserir
+        :param key: f usado na ordenação
+        """
+        if node.open_id < 0:
+            self._size += 1
+        self._counter += 1
+        node.open_id = self._counter
+        node.open_key = key
+        heapq.heappush(self._best, (key, -node.depth, self._counter, node))
+        if not node.children:
+            heapq.heappush(self._worst, (-key, node.depth, self._counter, node))
+        if len(self._best) + len(self._worst) > 4 * self._size + 1024:
+            self._compact()
+
+    def _compact(self) -> None:
+        """
+        Descarta as entradas inválidas para que os heaps não cresçam além do orçamento
+        """
+        self._best = [entry for entry in self._best if entry[3].open_id == entry[2]]
+        self._worst = [entry for entry in self._worst
+                       if entry[3].open_id == entry[2] and not entry[3].children]
+        heapq.heapify(self._best)
+        heapq.heapify(self._worst)
+
+    def remove(self, node: SMANode) -> None:
+        """
+        Retira o nó da lista (as entradas nos heaps ficam inválidas)
+        """
+        if node.open_id >= 0:
+            node.open_id = -1
+            self._size -= 1
+
+    def pop_best(self) -> SMANode:
+        """
+        Remove o nó de menor f (o mais profundo nos empates)
+        """
+        while True:
+            _, _, open_id, node = heapq.heappop(self._best)
+            if node.open_id == open_id:
+                self.remove(node)
+                return node
+
+    def pop_worst_leaf(self, protected: Optional[SMANode] = None) -> Optional[SMANode]:
+        """
+        Remove a folha de maior f (a mais rasa nos empates), exceto a raiz e o nó protegido
+
+        :param protected: Nó que não pode ser descartado nesta rodada
+        :return: A folha removida ou None se nenhuma puder ser descartada
+        """
+        skipped = []
+        leaf = None
+        while self._worst:
+            entry = heapq.heappop(self._worst)
+            node = entry[3]
+            if node.open_id != entry[2] or node.children:
+                continue
+            if node is protected or node.parent is None:
+                skipped.append(entry)
+                continue
+            self.remove(node)
+            leaf = node
+            break
+        for entry in skipped:
+            heapq.heappush(self._worst, entry)
+        return leaf
@@ -3,15 +3,48 @@ from .TaskSchedulingNode import TaskSchedulingNode
 from .TaskSchedulingData import SetupMatrix
 from .TaskFamily import TaskFamily
 from .TaskSchedulingHeuristics import TaskSchedulingHeuristics
-from typing import List, Tuple, Optional
+from .TaskSchedulingOpenList import TaskSchedulingOpenList
+from .TaskSchedulingSMAOpenList import TaskSchedulingSMAOpenList, SMANode
+from .TaskSchedulingClosedSet import TaskSchedulingClosedSet
+from .TaskSchedulingLocalSearch import TaskSchedulingLocalSearch
+from .TaskSchedulingNodePool import TaskSchedulingNodePool, HeuristicProbe
+from typing import Iterator, List, Tuple, Optional
 from collections import deque
+import heapq
+import numpy as np
 import logging
+import time
 
 
 class TaskSchedulingSearch(InformedSearch):
+    # Limite do Held-Karp: as camadas centrais com 22 tarefas já ocupam centenas de MB
+    HELD_KARP_MAX_TASKS = 22
+    # Limites de memória do IDA* (tabela de transposição e cache de h)
+    IDA_TABLE_SIZE = 200_000
+    IDA_HEURISTIC_CACHE_SIZE = 200_000
+    # Orçamento padrão de nós do SMA*
+    SMA_MAX_NODES = 500_000
+    # Largura padrão da busca em feixe
+    BEAM_WIDTH = 10
+    # A partir de quantas tarefas restantes a H1 dos sucessores é calculada em lote
+    H1_BATCH_MIN_TASKS = 24
+    # Menor instância em que o HDA* compensa iniciar os processos (cerca de 1 s);
+    # abaixo disso o A* roda em um processo mesmo com workers > 1
+    PARALLEL_MIN_TASKS = 16
+    # Limite da tabela de transposição do branch and bound
+    BNB_TABLE_SIZE = 500_000
+    # ARA*: peso inicial da heurística e redução a cada rodada
+    ANYTIME_INITIAL_WEIGHT = 3.0
+    ANYTIME_WEIGHT_STEP = 0.5
+    # Nomes aceitos por run() (os mesmos dos endpoints /scheduling/task-sequence/*)
+    ALGORITHMS = ("breadth_first", "depth_first", "depth_limited", "iterative_deepening",
+                  "bidirectional", "uniform_cost", "greedy", "a_star", "ida_star", "held_karp",
+                  "anytime", "branch_and_bound", "local_search", "beam", "sma_star")
+
     def __init__(self):
         super().__init__()
         self.heuristics_handler = TaskSchedulingHeuristics()
+        self.stats = {}  # Contadores da última busca executada
         self.logger = logging.getLogger(__name__)
         if not self.logger.handlers:
             handler = logging.StreamHandler()
@@ -32,26 +65,26 @@ class TaskSchedulingSearch(InformedSearch):
 
         # Fila para busca em largura
         queue = deque([start_node])
-        visited = set()
+        visited = TaskSchedulingClosedSet(tasks)
         
         while queue:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
             current = queue.popleft()
             
             if current.is_goal_state():
                 sequence = self._reconstruct_sequence(current, tasks)
                 return sequence, current.v2
             
-            state_key = (current.remaining_bitmask, current.last_task)
-            if state_key in visited:
+            if visited.contains(current.remaining_bitmask, current.last_task):
                 continue
-            visited.add(state_key)
+            visited.add(current.remaining_bitmask, current.last_task)
             
             # Gerar sucessores
             successors = self._generate_successors_uniform(current, setup_matrix, tasks)
             
             for successor in successors:
-                succ_key = (successor.remaining_bitmask, successor.last_task)
-                if succ_key not in visited:
+                if not visited.contains(successor.remaining_bitmask, successor.last_task):
                     queue.append(successor)
         
         return [], float('inf')
@@ -68,19 +101,20 @@ class TaskSchedulingSearch(InformedSearch):
         
         # Pilha para busca em profundidade
         stack = deque([start_node])
-        visited = set()
+        visited = TaskSchedulingClosedSet(tasks)
         
         while stack:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
             current = stack.pop()
             
             if current.is_goal_state():
                 sequence = self._reconstruct_sequence(current, tasks)
                 return sequence, current.v2
             
-            state_key = (current.remaining_bitmask, current.last_task)
-            if state_key in visited:
+            if visited.contains(current.remaining_bitmask, current.last_task):
                 continue
-            visited.add(state_key)
+            visited.add(current.remaining_bitmask, current.last_task)
             
             # Gerar sucessores
             successors = self._generate_successors_uniform(current, setup_matrix, tasks)
@@ -88,8 +122,7 @@ class TaskSchedulingSearch(InformedSearch):
             # Adicionar sucessores na ordem reversa para manter consistência com DFS
             for successor in reversed(successors):
                 successor.depth = current.depth + 1
-                succ_key = (successor.remaining_bitmask, successor.last_task)
-                if succ_key not in visited:
+                if not visited.contains(successor.remaining_bitmask, successor.last_task):
                     stack.append(successor)
         
         return [], float('inf')
@@ -110,9 +143,11 @@ class TaskSchedulingSearch(InformedSearch):
         
         # Pilha para busca em profundidade
         stack = deque([start_node])
-        visited = set()
+        visited = TaskSchedulingClosedSet(tasks)
         
         while stack:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
             current = stack.pop()
             
             if current.is_goal_state():
@@ -121,10 +156,9 @@ class TaskSchedulingSearch(InformedSearch):
             
             # Verifica se ainda não excedeu o limite de profundidade
             if current.depth < depth_limit:
-                state_key = (current.remaining_bitmask, current.last_task)
-                if state_key in visited:
+                if visited.contains(current.remaining_bitmask, current.last_task):
                     continue
-                visited.add(state_key)
+                visited.add(current.remaining_bitmask, current.last_task)
                 
                 # Gerar sucessores
                 successors = self._generate_successors_uniform(current, setup_matrix, tasks)
@@ -132,8 +166,7 @@ class TaskSchedulingSearch(InformedSearch):
                 # Adicionar sucessores na ordem reversa para manter consistência com DFS
                 for successor in reversed(successors):
                     successor.depth = current.depth + 1
-                    succ_key = (successor.remaining_bitmask, successor.last_task)
-                    if succ_key not in visited:
+                    if not visited.contains(successor.remaining_bitmask, successor.last_task):
                         stack.append(successor)
         
         return [], float('inf')
@@ -166,66 +199,124 @@ class TaskSchedulingSearch(InformedSearch):
     # -------------------------------------------------------------------------
     # BIDIRECTIONAL SEARCH
     # -------------------------------------------------------------------------
-    def bidirectional_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix) -> Tuple[List[int], float]:
+    def bidirectional_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix,
+                                 heuristic_type: Optional[str] = None) -> Tuple[List[int], float]:
         """
-        Busca bidirecional para sequenciamento
+        Busca bidirecional MM (meet in the middle) para sequenciamento
+
+        A busca direta parte do estado inicial e a reversa de todos os estados
+        finais (0, tarefa) ao mesmo tempo. Cada lado é um heap ordenado por
+        pr = max(g + h, 2g) e sempre se expande o lado de menor pr; nenhum
+        lado passa da metade do custo ótimo. Ao gerar um estado já alcançado
+        pelo outro lado, U = min(U, g_f + g_b). A busca para quando
+        U <= max(C, fmin_f, fmin_b, gmin_f + gmin_b + eps), onde C é a menor
+        prioridade e eps o menor custo de setup, o que garante o custo ótimo.
 
         :param tasks: Lista de tarefas [1, 2, 3, ...]
         :param setup_matrix: Matriz de configuração
+        :param heuristic_type: None (MM0, sem heurística) ou "h1" (H1 nos dois sentidos)
         :return: (sequencia_otima, custo_total) ou ([], inf) se não encontrar solução
         """
-        
-        # Inicialização dos estados e filas
-        queues, visited = self._initialize_bidirectional_search(tasks)
-        
-        while queues['forward'] and queues['backward']:
-            # Tenta expansão nas duas direções
-            result = self._expand_bidirectional_forward(queues, visited, setup_matrix, tasks)
-            if result:
-                return result
-                
-            result = self._expand_bidirectional_backward(queues, visited, setup_matrix, tasks)
-            if result:
-                return result
-        
-        return [], float('inf')
+        if heuristic_type not in (None, "h1"):
+            raise ValueError(f"Heurística não suportada na busca bidirecional: {heuristic_type}")
+
+        if not tasks:
+            self.stats = {'expanded': 0, 'expanded_forward': 0, 'expanded_backward': 0,
+                          'generated': 0, 'heuristic': heuristic_type}
+            return [], 0.0
+
+        dense = setup_matrix.to_dense()
+        finite_costs = dense.costs[np.isfinite(dense.costs)]
+        epsilon = max(0.0, float(finite_costs.min())) if finite_costs.size else 0.0
+
+        sides = self._initialize_bidirectional_search(tasks, setup_matrix, heuristic_type)
+        forward, backward = sides['forward'], sides['backward']
+        best_cost = float('inf')
+        meeting = None
+
+        while forward['open'] and backward['open']:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            priority = min(forward['open'].peek_priority(), backward['open'].peek_priority())
+            lower_bound = max(priority,
+                              self._bidirectional_minimum(forward, 'f_heap'),
+                              self._bidirectional_minimum(backward, 'f_heap'),
+                              self._bidirectional_minimum(forward, 'g_heap')
+                              + self._bidirectional_minimum(backward, 'g_heap') + epsilon)
+            if best_cost <= lower_bound:
+                break
+
+            # Expande o lado de menor prioridade (o direto nos empates)
+            if forward['open'].peek_priority() <= backward['open'].peek_priority():
+                side, other = forward, backward
+            else:
+                side, other = backward, forward
+            found = self._expand_bidirectional(side, other, setup_matrix, tasks, heuristic_type)
+            if found is not None and found[0] < best_cost:
+                best_cost, meeting = found
+
+        self.stats = {
+            'expanded': forward['expanded'] + backward['expanded'],
+            'expanded_forward': forward['expanded'],
+            'expanded_backward': backward['expanded'],
+            'generated': len(forward['nodes']) + len(backward['nodes']),
+            'heuristic': heuristic_type,
+        }
+        if meeting is None:
+            return [], float('inf')
+        sequence = self._reconstruct_bidirectional_path(forward['nodes'][meeting],
+                                                        backward['nodes'][meeting], tasks)
+        return sequence, best_cost
 
     # -------------------------------------------------------------------------
     # UNIFORM COST SEARCH
     # -------------------------------------------------------------------------
-    def uniform_cost_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix) -> Tuple[List[int], float]:
-        """Custo uniforme (Dijkstra) para sequenciamento"""
+    def uniform_cost_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix,
+                                node_store: str = "objects") -> Tuple[List[int], float]:
+        """
+        Custo uniforme (Dijkstra) para sequenciamento
+
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :param node_store: "objects" (TaskSchedulingNode) ou "pool" (arrays paralelos)
+        :return: (sequencia_otima, custo_total) ou ([], inf) se não encontrar solução
+        """
+        if node_store == "pool":
+            return self._best_first_pooled(tasks, setup_matrix, "g", "none", None)
+
         start_node, _ = self._get_initial_state(tasks)
         start_node.v1 = 0.0  # Ordena por g-cost apenas
 
-        open_list = [start_node]
-        closed_set = set()
+        open_list = TaskSchedulingOpenList()
+        self._push_open(open_list, start_node)
+        closed_set = TaskSchedulingClosedSet(tasks)
 
         while open_list:
-            current = open_list.pop(0)
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            state_key, current = open_list.pop_entry()
 
             if current.is_goal_state():
+                self._record_stats("objects", len(closed_set), len(closed_set) + len(open_list), len(tasks),
+                                  closed_set=closed_set)
                 sequence = self._reconstruct_sequence(current, tasks)
                 return sequence, current.v2
 
-            state_key = (current.remaining_bitmask, current.last_task)
-            if state_key in closed_set:
-                continue
-            closed_set.add(state_key)
+            closed_set.add(current.remaining_bitmask, current.last_task)
 
             successors = self._generate_successors_uniform(current, setup_matrix, tasks)
 
             for successor in successors:
-                succ_key = (successor.remaining_bitmask, successor.last_task)
-                if succ_key not in closed_set:
-                    self.insert_ordered(open_list, successor)
+                if not closed_set.contains(successor.remaining_bitmask, successor.last_task):
+                    self._push_open(open_list, successor)
 
         return [], float('inf')
    
     # -------------------------------------------------------------------------
     # GREEDY SEARCH
     # -------------------------------------------------------------------------
-    def greedy_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix, heuristic_type: str = "h1", families: Optional[TaskFamily] = None) -> Tuple[List[int], float]:
+    def greedy_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix, heuristic_type: str = "h1", families: Optional[TaskFamily] = None,
+                          node_store: str = "objects") -> Tuple[List[int], float]:
         """
         Busca gulosa para sequenciamento (usa apenas heurística)
         
@@ -233,37 +324,42 @@ class TaskSchedulingSearch(InformedSearch):
         :param setup_matrix: Matriz de custos de setup
         :param heuristic_type: "h1", "h2", ou "h3"
         :param families: Para heurística h3
+        :param node_store: "objects" (TaskSchedulingNode) ou "pool" (arrays paralelos)
         :return: (sequencia_otima, custo_total) ou ([], inf) se não encontrar solução
         """
+        if node_store == "pool":
+            return self._best_first_pooled(tasks, setup_matrix, "h", heuristic_type, families)
+
         # Similar ao A* mas ordena apenas por h-cost
         start_node, _ = self._get_initial_state(tasks)
         start_node.h_cost = self._calculate_heuristic(start_node, setup_matrix,
                                                      heuristic_type, families)
         start_node.v1 = start_node.h_cost  # f = h apenas (greedy)
 
-        open_list = [start_node]
-        closed_set = set()
+        open_list = TaskSchedulingOpenList()
+        self._push_open(open_list, start_node)
+        closed_set = TaskSchedulingClosedSet(tasks)
 
         while open_list:
-            current = open_list.pop(0)
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            state_key, current = open_list.pop_entry()
 
             if current.is_goal_state():
+                self._record_stats("objects", len(closed_set), len(closed_set) + len(open_list), len(tasks),
+                                  closed_set=closed_set)
                 sequence = self._reconstruct_sequence(current, tasks)
                 return sequence, current.v2
 
-            state_key = (current.remaining_bitmask, current.last_task)
-            if state_key in closed_set:
-                continue
-            closed_set.add(state_key)
+            closed_set.add(current.remaining_bitmask, current.last_task)
 
             successors = self._generate_successors(current, setup_matrix, tasks,
                                                   heuristic_type, families)
 
             for successor in successors:
                 successor.v1 = successor.h_cost  # Greedy: usa apenas h
-                succ_key = (successor.remaining_bitmask, successor.last_task)
-                if succ_key not in closed_set:
-                    self.insert_ordered(open_list, successor)
+                if not closed_set.contains(successor.remaining_bitmask, successor.last_task):
+                    self._push_open(open_list, successor)
 
         return [], float('inf')
    
@@ -272,7 +368,9 @@ class TaskSchedulingSearch(InformedSearch):
     # -------------------------------------------------------------------------
     def a_star_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix,
                          heuristic_type: str = "h1",
-                         families: Optional[TaskFamily] = None) -> Tuple[List[int], float]:
+                         families: Optional[TaskFamily] = None,
+                         node_store: str = "objects",
+                         workers: int = 1) -> Tuple[List[int], float]:
         """
         A* especializado para sequenciamento de tarefas
 
@@ -280,39 +378,56 @@ class TaskSchedulingSearch(InformedSearch):
         :param setup_matrix: Matriz de custos de setup
         :param heuristic_type: "h1", "h2", ou "h3"
         :param families: Para heurística h3
+        :param node_store: "objects" (TaskSchedulingNode) ou "pool" (arrays paralelos)
+        :param workers: Com mais de um, executa o HDA* em processos (TaskSchedulingParallel)
+                        a partir de PARALLEL_MIN_TASKS tarefas; limitado por
+                        TaskSchedulingParallel.max_workers()
 
         :return: (sequencia_otima, custo_total)
         """
+        if workers > 1 and len(tasks) >= self.PARALLEL_MIN_TASKS:
+            from .TaskSchedulingParallel import TaskSchedulingParallel
+            workers = min(workers, TaskSchedulingParallel.max_workers())
+        if workers > 1 and len(tasks) >= self.PARALLEL_MIN_TASKS:
+            parallel = TaskSchedulingParallel(workers)
+            result = parallel.a_star(tasks, setup_matrix, heuristic_type, families)
+            self.stats = parallel.stats
+            return result
+
+        if node_store == "pool":
+            return self._best_first_pooled(tasks, setup_matrix, "f", heuristic_type, families)
+
         initial_bitmask = (1 << len(tasks)) - 1  # Todos os bits setados
         start_node = TaskSchedulingNode(initial_bitmask, 0, 0.0, 0.0)
         start_node.h_cost = self._calculate_heuristic(start_node, setup_matrix,
                                                      heuristic_type, families)
         start_node.v1 = start_node.v2 + start_node.h_cost
 
-        # Lista de nós abertos (ordenada por f-cost)
-        open_list = [start_node]
-        closed_set = set()
+        # Lista de nós abertos (heap indexado por estado, ordenado por f-cost)
+        open_list = TaskSchedulingOpenList()
+        self._push_open(open_list, start_node)
+        closed_set = TaskSchedulingClosedSet(tasks)
 
         while open_list:
-            current = open_list.pop(0)
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            state_key, current = open_list.pop_entry()
 
             if current.is_goal_state():
+                self._record_stats("objects", len(closed_set), len(closed_set) + len(open_list), len(tasks),
+                                  closed_set=closed_set)
                 sequence = self._reconstruct_sequence(current, tasks)
                 return sequence, current.v2  # Retorna sequência e custo g
 
-            state_key = (current.remaining_bitmask, current.last_task)
-            if state_key in closed_set:
-                continue
-            closed_set.add(state_key)
+            closed_set.add(current.remaining_bitmask, current.last_task)
 
             # Gerar sucessores
             successors = self._generate_successors(current, setup_matrix, tasks,
                                                   heuristic_type, families)
 
             for successor in successors:
-                succ_key = (successor.remaining_bitmask, successor.last_task)
-                if succ_key not in closed_set:
-                    self.insert_ordered(open_list, successor)
+                if not closed_set.contains(successor.remaining_bitmask, successor.last_task):
+                    self._push_open(open_list, successor)
 
         return [], float('inf')  # Nenhuma solução encontrada
  
@@ -321,35 +436,693 @@ class TaskSchedulingSearch(InformedSearch):
     # -------------------------------------------------------------------------
     def ida_star_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix,
                            heuristic_type: str = "h1",
-                           families: Optional[TaskFamily] = None) -> Tuple[List[int], float]:
+                           families: Optional[TaskFamily] = None,
+                           table_size: int = None,
+                           heuristic_cache_size: int = None) -> Tuple[List[int], float]:
         """
-        IDA* especializado para sequenciamento de tarefas
+        IDA* especializado para sequenciamento de tarefas (pilha explícita)
         
         :param tasks: Lista de tarefas [1, 2, 3, ...]
         :param setup_matrix: Matriz de custos de setup
         :param heuristic_type: "h1", "h2", ou "h3"
         :param families: Para heurística h3
+        :param table_size: Máximo de entradas da tabela de transposição
+        :param heuristic_cache_size: Máximo de valores h mantidos entre iterações
+        :return: (sequencia_otima, custo_total) ou ([], inf) se não encontrar solução
         """
-        # Estado inicial
-        start_node, _ = self._get_initial_state(tasks)
-        start_node.h_cost = self._calculate_heuristic(start_node, setup_matrix,
-                                                     heuristic_type, families)
-        
+        table_size = self.IDA_TABLE_SIZE if table_size is None else table_size
+        heuristic_cache_size = self.IDA_HEURISTIC_CACHE_SIZE if heuristic_cache_size is None else heuristic_cache_size
+
+        # Valores h são mantidos entre iterações (dependem apenas do estado)
+        heuristic, heuristic_cache = self._state_heuristic(setup_matrix, heuristic_type, families,
+                                                           heuristic_cache_size)
+
         # Limite inicial é a heurística do estado inicial
-        bound = start_node.h_cost
-        
+        initial_bitmask = (1 << len(tasks)) - 1
+        bound = heuristic(initial_bitmask, 0, None)
+        iterations = 0
+        expanded = 0
+
         while True:
             self.logger.info(f"IDA* com limite f: {bound}")
-            
-            result = self._ida_star_search(start_node, bound, setup_matrix, tasks,
-                                         heuristic_type, families)
-            
-            if isinstance(result, tuple):  # Encontrou solução
-                return result
-            elif result == float('inf'):  # Não há solução
-                return [], float('inf')
-            else:  # Novo limite
-                bound = result
+            iterations += 1
+
+            result, next_bound, iteration_expanded = self._ida_star_iteration(
+                tasks, setup_matrix, bound, heuristic, table_size)
+            expanded += iteration_expanded
+
+            if result is not None or next_bound == float('inf'):
+                self.stats = {
+                    'iterations': iterations,
+                    'expanded': expanded,
+                    'heuristic_cache_entries': len(heuristic_cache),
+                }
+                return result if result is not None else ([], float('inf'))
+
+            bound = next_bound
+
+    # -------------------------------------------------------------------------
+    # DEPTH-FIRST BRANCH AND BOUND
+    # -------------------------------------------------------------------------
+    def branch_and_bound_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix,
+                                    heuristic_type: str = "h1",
+                                    families: Optional[TaskFamily] = None,
+                                    table_size: int = None,
+                                    heuristic_cache_size: int = None) -> Tuple[List[int], float]:
+        """
+        Branch and bound em profundidade (DFBnB) com pilha explícita
+
+        Parte da solução do vizinho mais próximo como limite superior e poda
+        todo ramo com g + h >= melhor custo conhecido. Os sucessores são
+        visitados em ordem crescente de custo de setup, e a tabela de
+        transposição guarda o menor g de cada estado (bitmask, última tarefa)
+        já explorado. A memória é O(n) na pilha mais a tabela limitada, o que
+        permite linhas de 20 a 30 tarefas onde o CLOSED do A* não cabe.
+
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :param heuristic_type: "h1" ou "h2" (admissíveis, para a poda ser exata)
+        :param families: Para heurística h3
+        :param table_size: Máximo de entradas da tabela de transposição
+        :param heuristic_cache_size: Máximo de valores h mantidos
+        :return: (sequencia_otima, custo_total) ou ([], inf) se não encontrar solução
+        """
+        table_size = self.BNB_TABLE_SIZE if table_size is None else table_size
+        heuristic_cache_size = self.IDA_HEURISTIC_CACHE_SIZE if heuristic_cache_size is None else heuristic_cache_size
+        heuristic, heuristic_cache = self._state_heuristic(setup_matrix, heuristic_type, families,
+                                                           heuristic_cache_size)
+
+        dense = setup_matrix.to_dense()
+        rows = dense.rows
+        index_of = dense.index_of
+        n_tasks = len(tasks)
+
+        # Limite superior inicial: vizinho mais próximo
+        best_sequence, best_cost = TaskSchedulingLocalSearch.nearest_neighbour(tasks, dense)
+        initial_bound = best_cost
+        improvements = 0
+
+        transposition = {}
+        expanded = 0
+        pruned = 0
+        path = []
+
+        # Quadro da pilha: [bitmask, última tarefa, g, sucessores ordenados, próximo índice]
+        stack = [[(1 << n_tasks) - 1, 0, 0.0, None, 0]]
+
+        while stack:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            frame = stack[-1]
+            remaining_bitmask, last_task, g_cost, children, position = frame
+
+            if children is None:
+                expanded += 1
+                from_costs = rows[index_of[last_task]]
+                children = []
+                for i in range(n_tasks):
+                    if not remaining_bitmask & (1 << i):
+                        continue
+                    task_id = tasks[i]
+                    new_remaining = remaining_bitmask & ~(1 << i)
+                    setup_cost = from_costs[i + 1]
+                    new_g_cost = g_cost + setup_cost
+
+                    if new_remaining == 0:
+                        # Folha: sequência completa, atualiza o incumbente
+                        if new_g_cost < best_cost:
+                            best_sequence, best_cost = path + [task_id], new_g_cost
+                            improvements += 1
+                        continue
+                    if transposition.get((new_remaining, task_id), float('inf')) <= new_g_cost:
+                        pruned += 1
+                        continue
+                    f_cost = new_g_cost + heuristic(new_remaining, task_id, remaining_bitmask)
+                    if f_cost >= best_cost:
+                        pruned += 1
+                        continue
+                    children.append((setup_cost, f_cost, new_g_cost, new_remaining, task_id))
+
+                children.sort()
+                frame[3] = children
+
+            if position >= len(children):
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+
+            frame[4] = position + 1
+            _, f_cost, new_g_cost, new_remaining, task_id = children[position]
+
+            # O incumbente pode ter melhorado depois da geração deste sucessor
+            if f_cost >= best_cost:
+                pruned += 1
+                continue
+            state_key = (new_remaining, task_id)
+            known_g = transposition.get(state_key)
+            if known_g is not None and known_g <= new_g_cost:
+                pruned += 1
+                continue
+            if known_g is not None or len(transposition) < table_size:
+                transposition[state_key] = new_g_cost
+
+            path.append(task_id)
+            stack.append([new_remaining, task_id, new_g_cost, None, 0])
+
+        self.stats = {
+            'expanded': expanded,
+            'pruned': pruned,
+            'initial_bound': initial_bound,
+            'improvements': improvements,
+            'table_entries': len(transposition),
+            'heuristic_cache_entries': len(heuristic_cache),
+        }
+        return best_sequence, best_cost
+
+    # -------------------------------------------------------------------------
+    # SMA* (A* com memória limitada)
+    # -------------------------------------------------------------------------
+    def sma_star_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix,
+                            heuristic_type: str = "h1",
+                            families: Optional[TaskFamily] = None,
+                            max_nodes: Optional[int] = None,
+                            max_bytes: Optional[int] = None) -> Tuple[List[int], float]:
+        """
+        SMA* simplificado: A* que nunca mantém mais de max_nodes nós
+
+        Expande o nó de menor f (o mais profundo nos empates) gerando seus
+        filhos com f = max(g + h, f do pai). Quando o limite é ultrapassado,
+        descarta a folha de maior f (a mais rasa nos empates) e guarda seu f no
+        pai (forgotten), que volta para OPEN e regenera o melhor filho esquecido
+        quando voltar a ser o melhor nó. Sucessores cujo estado já está em
+        memória com g menor ou igual não são gerados. Com heurística
+        admissível e orçamento suficiente para o caminho da solução, o
+        resultado é ótimo.
+
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :param heuristic_type: "h1" ou "h2" (admissíveis, para o resultado ser ótimo)
+        :param families: Para heurística h3
+        :param max_nodes: Máximo de nós em memória
+        :param max_bytes: Orçamento em bytes (convertido em nós pela estimativa por nó)
+        :return: (sequencia_otima, custo_total) ou ([], inf) se não encontrar solução
+        """
+        n_tasks = len(tasks)
+        bytes_per_node = SMANode.bytes_per_node(n_tasks)
+        if max_nodes is None and max_bytes is None:
+            max_nodes = self.SMA_MAX_NODES
+        if max_bytes is not None:
+            byte_limit = int(max_bytes) // bytes_per_node
+            max_nodes = byte_limit if max_nodes is None else min(max_nodes, byte_limit)
+        if max_nodes < n_tasks + 2:
+            raise ValueError(f"Orçamento de {max_nodes} nós não comporta um caminho de {n_tasks} tarefas "
+                             f"(mínimo {n_tasks + 2})")
+
+        heuristic, _ = self._state_heuristic(setup_matrix, heuristic_type, families,
+                                             self.IDA_HEURISTIC_CACHE_SIZE)
+        dense = setup_matrix.to_dense()
+        rows, index_of = dense.rows, dense.index_of
+
+        initial_bitmask = (1 << n_tasks) - 1
+        root = SMANode(initial_bitmask, 0, 0.0, heuristic(initial_bitmask, 0, None))
+        open_list = TaskSchedulingSMAOpenList()
+        open_list.push(root, root.f_cost)
+        in_memory = {(initial_bitmask, 0): root}
+        used = peak = 1
+        expanded = regenerated = forgotten = skipped = 0
+        result = ([], float('inf'))
+
+        while open_list:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            best = open_list.pop_best()
+            if best.remaining_bitmask == 0:
+                sequence = []
+                node = best
+                while node.parent is not None:
+                    sequence.append(node.last_task)
+                    node = node.parent
+                sequence.reverse()
+                result = (sequence, best.g_cost)
+                break
+
+            remaining_bitmask, last_task = best.remaining_bitmask, best.last_task
+            if best.expanded:
+                # Regenera só o filho esquecido de menor f guardado; os demais continuam no pai
+                task_id = min(best.forgotten, key=best.forgotten.get)
+                candidates = [(index_of[task_id] - 1, best.forgotten.pop(task_id))]
+                regenerated += 1
+            else:
+                candidates = [(i, best.f_cost) for i in range(n_tasks) if remaining_bitmask & (1 << i)]
+                best.expanded = True
+                expanded += 1
+
+            generated = []
+            from_costs = rows[index_of[last_task]]
+            for i, bound in candidates:
+                task_id = tasks[i]
+                new_remaining = remaining_bitmask & ~(1 << i)
+                new_g_cost = best.g_cost + from_costs[i + 1]
+                state_key = (new_remaining, task_id)
+                known = in_memory.get(state_key)
+                if known is not None and known.g_cost <= new_g_cost:
+                    skipped += 1
+                    continue
+                f_cost = max(bound, new_g_cost + heuristic(new_remaining, task_id, remaining_bitmask))
+                child = SMANode(new_remaining, task_id, new_g_cost, f_cost, best.depth + 1, best)
+                best.children[task_id] = child
+                generated.append(child)
+                in_memory[state_key] = child
+                open_list.push(child, f_cost)
+                used += 1
+
+            if best.forgotten:
+                open_list.push(best, min(best.forgotten.values()))
+            elif not best.children:
+                # Todos os sucessores são dominados por estados já em memória
+                best.f_cost = float('inf')
+                used -= self._sma_forget(best, open_list, in_memory)
+                continue
+
+            # Memória cheia: descarta as piores folhas, preservando o melhor filho recém-gerado
+            # (protegê-lo garante progresso quando o nó regenera filhos esquecidos)
+            protected = min(generated, key=lambda node: (node.f_cost, -node.depth)) if generated else None
+            while used > max_nodes:
+                leaf = open_list.pop_worst_leaf(protected)
+                if leaf is None:
+                    break
+                used -= self._sma_forget(leaf, open_list, in_memory)
+                forgotten += 1
+            peak = max(peak, used)
+
+        self.stats = {
+            'expanded': expanded,
+            'regenerated': regenerated,
+            'forgotten': forgotten,
+            'skipped_duplicates': skipped,
+            'max_nodes': max_nodes,
+            'peak_nodes': peak,
+            'bytes_per_node': bytes_per_node,
+            'peak_bytes': peak * bytes_per_node,
+            'budget_used': peak / max_nodes,
+            'limit_reached': forgotten > 0,
+        }
+        return result
+
+    # -------------------------------------------------------------------------
+    # BEAM SEARCH
+    # -------------------------------------------------------------------------
+    def beam_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix,
+                        beam_width: int = BEAM_WIDTH,
+                        heuristic_type: str = "h1",
+                        families: Optional[TaskFamily] = None) -> Tuple[List[int], float]:
+        """
+        Busca em feixe por camadas: cada camada agenda mais uma tarefa
+
+        Expande todos os estados da camada, funde sucessores com o mesmo estado
+        (bitmask, última tarefa) mantendo o menor g e conserva apenas os
+        beam_width melhores por f = g + h. São n camadas de até beam_width * n
+        sucessores, então tempo e memória crescem com n² * beam_width em vez de
+        exponencialmente. Não garante a solução ótima.
+
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :param beam_width: Número de estados mantidos por camada
+        :param heuristic_type: "h1", "h2", "h3" ou "h3_mst"
+        :param families: Para heurística h3
+        :return: (sequencia, custo_total) ou ([], inf) se não encontrar solução
+        """
+        if beam_width < 1:
+            raise ValueError("beam_width deve ser pelo menos 1")
+
+        start_node, _ = self._get_initial_state(tasks)
+        start_node.h_cost = self._calculate_heuristic(start_node, setup_matrix, heuristic_type, families)
+        layer = [start_node]
+        generated = 0
+        merged = 0
+
+        for _ in range(len(tasks)):
+            candidates = {}
+            for node in layer:
+                if self.cancellation is not None:
+                    self.cancellation.checkpoint()
+                for successor in self._generate_successors(node, setup_matrix, tasks,
+                                                           heuristic_type, families):
+                    generated += 1
+                    state_key = (successor.remaining_bitmask, successor.last_task)
+                    known = candidates.get(state_key)
+                    if known is not None:
+                        merged += 1
+                        if known.v2 <= successor.v2:
+                            continue
+                    candidates[state_key] = successor
+            if not candidates:
+                break
+            layer = heapq.nsmallest(beam_width, candidates.values(),
+                                    key=lambda node: (node.v1, node.h_cost))
+
+        self.stats = {
+            'beam_width': beam_width,
+            'layers': len(tasks),
+            'generated': generated,
+            'merged': merged,
+        }
+
+        goals = [node for node in layer if node.is_goal_state()]
+        if not goals:
+            return [], float('inf')
+        best = min(goals, key=lambda node: node.v2)
+        return self._reconstruct_sequence(best, tasks), best.v2
+
+    # -------------------------------------------------------------------------
+    # LOCAL SEARCH (melhoria de uma sequência inicial)
+    # -------------------------------------------------------------------------
+    def local_search_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix,
+                                sequence: Optional[List[int]] = None,
+                                neighbours: int = TaskSchedulingLocalSearch.NEIGHBOURS,
+                                moves=TaskSchedulingLocalSearch.MOVES,
+                                time_limit: Optional[float] = None) -> Tuple[List[int], float]:
+        """
+        Melhora uma sequência com Or-opt, swap e 3-opt sem inversão (para linhas grandes)
+
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :param sequence: Sequência inicial (padrão: vizinho mais próximo)
+        :param neighbours: Tamanho das listas de vizinhos
+        :param moves: Movimentos habilitados
+        :param time_limit: Prazo em segundos (None = até o ótimo local)
+        :return: (sequencia_melhorada, custo_total)
+        """
+        if sequence is None:
+            sequence, _ = TaskSchedulingLocalSearch.nearest_neighbour(tasks, setup_matrix)
+        local_search = TaskSchedulingLocalSearch(tasks, setup_matrix, neighbours, moves, time_limit)
+        result = local_search.improve(sequence)
+        self.stats = local_search.stats
+        return result
+
+    # -------------------------------------------------------------------------
+    # ANYTIME REPAIRING A* (ARA*)
+    # -------------------------------------------------------------------------
+    def anytime_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix,
+                           heuristic_type: str = "h1",
+                           families: Optional[TaskFamily] = None,
+                           initial_weight: float = ANYTIME_INITIAL_WEIGHT,
+                           weight_step: float = ANYTIME_WEIGHT_STEP,
+                           time_limit: Optional[float] = None) -> Tuple[List[int], float]:
+        """
+        ARA*: retorna a melhor sequência encontrada até o fim da busca ou do prazo
+
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :param heuristic_type: "h1" ou "h2" (admissíveis, para o limite ser válido)
+        :param families: Para heurística h3
+        :param initial_weight: Peso inicial w de f = g + w * h
+        :param weight_step: Redução de w a cada rodada
+        :param time_limit: Prazo em segundos (None = até provar a otimalidade)
+        :return: (melhor_sequencia, custo) ou ([], inf) se nenhuma foi encontrada
+        """
+        sequence, cost = [], float('inf')
+        for incumbent in self.anytime_scheduling_iter(tasks, setup_matrix, heuristic_type, families,
+                                                      initial_weight, weight_step, time_limit):
+            sequence, cost = incumbent['sequence'], incumbent['cost']
+        return sequence, cost
+
+    def anytime_scheduling_iter(self, tasks: List[int], setup_matrix: SetupMatrix,
+                                heuristic_type: str = "h1",
+                                families: Optional[TaskFamily] = None,
+                                initial_weight: float = ANYTIME_INITIAL_WEIGHT,
+                                weight_step: float = ANYTIME_WEIGHT_STEP,
+                                time_limit: Optional[float] = None) -> Iterator[dict]:
+        """
+        ARA* como gerador: produz um evento a cada solução melhorada ou limite
+        de subotimalidade mais justo.
+
+        Cada rodada executa A* ponderado (f = g + w * h) reaproveitando OPEN,
+        CLOSED e INCONS da rodada anterior; entre rodadas w diminui, INCONS volta
+        para OPEN e as prioridades são recalculadas. O limite informado é
+        custo / min(custo, min g + h em OPEN ∪ INCONS), válido com h admissível.
+
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :param heuristic_type: "h1" ou "h2"
+        :param families: Para heurística h3
+        :param initial_weight: Peso inicial w
+        :param weight_step: Redução de w a cada rodada
+        :param time_limit: Prazo em segundos (None = até provar a otimalidade)
+        :return: Gerador de dicionários com sequence, cost, weight, bound,
+                 optimal, elapsed e expanded
+        """
+        start_time = time.perf_counter()
+        deadline = None if time_limit is None else start_time + time_limit
+        dense = setup_matrix.to_dense()
+        n_tasks = len(tasks)
+
+        initial_bitmask = (1 << n_tasks) - 1
+        start_node = TaskSchedulingNode(initial_bitmask, 0, 0.0, 0.0)
+        start_node.h_cost = self._calculate_heuristic(start_node, setup_matrix, heuristic_type, families)
+
+        weight = max(1.0, initial_weight)
+        best_g = {(initial_bitmask, 0): 0.0}
+        open_list = TaskSchedulingOpenList()
+        open_list.push((initial_bitmask, 0), weight * start_node.h_cost, start_node.h_cost, 0.0, start_node)
+        closed_set = TaskSchedulingClosedSet(tasks)
+        incons = {}
+        incumbent: Optional[TaskSchedulingNode] = start_node if n_tasks == 0 else None
+        incumbent_g = 0.0 if n_tasks == 0 else float('inf')
+        expanded = 0
+        rounds = 0
+        last_reported = (None, None)
+        bound = float('inf')
+        timed_out = False
+
+        while True:
+            rounds += 1
+            # ImprovePath: expande enquanto a menor chave for menor que o custo da solução
+            while open_list and open_list.peek_priority() < incumbent_g:
+                if self.cancellation is not None:
+                    self.cancellation.checkpoint()
+                if deadline is not None and expanded % 256 == 0 and time.perf_counter() > deadline:
+                    timed_out = True
+                    break
+                state_key, current = open_list.pop_entry()
+                closed_set.add(current.remaining_bitmask, current.last_task)
+                expanded += 1
+
+                remaining_bitmask = current.remaining_bitmask
+                from_costs = dense.rows[dense.index_of[current.last_task]]
+                for i in range(n_tasks):
+                    if not remaining_bitmask & (1 << i):
+                        continue
+                    task_id = tasks[i]
+                    new_remaining = remaining_bitmask & ~(1 << i)
+                    new_g_cost = current.v2 + from_costs[i + 1]
+                    succ_key = (new_remaining, task_id)
+                    if new_g_cost >= best_g.get(succ_key, float('inf')):
+                        continue
+                    best_g[succ_key] = new_g_cost
+
+                    successor = TaskSchedulingNode(new_remaining, task_id, new_g_cost, 0.0, current)
+                    if new_remaining == 0:
+                        if new_g_cost < incumbent_g:
+                            incumbent, incumbent_g = successor, new_g_cost
+                        continue
+
+                    successor.h_cost = self._calculate_heuristic(successor, setup_matrix,
+                                                                 heuristic_type, families)
+                    if closed_set.contains(new_remaining, task_id):
+                        incons[succ_key] = successor  # Reaberto só na próxima rodada
+                    else:
+                        open_list.push(succ_key, new_g_cost + weight * successor.h_cost,
+                                       successor.h_cost, new_g_cost, successor)
+
+            # Limite inferior: menor g + h entre os estados ainda não resolvidos
+            lower_bound = incumbent_g
+            for _, node in open_list.items():
+                lower_bound = min(lower_bound, node.v2 + node.h_cost)
+            for node in incons.values():
+                lower_bound = min(lower_bound, node.v2 + node.h_cost)
+            if incumbent is not None:
+                bound = incumbent_g / lower_bound if lower_bound > 0 else (1.0 if incumbent_g == 0 else float('inf'))
+                bound = min(bound, weight) if not timed_out else bound
+
+            optimal = incumbent is not None and bound <= 1.0 + 1e-12
+            finished = optimal or timed_out or (not open_list and not incons)
+            self.stats = {
+                'expanded': expanded,
+                'rounds': rounds,
+                'weight': weight,
+                'bound': bound if incumbent is not None else None,
+                'optimal': optimal,
+                'timed_out': timed_out,
+            }
+
+            if incumbent is not None and (incumbent_g, bound) != last_reported:
+                last_reported = (incumbent_g, bound)
+                self.logger.info(f"ARA* w={weight}: custo {incumbent_g}, limite {bound}")
+                yield {
+                    'sequence': self._reconstruct_sequence(incumbent, tasks),
+                    'cost': incumbent_g,
+                    'weight': weight,
+                    'bound': bound,
+                    'optimal': optimal,
+                    'elapsed': time.perf_counter() - start_time,
+                    'expanded': expanded,
+                }
+
+            if finished:
+                return
+
+            # Próxima rodada: reduz w, devolve INCONS ao OPEN e refaz as prioridades
+            weight = max(1.0, weight - weight_step)
+            for state_key, node in incons.items():
+                open_list.push(state_key, 0.0, node.h_cost, node.v2, node)
+            incons = {}
+            closed_set = TaskSchedulingClosedSet(tasks)
+            open_list.reprioritize(lambda node: node.v2 + weight * node.h_cost)
+
+    # -------------------------------------------------------------------------
+    # HELD-KARP (programação dinâmica exata)
+    # -------------------------------------------------------------------------
+    def held_karp_scheduling(self, tasks: List[int], setup_matrix: SetupMatrix) -> Tuple[List[int], float]:
+        """
+        Programação dinâmica de Held-Karp sobre o espaço de estados em bitmask
+
+        O estado (remaining_bitmask, last_task) do A* é representado pelo seu
+        complemento: dp[S][j] é o menor custo para processar o conjunto S
+        terminando na tarefa j. Cada camada (subconjuntos com k tarefas) é
+        calculada de uma vez com operações vetorizadas do NumPy.
+
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :return: (sequencia_otima, custo_total) ou ([], inf) se não encontrar solução
+        """
+        n_tasks = len(tasks)
+        if n_tasks == 0:
+            return [], 0.0
+        if n_tasks > self.HELD_KARP_MAX_TASKS:
+            raise ValueError(f"Held-Karp suporta no máximo {self.HELD_KARP_MAX_TASKS} tarefas")
+
+        dense = setup_matrix.to_dense()
+        costs = dense.costs[1:, 1:]  # diagonal já é infinita
+        start_costs = dense.costs[0, 1:]
+
+        layers = self._held_karp_layers(n_tasks)
+
+        # Posição de cada bitmask dentro da sua camada (evita busca binária)
+        rank = np.empty(1 << n_tasks, dtype=np.int32)
+        for layer in layers:
+            rank[layer] = np.arange(len(layer), dtype=np.int32)
+
+        # Camada 1: apenas a primeira tarefa foi processada
+        dp_prev = np.full((n_tasks, n_tasks), np.inf)
+        dp_prev[np.arange(n_tasks), np.arange(n_tasks)] = start_costs
+        parents = [None, None]
+
+        for size in range(2, n_tasks + 1):
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            layer = layers[size]
+            dp_next = np.full((len(layer), n_tasks), np.inf)
+            parent_next = np.zeros((len(layer), n_tasks), dtype=np.int8)
+
+            for j in range(n_tasks):
+                bit = 1 << j
+                rows = np.nonzero(layer & bit)[0]
+                prev_rows = rank[layer[rows] ^ bit]
+                # candidatos[r, i] = dp[S - {j}][i] + setup(i, j)
+                candidates = dp_prev[prev_rows]
+                candidates += costs[:, j]
+                best = np.argmin(candidates, axis=1)
+                dp_next[rows, j] = candidates[np.arange(len(rows)), best]
+                parent_next[rows, j] = best
+
+            dp_prev = dp_next
+            parents.append(parent_next)
+
+        last = int(np.argmin(dp_prev[0]))
+        total_cost = float(dp_prev[0, last])
+        if total_cost == float('inf'):
+            return [], float('inf')
+
+        # Reconstrói a sequência seguindo os predecessores camada a camada
+        sequence = [tasks[last]]
+        mask = (1 << n_tasks) - 1
+        for size in range(n_tasks, 1, -1):
+            row = int(rank[mask])
+            previous = int(parents[size][row, last])
+            mask ^= 1 << last
+            last = previous
+            sequence.append(tasks[last])
+
+        sequence.reverse()
+        return sequence, total_cost
+
+    # -------------------------------------------------------------------------
+    # EXECUÇÃO POR NOME DO ALGORITMO
+    # -------------------------------------------------------------------------
+    def run(self, algorithm: str, tasks: List[int], setup_matrix: SetupMatrix,
+            heuristic_type: str = "h1", families: Optional[TaskFamily] = None,
+            **options) -> Tuple[List[int], float]:
+        """
+        Executa um algoritmo de sequenciamento pelo nome (mesmos nomes dos endpoints)
+
+        :param algorithm: Um dos nomes em ALGORITHMS
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :param heuristic_type: Heurística dos algoritmos informados
+        :param families: Famílias de tarefas (para H3)
+        :param options: depth_limit, node_store, table_size, heuristic_cache_size,
+                        initial_weight, weight_step, time_limit, beam_width, workers,
+                        max_nodes, max_bytes, sequence, neighbours, moves
+        :return: (sequencia, custo_total)
+        """
+        node_store = options.get("node_store", "objects")
+        if algorithm == "breadth_first":
+            return self.breadth_first_scheduling(tasks, setup_matrix)
+        if algorithm == "depth_first":
+            return self.depth_first_scheduling(tasks, setup_matrix)
+        if algorithm == "depth_limited":
+            return self.depth_limited_scheduling(tasks, setup_matrix, options.get("depth_limit", len(tasks)))
+        if algorithm == "iterative_deepening":
+            return self.iterative_deepening_scheduling(tasks, setup_matrix)
+        if algorithm == "bidirectional":
+            # Só a H1 tem versão reversa; as demais heurísticas caem no MM0
+            return self.bidirectional_scheduling(tasks, setup_matrix,
+                                                 heuristic_type if heuristic_type == "h1" else None)
+        if algorithm == "uniform_cost":
+            return self.uniform_cost_scheduling(tasks, setup_matrix, node_store)
+        if algorithm == "greedy":
+            return self.greedy_scheduling(tasks, setup_matrix, heuristic_type, families, node_store)
+        if algorithm == "a_star":
+            return self.a_star_scheduling(tasks, setup_matrix, heuristic_type, families, node_store,
+                                          options.get("workers", 1))
+        if algorithm == "ida_star":
+            return self.ida_star_scheduling(tasks, setup_matrix, heuristic_type, families,
+                                            options.get("table_size"), options.get("heuristic_cache_size"))
+        if algorithm == "held_karp":
+            return self.held_karp_scheduling(tasks, setup_matrix)
+        if algorithm == "branch_and_bound":
+            return self.branch_and_bound_scheduling(tasks, setup_matrix, heuristic_type, families,
+                                                    options.get("table_size"),
+                                                    options.get("heuristic_cache_size"))
+        if algorithm == "sma_star":
+            return self.sma_star_scheduling(tasks, setup_matrix, heuristic_type, families,
+                                            options.get("max_nodes"), options.get("max_bytes"))
+        if algorithm == "beam":
+            return self.beam_scheduling(tasks, setup_matrix, options.get("beam_width", self.BEAM_WIDTH),
+                                        heuristic_type, families)
+        if algorithm == "local_search":
+            return self.local_search_scheduling(tasks, setup_matrix, options.get("sequence"),
+                                                int(options.get("neighbours", TaskSchedulingLocalSearch.NEIGHBOURS)),
+                                                options.get("moves", TaskSchedulingLocalSearch.MOVES),
+                                                options.get("time_limit"))
+        if algorithm == "anytime":
+            return self.anytime_scheduling(tasks, setup_matrix, heuristic_type, families,
+                                           options.get("initial_weight", self.ANYTIME_INITIAL_WEIGHT),
+                                           options.get("weight_step", self.ANYTIME_WEIGHT_STEP),
+                                           options.get("time_limit"))
+        raise ValueError(f"Algoritmo desconhecido: {algorithm}")
 
     #-------------------------------------------------------------------------
     # INITIAL STATE
@@ -365,6 +1138,137 @@ class TaskSchedulingSearch(InformedSearch):
         start_node = TaskSchedulingNode(initial_bitmask, 0, 0.0, 0.0)
         return start_node, initial_bitmask
 
+    # -------------------------------------------------------------------------
+    # OPEN LIST
+    # -------------------------------------------------------------------------
+    def _push_open(self, open_list: TaskSchedulingOpenList, node: TaskSchedulingNode) -> bool:
+        """
+        Insere o nó na lista aberta indexada (ou aplica decrease-key)
+
+        :param open_list: Lista aberta indexada por (remaining_bitmask, last_task)
+        :param node: Nó a ser inserido (v1 = prioridade, v2 = g-cost)
+        :return: Verdadeiro se a lista foi alterada
+        """
+        state_key = (node.remaining_bitmask, node.last_task)
+        return open_list.push(state_key, node.v1, node.h_cost, node.v2, node)
+
+    # -------------------------------------------------------------------------
+    # BEST-FIRST SEARCH OVER THE NODE POOL
+    # -------------------------------------------------------------------------
+    def _best_first_pooled(self, tasks: List[int], setup_matrix: SetupMatrix, priority: str,
+                           heuristic_type: str, families: Optional[TaskFamily]) -> Tuple[List[int], float]:
+        """
+        Busca best-first (A*, custo uniforme ou gulosa) com os estados guardados
+        em TaskSchedulingNodePool em vez de um objeto por nó
+
+        :param tasks: Lista de tarefas [1, 2, 3, ...]
+        :param setup_matrix: Matriz de custos de setup
+        :param priority: "f" (A*), "g" (custo uniforme) ou "h" (gulosa)
+        :param heuristic_type: "h1", "h2", "h3" ou "h3_mst"
+        :param families: Instância de TaskFamily para h3
+        :return: (sequencia_otima, custo_total) ou ([], inf) se não encontrar solução
+        """
+        n_tasks = len(tasks)
+        dense = setup_matrix.to_dense()
+        pool = TaskSchedulingNodePool(n_tasks)
+        open_list = TaskSchedulingOpenList()
+        closed_set = TaskSchedulingClosedSet(tasks)
+        use_heuristic = priority != "g"
+
+        # Sonda reutilizada para avaliar a heurística sem criar nós
+        parent_probe = HeuristicProbe()
+        probe = HeuristicProbe(parent=parent_probe)
+
+        initial_bitmask = (1 << n_tasks) - 1
+        probe.remaining_bitmask, probe.last_task, probe.parent = initial_bitmask, 0, None
+        h_cost = self._calculate_heuristic(probe, setup_matrix, heuristic_type, families) if use_heuristic else 0.0
+        probe.parent = parent_probe
+        root = pool.add(initial_bitmask, 0, 0.0, h_cost)
+        open_list.push((initial_bitmask, 0), self._pool_priority(priority, 0.0, h_cost), h_cost, 0.0, root)
+
+        while open_list:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            state_key, index = open_list.pop_entry()
+            remaining_bitmask, last_task = state_key
+            g_cost = pool.g_costs[index]
+
+            if remaining_bitmask == 0:
+                self._record_stats("pool", len(closed_set), len(pool), n_tasks, pool, closed_set)
+                return pool.reconstruct_sequence(index), g_cost
+
+            closed_set.add(remaining_bitmask, last_task)
+            from_costs = dense.rows[dense.index_of[last_task]]
+            parent_probe.remaining_bitmask = remaining_bitmask
+
+            for i in range(n_tasks):
+                if remaining_bitmask & (1 << i):
+                    task_id = tasks[i]
+                    new_remaining = remaining_bitmask & ~(1 << i)
+                    if closed_set.contains(new_remaining, task_id):
+                        continue
+
+                    new_g_cost = g_cost + from_costs[i + 1]
+                    succ_key = (new_remaining, task_id)
+                    queued_g = open_list.get_g(succ_key)
+                    if queued_g is not None and new_g_cost >= queued_g:
+                        continue  # Não melhora o estado já enfileirado
+
+                    h_cost = 0.0
+                    if use_heuristic:
+                        probe.remaining_bitmask, probe.last_task = new_remaining, task_id
+                        h_cost = self._calculate_heuristic(probe, setup_matrix, heuristic_type, families)
+
+                    child = pool.add(new_remaining, task_id, new_g_cost, h_cost, index)
+                    open_list.push(succ_key, self._pool_priority(priority, new_g_cost, h_cost),
+                                   h_cost, new_g_cost, child)
+
+        self._record_stats("pool", len(closed_set), len(pool), n_tasks, pool, closed_set)
+        return [], float('inf')
+
+    def _pool_priority(self, priority: str, g_cost: float, h_cost: float) -> float:
+        """
+        Valor de ordenação da lista aberta conforme o tipo de busca
+
+        :param priority: "f", "g" ou "h"
+        :param g_cost: Custo acumulado
+        :param h_cost: Valor heurístico
+        :return: Prioridade
+        """
+        if priority == "g":
+            return g_cost
+        if priority == "h":
+            return h_cost
+        return g_cost + h_cost
+
+    def _record_stats(self, node_store: str, expanded: int, stored_states: int,
+                      n_tasks: int, pool: Optional[TaskSchedulingNodePool] = None,
+                      closed_set: Optional[TaskSchedulingClosedSet] = None) -> None:
+        """
+        Registra contadores e a estimativa de memória dos nós da última busca
+
+        :param node_store: "objects" ou "pool"
+        :param expanded: Número de estados expandidos
+        :param stored_states: Número de estados mantidos em memória
+        :param n_tasks: Número de tarefas
+        :param pool: Pool usado pela busca (modo "pool")
+        :param closed_set: Conjunto fechado da busca
+        """
+        if pool is not None:
+            bytes_per_state = pool.bytes_per_state()
+        else:
+            bytes_per_state = TaskSchedulingNodePool.object_bytes_per_state(n_tasks)
+        self.stats = {
+            'node_store': node_store,
+            'expanded': expanded,
+            'stored_states': stored_states,
+            'bytes_per_state': bytes_per_state,
+            'node_bytes': stored_states * bytes_per_state,
+            'node_bytes_per_million_states': bytes_per_state * 1_000_000,
+        }
+        if closed_set is not None:
+            self.stats['closed_set'] = closed_set.info()
+
     # -------------------------------------------------------------------------
     # SUCCESSORS FOR GRAPH
     # -------------------------------------------------------------------------
@@ -382,6 +1286,13 @@ class TaskSchedulingSearch(InformedSearch):
         :return: Lista de nós sucessores
         """
         successors = []
+        dense = setup_matrix.to_dense()
+        from_costs = dense.rows[dense.index_of[current.last_task]]
+
+        # Com muitas tarefas restantes a H1 de todos os filhos é calculada em lote
+        batch_h = None
+        if heuristic_type == "h1" and current.remaining_bitmask.bit_count() >= self.H1_BATCH_MIN_TASKS:
+            batch_h = iter(self.heuristics_handler.h1_successor_values(current, setup_matrix))
 
         # Itera sobre cada posição de bit no bitmask
         for i in range(len(tasks)):
@@ -391,14 +1302,17 @@ class TaskSchedulingSearch(InformedSearch):
                 # Remove tarefa do bitmask
                 new_remaining = current.remaining_bitmask & ~(1 << i)
 
-                # Calcula custo de setup
-                setup_cost = setup_matrix.get_setup_cost(current.last_task, task_id)
+                # Calcula custo de setup (bit i corresponde ao índice denso i + 1)
+                setup_cost = from_costs[i + 1]
                 new_g_cost = current.v2 + setup_cost  # v2 é o g_cost atual
 
                 # Cria novo nó
                 new_node = TaskSchedulingNode(new_remaining, task_id, new_g_cost, 0.0, current)
-                new_node.h_cost = self._calculate_heuristic(new_node, setup_matrix,
-                                                          heuristic_type, families)
+                if batch_h is not None:
+                    new_node.h_cost = next(batch_h)
+                else:
+                    new_node.h_cost = self._calculate_heuristic(new_node, setup_matrix,
+                                                                heuristic_type, families)
                 new_node.v1 = new_g_cost + new_node.h_cost
 
                 successors.append(new_node)
@@ -420,12 +1334,14 @@ class TaskSchedulingSearch(InformedSearch):
         :return: Lista de nós sucessores
         """
         successors = []
+        dense = setup_matrix.to_dense()
+        from_costs = dense.rows[dense.index_of[current.last_task]]
 
         for i in range(len(tasks)):
             if current.remaining_bitmask & (1 << i):
                 task_id = tasks[i]
                 new_remaining = current.remaining_bitmask & ~(1 << i)
-                setup_cost = setup_matrix.get_setup_cost(current.last_task, task_id)
+                setup_cost = from_costs[i + 1]
                 new_g_cost = current.v2 + setup_cost
 
                 new_node = TaskSchedulingNode(new_remaining, task_id, new_g_cost, 0.0, current)
@@ -445,8 +1361,8 @@ class TaskSchedulingSearch(InformedSearch):
         
         :param node: Nó atual
         :param setup_matrix: Matriz de custos de setup
-        :param heuristic_type: "h1", "h2", ou "h3"
-        :param families: Instância de TaskFamily para h3
+        :param heuristic_type: "h1", "h2", "h3" ou "h3_mst"
+        :param families: Instância de TaskFamily para h3/h3_mst
         :return: Valor da heurística
         """
         if heuristic_type == "h1":
@@ -455,9 +1371,23 @@ class TaskSchedulingSearch(InformedSearch):
             return self.heuristics_handler.h2_mst_symmetric(node, setup_matrix)
         elif heuristic_type == "h3" and families:
             return self.heuristics_handler.h3_product_families(node, setup_matrix, families)
+        elif heuristic_type == "h3_mst" and families:
+            return self.heuristics_handler.h3_family_mst(node, setup_matrix, families)
         else:
             return 0.0  # Fallback para custo uniforme
  
+    def heuristic_cache_info(self, setup_matrix: SetupMatrix, heuristic_type: str) -> Optional[dict]:
+        """
+        Contadores do cache da heurística (atualmente apenas o cache de MST da H2)
+
+        :param setup_matrix: Matriz de custos de setup usada na busca
+        :param heuristic_type: "h1", "h2", ou "h3"
+        :return: Dicionário com hits/misses/size/max_entries ou None
+        """
+        if heuristic_type != "h2":
+            return None
+        return self.heuristics_handler.mst_cache(setup_matrix).info()
+
     # -------------------------------------------------------------------------
     # RECONSTRUÇÃO DA SEQUÊNCIA
     # -------------------------------------------------------------------------
@@ -485,158 +1415,167 @@ class TaskSchedulingSearch(InformedSearch):
     # -------------------------------------------------------------------------
     # HELPER METHODS FOR BIDIRECTIONAL SEARCH
     # -------------------------------------------------------------------------
-    def _initialize_bidirectional_search(self, tasks: List[int]):
+    def _initialize_bidirectional_search(self, tasks: List[int], setup_matrix: SetupMatrix,
+                                         heuristic_type: Optional[str]) -> dict:
         """
-        Inicializa estruturas para busca bidirecional
-        
+        Inicializa os dois lados da busca bidirecional
+
+        Cada lado tem OPEN (ordenado por max(f, 2g)), heaps preguiçosos com o
+        menor f e o menor g de OPEN, e o melhor nó conhecido de cada estado.
+
         :param tasks: Lista de tarefas [1, 2, 3, ...]
-        :return: (filas, visitados)
+        :param setup_matrix: Matriz de custos de setup
+        :param heuristic_type: None ou "h1"
+        :return: {'forward': lado, 'backward': lado}
         """
-        
-        # Estado inicial: todas as tarefas restantes
-        start_node, initial_bitmask = self._get_initial_state(tasks)
+        sides = {}
+        for direction in ('forward', 'backward'):
+            sides[direction] = {'direction': direction, 'open': TaskSchedulingOpenList(),
+                                'f_heap': [], 'g_heap': [], 'nodes': {}, 'expanded': 0, 'counter': 0}
+
+        # Direto: o estado inicial com todas as tarefas restantes
+        start_node, _ = self._get_initial_state(tasks)
+        if heuristic_type == "h1":
+            start_node.h_cost = self.heuristics_handler.h1_minimum_outgoing_edges(start_node, setup_matrix)
+        self._push_bidirectional(sides['forward'], start_node)
 
-        # Estados finais: nenhuma tarefa restante, mas com diferentes últimas tarefas
-        # Precisamos iniciar backward de TODOS os possíveis estados finais
+        # Reverso: todos os estados finais possíveis (cada tarefa pode ser a última)
         final_bitmask = 0
-        
-        queues = {
-            'forward': deque([start_node]),
-            'backward': deque()
-        }
-        
-        visited = {
-            'forward': {(initial_bitmask, 0): start_node},
-            'backward': {}
-        }
-        
-        # Adiciona todos os estados finais possíveis (cada tarefa pode ser a última)
+        goal_h = 0.0
         for task in tasks:
             goal_node = TaskSchedulingNode(final_bitmask, task, 0.0, 0.0)
-            queues['backward'].append(goal_node)
-            visited['backward'][(final_bitmask, task)] = goal_node
-        
-        return queues, visited
+            if heuristic_type == "h1":
+                goal_h = goal_h or self.heuristics_handler.h1_reverse(goal_node, setup_matrix)
+                goal_node.h_cost = goal_h
+            self._push_bidirectional(sides['backward'], goal_node)
+        return sides
 
-    def _expand_bidirectional_forward(self, queues: dict, visited: dict, setup_matrix: SetupMatrix, tasks: List[int]):
+    def _push_bidirectional(self, side: dict, node: TaskSchedulingNode) -> None:
         """
-        Expande busca na direção forward
-        
-        :param queues: Filas de busca
-        :param visited: Nós visitados
-        :param setup_matrix: Matriz de configuração
-        :param tasks: Lista de tarefas
-        :return: (sequencia, custo) se encontrar ponto de encontro, senão None
+        Registra o nó como melhor caminho conhecido do seu estado e o insere em OPEN
+
+        :param side: Lado da busca
+        :param node: Nó com v2 (g) e h_cost preenchidos
         """
-        if not queues['forward']:
-            return None
-            
-        current = queues['forward'].popleft()
-        state_key = (current.remaining_bitmask, current.last_task)
-        
-        # Verifica se encontrou ponto de encontro
-        if state_key in visited['backward']:
-            meeting_node = visited['backward'][state_key]
-            sequence = self._reconstruct_bidirectional_path(current, meeting_node, tasks)
-            total_cost = current.v2 + meeting_node.v2
-            return sequence, total_cost
-        
-        # Gerar e adicionar sucessores
-        successors = self._generate_successors_uniform(current, setup_matrix, tasks)
-        for successor in successors:
-            succ_key = (successor.remaining_bitmask, successor.last_task)
-            if succ_key not in visited['forward']:
-                visited['forward'][succ_key] = successor
-                queues['forward'].append(successor)
-        
-        return None
+        state_key = (node.remaining_bitmask, node.last_task)
+        g_cost, f_cost = node.v2, node.v2 + node.h_cost
+        side['nodes'][state_key] = node
+        side['open'].push(state_key, max(f_cost, 2 * g_cost), node.h_cost, g_cost, node)
+        side['counter'] += 1
+        heapq.heappush(side['f_heap'], (f_cost, side['counter'], state_key, g_cost))
+        heapq.heappush(side['g_heap'], (g_cost, side['counter'], state_key, g_cost))
 
-    def _expand_bidirectional_backward(self, queues: dict, visited: dict, setup_matrix: SetupMatrix, tasks: List[int]):
+    def _bidirectional_minimum(self, side: dict, heap_name: str) -> float:
         """
-        Expande busca na direção backward
-        
-        :param queues: Filas de busca
-        :param visited: Nós visitados
+        Menor f ou g entre os nós em OPEN (descarta entradas de nós já expandidos ou melhorados)
+
+        :param side: Lado da busca
+        :param heap_name: 'f_heap' ou 'g_heap'
+        :return: Menor valor (inf se OPEN estiver vazio)
+        """
+        heap = side[heap_name]
+        open_list = side['open']
+        while heap:
+            _, _, state_key, g_cost = heap[0]
+            if open_list.get_g(state_key) == g_cost:
+                return heap[0][0]
+            heapq.heappop(heap)
+        return float('inf')
+
+    def _expand_bidirectional(self, side: dict, other: dict, setup_matrix: SetupMatrix,
+                              tasks: List[int], heuristic_type: Optional[str]):
+        """
+        Expande o melhor nó de um lado da busca bidirecional
+
+        :param side: Lado a expandir
+        :param other: Lado oposto (consultado para detectar encontros)
         :param setup_matrix: Matriz de configuração
         :param tasks: Lista de tarefas
-        :return: (sequencia, custo) se encontrar ponto de encontro, senão None
+        :param heuristic_type: None ou "h1"
+        :return: (custo, estado de encontro) do melhor encontro gerado, senão None
         """
-        if not queues['backward']:
-            return None
-            
-        current = queues['backward'].popleft()
-        state_key = (current.remaining_bitmask, current.last_task)
-        
-        # Verifica se encontrou ponto de encontro
-        if state_key in visited['forward']:
-            meeting_node = visited['forward'][state_key]
-            sequence = self._reconstruct_bidirectional_path(meeting_node, current, tasks)
-            total_cost = meeting_node.v2 + current.v2
-            return sequence, total_cost
-        
-        # Gerar e adicionar sucessores reversos
-        successors = self._generate_successors_reverse(current, setup_matrix, tasks)
+        _, current = side['open'].pop_entry()
+        side['expanded'] += 1
+
+        if side['direction'] == 'forward':
+            if heuristic_type == "h1":
+                successors = self._generate_successors(current, setup_matrix, tasks, heuristic_type)
+            else:
+                successors = self._generate_successors_uniform(current, setup_matrix, tasks)
+        else:
+            successors = self._generate_successors_reverse(current, setup_matrix, tasks, heuristic_type)
+
+        best = None
+        nodes, other_nodes = side['nodes'], other['nodes']
         for successor in successors:
             succ_key = (successor.remaining_bitmask, successor.last_task)
-            if succ_key not in visited['backward']:
-                visited['backward'][succ_key] = successor
-                queues['backward'].append(successor)
-        
-        return None
+            known = nodes.get(succ_key)
+            if known is not None and known.v2 <= successor.v2:
+                continue
+            self._push_bidirectional(side, successor)
 
-    def _generate_successors_reverse(self, current: TaskSchedulingNode, setup_matrix: SetupMatrix, tasks: List[int]) -> List[TaskSchedulingNode]:
+            # Encontro com o outro lado: caminho completo passando por este estado
+            meeting_node = other_nodes.get(succ_key)
+            if meeting_node is not None:
+                total_cost = successor.v2 + meeting_node.v2
+                if best is None or total_cost < best[0]:
+                    best = (total_cost, succ_key)
+        return best
+
+    def _generate_successors_reverse(self, current: TaskSchedulingNode, setup_matrix: SetupMatrix,
+                                     tasks: List[int], heuristic_type: Optional[str] = None) -> List[TaskSchedulingNode]:
         """
-        Gera predecessores para busca reversa (adiciona tarefas que ainda faltam)
-        
-        Na busca reversa, partimos do estado final (bitmask=0) e vamos
-        adicionando tarefas de volta até chegar ao estado inicial (bitmask=all).
-        
+        Gera predecessores para busca reversa
+
+        Um estado (R, X) é alcançado a partir de (R + {X}, j), onde j é
+        qualquer tarefa já agendada antes de X (fora de R + {X}), com custo
+        setup[j][X]; se R + {X} contém todas as tarefas, o único predecessor
+        é o estado inicial (j = 0). Na busca reversa o g é o custo do estado
+        até o fim da sequência.
+
         :param current: Nó atual (na direção reversa)
         :param setup_matrix: Matriz de custos de setup
         :param tasks: Lista de todas as tarefas possíveis
+        :param heuristic_type: None ou "h1" (limite do início até o predecessor)
         :return: Lista de predecessores (sucessores na direção reversa)
         """
-        successors = []
-        
-        for i in range(len(tasks)):
-            # Se a tarefa i NÃO está no bitmask atual, significa que ela
-            # poderia ter sido executada antes (predecessor)
-            if not (current.remaining_bitmask & (1 << i)):
-                task_id = tasks[i]
-                
-                # Adiciona tarefa ao bitmask (reconstruindo estado anterior)
-                new_remaining = current.remaining_bitmask | (1 << i)
-                
-                # No sentido reverso:
-                # Estado atual tem last_task X
-                # Estado anterior tinha last_task = task_id
-                # A transição foi: task_id → X
-                # Custo: setup_matrix[task_id][X]
-                if current.last_task != 0:  # Se não é estado inicial fictício
-                    setup_cost = setup_matrix.get_setup_cost(task_id, current.last_task)
-                else:
-                    setup_cost = 0.0
-                
-                new_g_cost = current.v2 + setup_cost
-                
-                # Cria nó predecessor (com task_id como last_task)
-                new_node = TaskSchedulingNode(new_remaining, task_id, new_g_cost, 0.0, current)
-                new_node.v1 = new_g_cost
-                
-                successors.append(new_node)
-        
-        return successors
-    
+        if current.last_task == 0:
+            return []  # Estado inicial: nada vem antes
+
+        dense = setup_matrix.to_dense()
+        to_index = dense.index_of[current.last_task]
+        new_remaining = current.remaining_bitmask | (1 << (to_index - 1))
+        all_tasks = (1 << len(tasks)) - 1
+
+        predecessors = []
+        if new_remaining == all_tasks:
+            candidates = [(0, 0)]
+        else:
+            candidates = [(tasks[i], i + 1) for i in range(len(tasks)) if not new_remaining & (1 << i)]
+
+        h_cost = 0.0
+        for task_id, from_index in candidates:
+            new_g_cost = current.v2 + dense.rows[from_index][to_index]
+            new_node = TaskSchedulingNode(new_remaining, task_id, new_g_cost, 0.0, current)
+            if heuristic_type == "h1":
+                # Todos os predecessores têm o mesmo conjunto restante: H1 reversa calculada uma vez
+                h_cost = h_cost or self.heuristics_handler.h1_reverse(new_node, setup_matrix)
+                new_node.h_cost = h_cost
+            new_node.v1 = new_g_cost + new_node.h_cost
+            predecessors.append(new_node)
+
+        return predecessors
+
     def _reconstruct_bidirectional_path(self, forward_node: TaskSchedulingNode, backward_node: TaskSchedulingNode, tasks: List[int]) -> List[int]:
         """
         Reconstrói caminho de busca bidirecional
-        
+
         :param forward_node: Nó do lado forward no ponto de encontro
-        :param backward_node: Nó do lado backward no ponto de encontro
+        :param backward_node: Nó do lado backward no mesmo estado
         :param tasks: Lista de tarefas (não usado, mas mantido para compatibilidade)
         :return: Sequência completa de tarefas
         """
-        # Caminho do início até o ponto de encontro
+        # Caminho do início até o ponto de encontro (inclui a última tarefa do estado)
         forward_path = []
         current = forward_node
         while current and current.parent:
@@ -644,53 +1583,187 @@ class TaskSchedulingSearch(InformedSearch):
                 forward_path.append(current.last_task)
             current = current.parent
         forward_path.reverse()
-        
-        # Caminho do ponto de encontro até o final
+
+        # Do ponto de encontro até o final: as últimas tarefas dos pais no lado reverso
         backward_path = []
         current = backward_node
         while current and current.parent:
-            if current.last_task != 0:
-                backward_path.append(current.last_task)
             current = current.parent
-        
+            backward_path.append(current.last_task)
+
         return forward_path + backward_path
-    
+
+    # -------------------------------------------------------------------------
+    # HELPER METHOD FOR HELD-KARP
+    # -------------------------------------------------------------------------
+    def _held_karp_layers(self, n_tasks: int) -> List[np.ndarray]:
+        """
+        Agrupa todos os subconjuntos (bitmasks) pela quantidade de tarefas
+
+        :param n_tasks: Número de tarefas
+        :return: Lista onde o índice k contém os bitmasks com k bits, em ordem crescente
+        """
+        masks = np.arange(1 << n_tasks, dtype=np.int64)
+        sizes = np.bitwise_count(masks)
+        order = np.argsort(sizes, kind='stable')
+        bounds = np.searchsorted(sizes[order], np.arange(n_tasks + 2))
+        return [masks[order[bounds[k]:bounds[k + 1]]] for k in range(n_tasks + 1)]
+
+    # -------------------------------------------------------------------------
+    # HELPER METHOD FOR SMA*
+    # -------------------------------------------------------------------------
+    def _sma_forget(self, node: SMANode, open_list: TaskSchedulingSMAOpenList, in_memory: dict) -> int:
+        """
+        Remove uma folha da árvore do SMA* guardando seu f no pai
+
+        O pai volta para OPEN com chave igual ao menor f esquecido; se ficou
+        sem filhos em memória, seu f passa a ser esse valor (backup). Folhas
+        sem solução (f infinito) não deixam registro, e um pai já expandido
+        que fica sem filhos nem registros também é removido.
+
+        :param node: Folha a descartar
+        :param open_list: Lista aberta do SMA*
+        :param in_memory: Índice estado -> nó dos nós em memória
+        :return: Número de nós removidos
+        """
+        removed = 0
+        while node.parent is not None:
+            open_list.remove(node)
+            parent = node.parent
+            del parent.children[node.last_task]
+            state_key = (node.remaining_bitmask, node.last_task)
+            if in_memory.get(state_key) is node:
+                del in_memory[state_key]
+            removed += 1
+
+            backed_up = max(node.f_cost, node.open_key)
+            if backed_up < float('inf'):
+                parent.forgotten[node.last_task] = backed_up
+            if parent.forgotten:
+                best_forgotten = min(parent.forgotten.values())
+                if not parent.children:
+                    parent.f_cost = max(parent.f_cost, best_forgotten)
+                open_list.push(parent, best_forgotten)
+                break
+            if parent.children or not parent.expanded:
+                break
+            # O pai também ficou sem sucessores possíveis
+            parent.f_cost = float('inf')
+            node = parent
+        return removed
+
+    # -------------------------------------------------------------------------
+    # HELPER METHOD FOR IDA* AND BRANCH AND BOUND
+    # -------------------------------------------------------------------------
+    def _state_heuristic(self, setup_matrix: SetupMatrix, heuristic_type: str,
+                         families: Optional[TaskFamily], cache_size: int):
+        """
+        Função h por estado com cache limitado, sem criar nós da árvore
+
+        :param setup_matrix: Matriz de custos de setup
+        :param heuristic_type: "h1", "h2", "h3" ou "h3_mst"
+        :param families: Para heurística h3
+        :param cache_size: Máximo de valores h mantidos
+        :return: (função (bitmask, última tarefa, bitmask do pai) -> h, cache)
+        """
+        heuristic_cache = {}
+        parent_probe = HeuristicProbe()
+        probe = HeuristicProbe(parent=parent_probe)
+
+        def heuristic(remaining_bitmask: int, last_task: int, parent_bitmask: Optional[int]) -> float:
+            state_key = (remaining_bitmask, last_task)
+            h_cost = heuristic_cache.get(state_key)
+            if h_cost is None:
+                probe.remaining_bitmask, probe.last_task = remaining_bitmask, last_task
+                parent_probe.remaining_bitmask = parent_bitmask
+                probe.parent = parent_probe if parent_bitmask is not None else None
+                h_cost = self._calculate_heuristic(probe, setup_matrix, heuristic_type, families)
+                if len(heuristic_cache) < cache_size:
+                    heuristic_cache[state_key] = h_cost
+            return h_cost
+
+        return heuristic, heuristic_cache
+
     # -------------------------------------------------------------------------
     # HELPER METHOD FOR IDA*
     # -------------------------------------------------------------------------
-    def _ida_star_search(self, node: TaskSchedulingNode, bound: float, setup_matrix: SetupMatrix, tasks: List[int], heuristic_type: str, families: Optional[TaskFamily]):
+    def _ida_star_iteration(self, tasks: List[int], setup_matrix: SetupMatrix, bound: float,
+                            heuristic, table_size: int):
         """
-        Busca recursiva para IDA*
-        
-        :param node: Nó atual
-        :param bound: Limite atual de f-cost
-        :param setup_matrix: Matriz de configuração
+        Uma iteração do IDA* com limite de f, usando pilha explícita
+
+        Os sucessores de cada nível são ordenados por f. A tabela de transposição
+        guarda o menor g com que cada estado foi alcançado nesta iteração, cortando
+        caminhos duplicados que não são melhores.
+
         :param tasks: Lista de tarefas
-        :param heuristic_type: Tipo de heurística
-        :param families: Instância de TaskFamily para h3
-        :return: (sequencia, custo) se encontrar solução, senão novo limite
+        :param setup_matrix: Matriz de configuração
+        :param bound: Limite atual de f-cost
+        :param heuristic: Função (bitmask, última tarefa, bitmask do pai) -> h
+        :param table_size: Máximo de entradas da tabela de transposição
+        :return: ((sequencia, custo) ou None, próximo limite, nós expandidos)
         """
-        f_cost = node.v2 + node.h_cost
-        
-        if f_cost > bound:
-            return f_cost
-        
-        if node.is_goal_state():
-            sequence = self._reconstruct_sequence(node, tasks)
-            return sequence, node.v2
-        
-        min_cost = float('inf')
-        
-        successors = self._generate_successors(node, setup_matrix, tasks,
-                                             heuristic_type, families)
-        
-        for successor in successors:
-            result = self._ida_star_search(successor, bound, setup_matrix, tasks,
-                                         heuristic_type, families)
-            
-            if isinstance(result, tuple):  # Encontrou solução
-                return result
-            elif result < min_cost:
-                min_cost = result
-        
-        return min_cost
\ No newline at end of file
+        dense = setup_matrix.to_dense()
+        rows = dense.rows
+        index_of = dense.index_of
+        n_tasks = len(tasks)
+
+        transposition = {}
+        next_bound = float('inf')
+        expanded = 0
+        path = []
+
+        # Quadro da pilha: [bitmask, última tarefa, g, sucessores ordenados, próximo índice]
+        stack = [[(1 << n_tasks) - 1, 0, 0.0, None, 0]]
+
+        while stack:
+            if self.cancellation is not None:
+                self.cancellation.checkpoint()
+            frame = stack[-1]
+            remaining_bitmask, last_task, g_cost, children, position = frame
+
+            if children is None:
+                if remaining_bitmask == 0:
+                    return (list(path), g_cost), bound, expanded
+
+                expanded += 1
+                from_costs = rows[index_of[last_task]]
+                children = []
+                for i in range(n_tasks):
+                    if remaining_bitmask & (1 << i):
+                        task_id = tasks[i]
+                        new_remaining = remaining_bitmask & ~(1 << i)
+                        new_g_cost = g_cost + from_costs[i + 1]
+                        if transposition.get((new_remaining, task_id), float('inf')) <= new_g_cost:
+                            continue
+                        f_cost = new_g_cost + heuristic(new_remaining, task_id, remaining_bitmask)
+                        if f_cost > bound:
+                            if f_cost < next_bound:
+                                next_bound = f_cost
+                            continue
+                        children.append((f_cost, new_g_cost, i, new_remaining, task_id))
+
+                children.sort()
+                frame[3] = children
+
+            if position >= len(children):
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+
+            frame[4] = position + 1
+            _, new_g_cost, _, new_remaining, task_id = children[position]
+
+            # Outro ramo pode ter alcançado o estado com g menor depois da geração
+            state_key = (new_remaining, task_id)
+            known_g = transposition.get(state_key)
+            if known_g is not None and known_g <= new_g_cost:
+                continue
+            if known_g is not None or len(transposition) < table_size:
+                transposition[state_key] = new_g_cost
+
+            path.append(task_id)
+            stack.append([new_remaining, task_id, new_g_cost, None, 0])
+
+        return None, next_bound, expanded
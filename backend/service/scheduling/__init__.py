@@ -1,5 +1,10 @@
 from .TaskSchedulingSearch import TaskSchedulingSearch
 from .TaskSchedulingNode import TaskSchedulingNode
-from .TaskSchedulingData import SetupMatrix
+from .TaskSchedulingData import SetupMatrix, DenseSetupMatrix
 from .TaskFamily import TaskFamily
-from .TaskSchedulingHeuristics import TaskSchedulingHeuristics
\ No newline at end of file
+from .TaskSchedulingHeuristics import TaskSchedulingHeuristics
+from .TaskSchedulingOpenList import TaskSchedulingOpenList
+from .TaskSchedulingBatch import TaskSchedulingBatch, solve_instance
+from .TaskSchedulingLocalSearch import TaskSchedulingLocalSearch
+from .TaskSchedulingParallel import TaskSchedulingParallel
+from .TaskSchedulingResultCache import TaskSchedulingResultCache
\ No newline at end of file
@@ -58,6 +58,21 @@ def test_graph_search():
     heuristics = {
         "A": 8, "B": 6, "C": 5, "D": 3, "E": 0
     }
+    coordinates = {
+        "A": [0, 0], "B": [1, 0], "C": [2, 1], "D": [3, 1], "E": [5, 1]
+    }
+    
+    # Grafo registrado uma vez e consultado por graph_id
+    try:
+        registered = requests.post(f"{BASE_URL}/graphs", json={
+            "nodes": graph_data["nodes"],
+            "graph": graph_data["graph"],
+            "preprocess": [{"type": "alt", "landmarks": 2}],
+        }, timeout=30)
+        graph_id = registered.json().get("graph_id") if registered.status_code == 201 else None
+    except requests.exceptions.RequestException:
+        graph_id = None
+    query = {"start": "A", "goal": "E", "graph_id": graph_id}
     
     algorithms = [
         ("BFS", "/search/uninformed/breadth_first", graph_data),
@@ -69,6 +84,14 @@ def test_graph_search():
         ("A*", "/search/informed/a_star", {**graph_data, "heuristics": heuristics}),
         ("Greedy", "/search/informed/greedy", {**graph_data, "heuristics": heuristics}),
         ("IDA*", "/search/informed/ida_star", {**graph_data, "heuristics": heuristics}),
+        ("A* (ALT)", "/search/informed/a_star", {**graph_data, "heuristics": {"type": "alt", "landmarks": 2}}),
+        ("IDA* (ALT)", "/search/informed/ida_star", {**graph_data, "heuristics": {"type": "alt", "landmarks": 2, "strategy": "degree"}}),
+        ("A* (euclidiana)", "/search/informed/a_star", {**graph_data, "heuristics": {"type": "euclidean", "coordinates": coordinates}}),
+        ("Bidirectional Dijkstra", "/search/informed/bidirectional", graph_data),
+        ("Bidirectional A* (ALT)", "/search/informed/bidirectional", {**graph_data, "heuristics": {"type": "alt", "landmarks": 2}}),
+        ("Uniform Cost (graph_id)", "/search/uninformed/uniform_cost", query),
+        ("A* (ALT, graph_id)", "/search/informed/a_star", {**query, "heuristics": {"type": "alt", "landmarks": 2}}),
+        ("Batch (2x2)", "/search/batch", {"graph_id": graph_id, "sources": ["A", "B"], "targets": ["D", "E"], "paths": True}),
     ]
     
     results = []
@@ -116,18 +139,45 @@ def test_task_scheduling():
         }
     }
     
+    # Instância com 16 tarefas: o HDA* só é usado a partir de PARALLEL_MIN_TASKS tarefas
+    n_large = 16
+    scheduling_data_16 = {
+        "tasks": list(range(1, n_large + 1)),
+        "setup_matrix": {
+            f"({i},{j})": (i * 7 + j * 13) % 23 + 1
+            for i in range(n_large + 1) for j in range(1, n_large + 1) if i != j
+        }
+    }
+    
     algorithms = [
         ("BFS", "/scheduling/task-sequence/breadth_first", scheduling_data),
         ("DFS", "/scheduling/task-sequence/depth_first", scheduling_data),
         ("Depth-Limited (limit=4)", "/scheduling/task-sequence/depth_limited", {**scheduling_data, "depth_limit": 4}),
         ("Iterative Deepening", "/scheduling/task-sequence/iterative_deepening", scheduling_data),
         ("Bidirectional", "/scheduling/task-sequence/bidirectional", scheduling_data),
+        ("Bidirectional (MM, H1)", "/scheduling/task-sequence/bidirectional", {**scheduling_data, "heuristic": "h1"}),
         ("Uniform Cost", "/scheduling/task-sequence/uniform_cost", scheduling_data),
         ("A* (H1)", "/scheduling/task-sequence/a_star", {**scheduling_data, "heuristic": "h1"}),
+        ("A* (H1, repetido: cache)", "/scheduling/task-sequence/a_star", {**scheduling_data, "heuristic": "h1"}),
+        ("A* (H1, pool)", "/scheduling/task-sequence/a_star", {**scheduling_data, "heuristic": "h1", "node_store": "pool"}),
         ("A* (H2)", "/scheduling/task-sequence/a_star", {**scheduling_data, "heuristic": "h2"}),
+        ("A* (H2, 16 tarefas, 2 processos)", "/scheduling/task-sequence/a_star", {**scheduling_data_16, "heuristic": "h2", "workers": 2}),
         ("A* (H3)", "/scheduling/task-sequence/a_star", {**scheduling_data_h3, "heuristic": "h3"}),
+        ("A* (H3-MST)", "/scheduling/task-sequence/a_star", {**scheduling_data_h3, "heuristic": "h3_mst"}),
         ("Greedy (H1)", "/scheduling/task-sequence/greedy", {**scheduling_data, "heuristic": "h1"}),
         ("IDA* (H1)", "/scheduling/task-sequence/ida_star", {**scheduling_data, "heuristic": "h1"}),
+        ("Branch and Bound (H2)", "/scheduling/task-sequence/branch_and_bound", {**scheduling_data, "heuristic": "h2"}),
+        ("Beam (largura 3, H1)", "/scheduling/task-sequence/beam", {**scheduling_data, "heuristic": "h1", "beam_width": 3}),
+        ("SMA* (H2, 8 nós)", "/scheduling/task-sequence/sma_star", {**scheduling_data, "heuristic": "h2", "max_nodes": 8}),
+        ("Greedy (H1) + busca local", "/scheduling/task-sequence/greedy", {**scheduling_data, "heuristic": "h1", "improve": True}),
+        ("Busca local", "/scheduling/task-sequence/local_search", {**scheduling_data, "sequence": [4, 3, 2, 1]}),
+        ("Held-Karp", "/scheduling/task-sequence/held_karp", scheduling_data),
+        ("Anytime (ARA*, H1)", "/scheduling/task-sequence/anytime", {**scheduling_data, "heuristic": "h1", "time_limit": 5}),
+        ("Batch (3 instâncias)", "/scheduling/batch", {"instances": [
+            {**scheduling_data, "algorithm": "a_star", "heuristic": "h2"},
+            {**scheduling_data_h3, "algorithm": "a_star", "heuristic": "h3"},
+            {**scheduling_data, "algorithm": "held_karp"},
+        ]}),
     ]
     
     results = []
@@ -159,6 +209,44 @@ def test_task_scheduling():
     
     return results
 
+def test_jobs():
+    """Testa a execução assíncrona de uma busca por /jobs"""
+    print_header("TESTES DE JOBS ASSÍNCRONOS")
+
+    payload = {
+        "tasks": [1, 2, 3],
+        "setup_matrix": {
+            "(0,1)": 4, "(0,2)": 2, "(0,3)": 7,
+            "(1,2)": 3, "(1,3)": 5,
+            "(2,1)": 1, "(2,3)": 6,
+            "(3,1)": 2, "(3,2)": 8
+        },
+        "heuristic": "h1"
+    }
+    name = "Job A* (H1)"
+    try:
+        start_time = time.time()
+        response = requests.post(f"{BASE_URL}/jobs", json={
+            "endpoint": "/scheduling/task-sequence/a_star", "payload": payload}, timeout=30)
+        if response.status_code != 202:
+            print(f"{Colors.FAIL}{name}: Error {response.status_code} - {response.text}{Colors.ENDC}")
+            return [(name, {}, 0, False)]
+
+        job = response.json()
+        while job['status'] in ('queued', 'running') and time.time() - start_time < 30:
+            time.sleep(0.1)
+            job = requests.get(f"{BASE_URL}/jobs/{job['job_id']}", timeout=30).json()
+        elapsed = time.time() - start_time
+
+        if job['status'] == 'done':
+            print_result(name, job['result'], elapsed)
+            print(f"  {Colors.OKCYAN}Progress: {job['progress']}{Colors.ENDC}\n")
+            return [(name, job['result'], elapsed, True)]
+        print(f"{Colors.FAIL}{name}: status {job['status']} - {job.get('error')}{Colors.ENDC}")
+    except Exception as e:
+        print(f"{Colors.FAIL}{name}: Exception - {str(e)}{Colors.ENDC}")
+    return [(name, {}, 0, False)]
+
 def print_comparison_table(results: List[tuple], title: str):
     """Imprime tabela comparativa de resultados"""
     print_header(f"COMPARAÇÃO - {title}")
@@ -205,6 +293,7 @@ def main():
     
     # Executar testes de sequenciamento
     scheduling_results = test_task_scheduling()
+    scheduling_results += test_jobs()
     
     # Mostrar tabelas comparativas
     print_comparison_table(graph_results, "BUSCA EM GRAFOS")